@@ -5,10 +5,22 @@ Documentation: https://gh.seria.moe/genshin.py
 Source Code: https://github.com/seriaati/genshin.py
 """
 
-from . import models, utility
-from .client import *
+import typing as _typing
+
 from .constants import *
 from .errors import *
 from .types import *
+from .utility import lazy as _lazy
+
+if _typing.TYPE_CHECKING:
+    from . import models, paginators, utility
+    from .client import *
 
 __version__ = "1.0.0"
+
+# the client and models take the bulk of the import time, load them on first access instead
+__getattr__, __dir__ = _lazy.lazy_import(
+    __name__,
+    submodules=("client", "models", "paginators", "utility"),
+    exports=("client",),
+)
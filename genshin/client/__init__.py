@@ -1,7 +1,19 @@
 """Default client implementation."""
 
-from . import components
-from .cache import *
-from .clients import *
-from .compatibility import *
-from .manager import *
+import typing as _typing
+
+from genshin.utility import lazy as _lazy
+
+if _typing.TYPE_CHECKING:
+    from . import components
+    from .cache import *
+    from .clients import *
+    from .compatibility import *
+    from .history import *
+    from .manager import *
+
+__getattr__, __dir__ = _lazy.lazy_import(
+    __name__,
+    submodules=("components",),
+    exports=("cache", "clients", "compatibility", "history", "manager"),
+)
@@ -3,20 +3,48 @@
 from __future__ import annotations
 
 import abc
+import asyncio
+import collections
 import dataclasses
+import datetime
 import enum
+import heapq
+import importlib
+import itertools
 import json
+import logging
+import math
 import os
 import sys
 import time
 import typing
+import uuid
+import weakref
+import zlib
+
+import pydantic
+
+from genshin.utility import concurrency
 
 if typing.TYPE_CHECKING:
     import aioredis
     import aiosqlite
 
 
-__all__ = ["BaseCache", "Cache", "RedisCache", "SQLiteCache", "StaticCache"]
+__all__ = [
+    "BaseCache",
+    "Cache",
+    "CachePolicy",
+    "CacheStats",
+    "RedisCache",
+    "SQLiteCache",
+    "StaticCache",
+    "TieredCache",
+]
+
+_LOGGER = logging.getLogger(__name__)
+
+T = typing.TypeVar("T")
 
 MINUTE = 60
 HOUR = MINUTE * 60
@@ -61,6 +89,166 @@ def cache_key(key: str, **kwargs: typing.Any) -> CacheKey:
     return typing.cast("CacheKey", cls(key, **kwargs))
 
 
+@dataclasses.dataclass(unsafe_hash=True)
+class ModelCacheKey(CacheKey):
+    """Key of a parsed model, derived from the key of its response."""
+
+    def __str__(self) -> str:
+        return "model" + ":" + super().__str__()
+
+    model: str
+    key: CacheKey
+
+
+_ENTRY_MARKER = "__genshin_cache_entry__"
+
+
+def _get_path(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _get_class(path: str, base: type[T]) -> type[T]:
+    """Get a class of the genshin package by its path, refusing anything else."""
+    module_name, _, qualname = path.partition(":")
+    if module_name.split(".")[0] != "genshin":
+        raise ValueError(f"Refusing to revive a class outside of genshin: {path}")
+
+    obj: typing.Any = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+
+    if not isinstance(obj, type) or not issubclass(obj, base):
+        raise ValueError(f"Refusing to revive {path} as it is not a subclass of {base.__name__}")
+
+    return obj
+
+
+def dump_model(value: typing.Any) -> typing.Any:
+    """Convert a parsed model into a json-compatible object which can be revived without validation.
+
+    Only models, enums and named tuples of the genshin package may be revived.
+    """
+    if isinstance(value, enum.Enum):
+        return {"$enum": _get_path(type(value)), "value": dump_model(value.value)}
+
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+
+    if isinstance(value, pydantic.BaseModel):
+        fields = {name: dump_model(field) for name, field in vars(value).items()}
+        return {"$model": _get_path(type(value)), "fields": fields, "set": sorted(value.model_fields_set)}
+
+    if isinstance(value, datetime.datetime):
+        return {"$datetime": value.isoformat()}
+
+    if isinstance(value, datetime.date):
+        return {"$date": value.isoformat()}
+
+    if isinstance(value, datetime.timedelta):
+        return {"$timedelta": value.total_seconds()}
+
+    if isinstance(value, (list, tuple)):
+        items = typing.cast("typing.Sequence[typing.Any]", value)
+        if hasattr(items, "_fields"):
+            return {"$namedtuple": _get_path(type(items)), "items": [dump_model(item) for item in items]}
+
+        return [dump_model(item) for item in items]
+
+    if isinstance(value, dict):
+        mapping = typing.cast("dict[typing.Any, typing.Any]", value)
+        return {"$dict": [[dump_model(k), dump_model(v)] for k, v in mapping.items()]}
+
+    raise TypeError(f"Cannot cache a model containing {type(value).__name__}")
+
+
+def load_model(value: typing.Any) -> typing.Any:
+    """Revive a model converted with `dump_model`."""
+    if isinstance(value, list):
+        return [load_model(item) for item in typing.cast("list[typing.Any]", value)]
+
+    if not isinstance(value, dict):
+        return value
+
+    value = typing.cast("dict[str, typing.Any]", value)
+    if "$model" in value:
+        cls = _get_class(value["$model"], pydantic.BaseModel)
+        fields = {name: load_model(field) for name, field in value["fields"].items()}
+        return cls.model_construct(set(value["set"]), **fields)
+
+    if "$enum" in value:
+        return _get_class(value["$enum"], enum.Enum)(load_model(value["value"]))
+
+    if "$datetime" in value:
+        return datetime.datetime.fromisoformat(value["$datetime"])
+
+    if "$date" in value:
+        return datetime.date.fromisoformat(value["$date"])
+
+    if "$timedelta" in value:
+        return datetime.timedelta(seconds=value["$timedelta"])
+
+    if "$namedtuple" in value:
+        return _get_class(value["$namedtuple"], tuple)(*(load_model(item) for item in value["items"]))
+
+    return {load_model(k): load_model(v) for k, v in value["$dict"]}
+
+
+@dataclasses.dataclass
+class CachePolicy:
+    """Policy for caching responses of the client.
+
+    The default policy caches responses for the default ttl of the cache.
+    """
+
+    stale_ttl: float = 0
+    """Time in seconds an expired response is still served while it's refreshed in the background."""
+
+    negative_ttl: float = 0
+    """Time in seconds errors with a retcode in `negative_retcodes` are cached for."""
+
+    negative_retcodes: typing.Collection[int] = (10102, 1009)
+    """Retcodes of errors which may be cached. Defaults to DataNotPublic and AccountNotFound."""
+
+    ttl_overrides: typing.Mapping[str, float] = dataclasses.field(default_factory=dict[str, float])
+    """Custom ttls for specific endpoints or cache key names."""
+
+    def get_ttl_override(self, key: typing.Any) -> typing.Optional[float]:
+        """Get a custom ttl for a cache key."""
+        if not self.ttl_overrides:
+            return None
+
+        for name in (getattr(key, "endpoint", None), getattr(key, "key", None)):
+            if name is not None and name in self.ttl_overrides:
+                return self.ttl_overrides[name]
+
+        return None
+
+    def wrap(self, value: typing.Any, ttl: float) -> typing.Any:
+        """Wrap a value with the time it stays fresh for."""
+        if not self.stale_ttl:
+            return value
+
+        return {_ENTRY_MARKER: 1, "fresh_until": time.time() + ttl, "data": value}
+
+    def wrap_error(self, response: typing.Mapping[str, typing.Any]) -> typing.Any:
+        """Wrap an error response."""
+        return {_ENTRY_MARKER: 1, "error": dict(response)}
+
+    @staticmethod
+    def unwrap(
+        value: typing.Any,
+    ) -> tuple[typing.Any, typing.Optional[float], typing.Optional[typing.Mapping[str, typing.Any]]]:
+        """Unwrap a cached value into its data, the time it stays fresh until and its error response."""
+        if not isinstance(value, dict):
+            return value, None, None
+
+        entry = typing.cast("dict[str, typing.Any]", value)
+        if _ENTRY_MARKER not in entry:
+            return entry, None, None
+
+        return entry.get("data"), entry.get("fresh_until"), entry.get("error")
+
+
 class BaseCache(abc.ABC):
     """Base cache for the client."""
 
@@ -80,56 +268,201 @@ class BaseCache(abc.ABC):
     async def set_static(self, key: typing.Any, value: typing.Any) -> None:
         """Save a static object with a key."""
 
+    batch_gets: bool = False
+    """Whether concurrent lookups made by the client should be batched into a single get_many."""
+
+    async def get_many(self, keys: typing.Sequence[typing.Any]) -> typing.Sequence[typing.Optional[typing.Any]]:
+        """Get multiple objects with their keys."""
+        return await asyncio.gather(*(self.get(key) for key in keys))
+
+    async def set_many(self, items: typing.Mapping[typing.Any, typing.Any], *, static: bool = False) -> None:
+        """Save multiple objects with their keys."""
+        setter = self.set_static if static else self.set
+        await asyncio.gather(*(setter(key, value) for key, value in items.items()))
+
+    async def close(self) -> None:
+        """Write pending items and release held resources, the cache may still be used afterwards."""
+
+    async def set_with_ttl(self, key: typing.Any, value: typing.Any, ttl: float, *, static: bool = False) -> None:
+        """Save an object with a key and an explicit ttl.
+
+        Caches without support for custom ttls fall back to their default ttl.
+        """
+        if static:
+            await self.set_static(key, value)
+        else:
+            await self.set(key, value)
+
+    async def get_model(self, key: typing.Any, *, static: bool = False) -> typing.Optional[typing.Any]:
+        """Get a parsed model with a key.
+
+        Models are stored as json and revived without validation, only classes of the genshin package are revived.
+        """
+        value = await (self.get_static(key) if static else self.get(key))
+        if not isinstance(value, str):
+            return None
+
+        return load_model(json.loads(value))
+
+    async def set_model(self, key: typing.Any, model: typing.Any, *, static: bool = False) -> None:
+        """Save a parsed model with a key."""
+        value = json.dumps(dump_model(model), separators=(",", ":"))
+        if static:
+            await self.set_static(key, value)
+        else:
+            await self.set(key, value)
+
+
+_pending_gets: weakref.WeakKeyDictionary[BaseCache, dict[typing.Any, asyncio.Future[typing.Any]]] = (
+    weakref.WeakKeyDictionary()
+)
+_batch_tasks: set[asyncio.Task[None]] = set()
+
+
+async def _run_batched_get(cache: BaseCache, batch: dict[typing.Any, asyncio.Future[typing.Any]]) -> None:
+    """Resolve a batch of pending lookups with a single get_many."""
+    if _pending_gets.get(cache) is batch:
+        del _pending_gets[cache]
+
+    try:
+        values = await cache.get_many(list(batch.keys()))
+    except Exception as e:
+        for future in batch.values():
+            if not future.done():
+                future.set_exception(e)
+        return
+
+    for future, value in zip(batch.values(), values):
+        if not future.done():
+            future.set_result(value)
+
+
+async def batched_get(cache: BaseCache, key: typing.Any) -> typing.Optional[typing.Any]:
+    """Get an object with a key.
+
+    If the cache supports it, all lookups made within the same event loop iteration are batched into one get_many.
+    """
+    if not cache.batch_gets:
+        return await cache.get(key)
+
+    batch = _pending_gets.get(cache)
+    if batch is None:
+        batch = _pending_gets[cache] = {}
+        task = asyncio.create_task(_run_batched_get(cache, batch))
+        _batch_tasks.add(task)
+        task.add_done_callback(_batch_tasks.discard)
+
+    future = batch.get(key)
+    if future is None:
+        future = batch[key] = asyncio.get_running_loop().create_future()
+
+    return await asyncio.shield(future)
+
+
+@dataclasses.dataclass
+class CacheStats:
+    """Statistics of an in-memory cache."""
+
+    hits: int = 0
+    misses: int = 0
+    expirations: int = 0
+    evictions: int = 0
+
 
 class Cache(BaseCache):
-    """Standard implementation of the cache."""
+    """Standard implementation of the cache.
+
+    Least recently used items are evicted once maxsize is reached.
+    Expired items are removed lazily using a heap ordered by expiration.
+    """
 
-    cache: dict[typing.Any, tuple[float, typing.Any]]
+    cache: collections.OrderedDict[typing.Any, tuple[float, typing.Any]]
     maxsize: int
     ttl: float
     static_ttl: float
+    stats: CacheStats
+
+    # [(expiration, unique order, key), ...]
+    _expirations: list[tuple[float, int, typing.Any]]
+    _order: typing.Iterator[int]
 
     def __init__(self, maxsize: int = 1024, *, ttl: float = HOUR, static_ttl: float = DAY) -> None:
-        self.cache = {}
+        self.cache = collections.OrderedDict()
         self.maxsize = maxsize
 
         self.ttl = ttl
         self.static_ttl = static_ttl
 
+        self.stats = CacheStats()
+        self._expirations = []
+        self._order = itertools.count()
+
     def __len__(self) -> int:
         self._clear_cache()
         return len(self.cache)
 
     def _clear_cache(self) -> None:
-        """Clear timed-out items."""
+        """Clear timed-out and overflowing items."""
         # since this is always called from an async function we don't need locks
         now = time.time()
 
-        for key, value in self.cache.copy().items():
-            if value[0] < now:
+        while self._expirations and self._expirations[0][0] < now:
+            expiration, _, key = heapq.heappop(self._expirations)
+
+            # the key might have been overwritten or evicted since
+            item = self.cache.get(key)
+            if item is not None and item[0] == expiration:
                 del self.cache[key]
+                self.stats.expirations += 1
 
-        if len(self.cache) > self.maxsize:
-            overflow = len(self.cache) - self.maxsize
-            keys = list(self.cache.keys())[:overflow]
+        while len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+            self.stats.evictions += 1
 
-            for key in keys:
-                del self.cache[key]
+        # prevent the heap from growing indefinitely with overwritten keys
+        if len(self._expirations) > 2 * len(self.cache) + 64:
+            self._expirations = [(exp, next(self._order), key) for key, (exp, _) in self.cache.items()]
+            heapq.heapify(self._expirations)
+
+    def _set(self, key: typing.Any, value: typing.Any, ttl: float) -> None:
+        """Save an object with a key and an explicit ttl."""
+        expiration = time.time() + ttl
+
+        self.cache[key] = (expiration, value)
+        self.cache.move_to_end(key)
+        heapq.heappush(self._expirations, (expiration, next(self._order), key))
+
+        self._clear_cache()
 
     async def get(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get an object with a key."""
         self._clear_cache()
 
-        if key not in self.cache:
+        item = self.cache.get(key)
+        if item is None:
+            self.stats.misses += 1
             return None
 
-        return self.cache[key][1]
+        self.cache.move_to_end(key)
+        self.stats.hits += 1
+        return item[1]
 
     async def set(self, key: typing.Any, value: typing.Any) -> None:
         """Save an object with a key."""
-        self.cache[key] = (time.time() + self.ttl, value)
+        self._set(key, value, self.ttl)
 
-        self._clear_cache()
+    async def get_many(self, keys: typing.Sequence[typing.Any]) -> typing.Sequence[typing.Optional[typing.Any]]:
+        """Get multiple objects with their keys."""
+        return [await self.get(key) for key in keys]
+
+    async def set_with_ttl(self, key: typing.Any, value: typing.Any, ttl: float, *, static: bool = False) -> None:
+        """Save an object with a key and an explicit ttl."""
+        self._set(key, value, ttl)
+
+    async def set_many(self, items: typing.Mapping[typing.Any, typing.Any], *, static: bool = False) -> None:
+        """Save multiple objects with their keys."""
+        for key, value in items.items():
+            self._set(key, value, self.static_ttl if static else self.ttl)
 
     async def get_static(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get a static object with a key."""
@@ -137,9 +470,18 @@ class Cache(BaseCache):
 
     async def set_static(self, key: typing.Any, value: typing.Any) -> None:
         """Save a static object with a key."""
-        self.cache[key] = (time.time() + self.static_ttl, value)
+        self._set(key, value, self.static_ttl)
 
-        self._clear_cache()
+    async def get_model(self, key: typing.Any, *, static: bool = False) -> typing.Optional[typing.Any]:
+        """Get a parsed model with a key, models are kept as-is and must not be mutated."""
+        return await (self.get_static(key) if static else self.get(key))
+
+    async def set_model(self, key: typing.Any, model: typing.Any, *, static: bool = False) -> None:
+        """Save a parsed model with a key."""
+        if static:
+            await self.set_static(key, model)
+        else:
+            await self.set(key, model)
 
 
 class StaticCache(Cache):
@@ -151,18 +493,41 @@ class StaticCache(Cache):
     async def set(self, key: typing.Any, value: typing.Any) -> None:
         """Do nothing."""
 
+    async def set_with_ttl(self, key: typing.Any, value: typing.Any, ttl: float, *, static: bool = False) -> None:
+        """Save only static objects."""
+        if static:
+            await super().set_with_ttl(key, value, ttl, static=static)
+
 
 class RedisCache(BaseCache):
-    """Redis implementation of the cache."""
+    """Redis implementation of the cache.
+
+    Values are encoded with json by default, orjson and msgpack may be used for a compact binary encoding.
+    Encoded values may be additionally compressed with zlib or zstd.
+    """
 
     redis: aioredis.Redis
     ttl: int
     static_ttl: int
+    encoding: typing.Literal["json", "orjson", "msgpack"]
+    compression: typing.Optional[typing.Literal["zlib", "zstd"]]
 
-    def __init__(self, redis: aioredis.Redis, *, ttl: int = HOUR, static_ttl: int = DAY) -> None:
+    batch_gets = True
+
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        *,
+        ttl: int = HOUR,
+        static_ttl: int = DAY,
+        encoding: typing.Literal["json", "orjson", "msgpack"] = "json",
+        compression: typing.Optional[typing.Literal["zlib", "zstd"]] = None,
+    ) -> None:
         self.redis = redis
         self.ttl = ttl
         self.static_ttl = static_ttl
+        self.encoding = encoding
+        self.compression = compression
 
     def serialize_key(self, key: typing.Any) -> str:
         """Serialize a key by turning it into a string."""
@@ -170,10 +535,49 @@ class RedisCache(BaseCache):
 
     def serialize_value(self, value: typing.Any) -> typing.Union[str, bytes]:
         """Serialize a value by turning it into bytes."""
-        return json.dumps(value)
+        if self.encoding == "orjson":
+            import orjson
+
+            data: typing.Union[str, bytes] = orjson.dumps(value)
+        elif self.encoding == "msgpack":
+            import msgpack
+
+            data = typing.cast("bytes", msgpack.packb(value))  # pyright: ignore[reportUnknownMemberType]
+        else:
+            data = json.dumps(value)
+
+        if self.compression is None:
+            return data
+
+        if isinstance(data, str):
+            data = data.encode()
+
+        if self.compression == "zstd":
+            import zstandard
+
+            return zstandard.compress(data)
+
+        return zlib.compress(data)
 
     def deserialize_value(self, value: bytes) -> typing.Any:
         """Deserialize a value back into data."""
+        if self.compression == "zstd":
+            import zstandard
+
+            value = zstandard.decompress(value)
+        elif self.compression == "zlib":
+            value = zlib.decompress(value)
+
+        if self.encoding == "orjson":
+            import orjson
+
+            return orjson.loads(value)
+
+        if self.encoding == "msgpack":
+            import msgpack
+
+            return msgpack.unpackb(value)  # pyright: ignore[reportUnknownMemberType]
+
         return json.loads(value)
 
     async def get(self, key: typing.Any) -> typing.Optional[typing.Any]:
@@ -204,13 +608,81 @@ class RedisCache(BaseCache):
             ex=self.static_ttl,
         )
 
+    async def set_with_ttl(self, key: typing.Any, value: typing.Any, ttl: float, *, static: bool = False) -> None:
+        """Save an object with a key and an explicit ttl."""
+        await self.redis.set(  # pyright: ignore
+            self.serialize_key(key),
+            self.serialize_value(value),
+            ex=max(1, math.ceil(ttl)),
+        )
+
+    async def get_model(self, key: typing.Any, *, static: bool = False) -> typing.Optional[typing.Any]:
+        """Get a parsed model with a key.
+
+        Models are stored as json and revived without validation, only classes of the genshin package are revived.
+        """
+        value = typing.cast("typing.Optional[bytes]", await self.redis.get(self.serialize_key(key)))  # pyright: ignore
+        if value is None:
+            return None
+
+        return load_model(json.loads(value))
+
+    async def set_model(self, key: typing.Any, model: typing.Any, *, static: bool = False) -> None:
+        """Save a parsed model with a key."""
+        await self.redis.set(  # pyright: ignore
+            self.serialize_key(key),
+            json.dumps(dump_model(model), separators=(",", ":")).encode(),
+            ex=self.static_ttl if static else self.ttl,
+        )
+
+    async def get_many(self, keys: typing.Sequence[typing.Any]) -> typing.Sequence[typing.Optional[typing.Any]]:
+        """Get multiple objects with their keys in a single round trip."""
+        if not keys:
+            return []
+
+        values = typing.cast(
+            "typing.Sequence[typing.Optional[bytes]]",
+            await self.redis.mget([self.serialize_key(key) for key in keys]),  # pyright: ignore
+        )
+        return [None if value is None else self.deserialize_value(value) for value in values]
+
+    async def set_many(self, items: typing.Mapping[typing.Any, typing.Any], *, static: bool = False) -> None:
+        """Save multiple objects with their keys in a single round trip."""
+        if not items:
+            return
+
+        ttl = self.static_ttl if static else self.ttl
+
+        async with self.redis.pipeline(transaction=False) as pipe:  # pyright: ignore
+            for key, value in items.items():
+                pipe.set(self.serialize_key(key), self.serialize_value(value), ex=ttl)  # pyright: ignore
+
+            await pipe.execute()  # pyright: ignore
+
 
 class SQLiteCache(BaseCache):
-    """SQLite implementation of the cache."""
+    """SQLite implementation of the cache.
+
+    A single connection is kept open for the lifetime of the cache. Writes are buffered
+    and flushed in batches once `batch_size` is reached or after `flush_interval` seconds.
+    Expired rows are pruned by a background task every `prune_interval` seconds.
+    """
 
     conn: aiosqlite.Connection | None
     ttl: int
     static_ttl: int
+    batch_size: int
+    flush_interval: float
+    prune_interval: float
+
+    # {key: (value, expiration), ...}
+    _pending: dict[str, tuple[str, int]]
+    _initialized: bool
+    _owns_conn: bool
+    _flush_task: asyncio.Task[None] | None
+    _prune_task: asyncio.Task[None] | None
+
+    batch_gets = True
 
     def __init__(
         self,
@@ -219,17 +691,36 @@ class SQLiteCache(BaseCache):
         ttl: int = HOUR,
         static_ttl: int = DAY,
         db_name: str = ".cache/genshin_py.db",
+        batch_size: int = 100,
+        flush_interval: float = 1,
+        prune_interval: float = MINUTE,
     ) -> None:
         self.conn = conn
         self.ttl = ttl
         self.static_ttl = static_ttl
         self.db_name = db_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.prune_interval = prune_interval
+
+        self._pending = {}
+        self._initialized = False
+        self._owns_conn = conn is None
+        self._flush_task = None
+        self._prune_task = None
 
         if conn is None:
             directory = os.path.dirname(db_name)
             if directory:
                 os.makedirs(directory, exist_ok=True)
 
+    async def __aenter__(self) -> SQLiteCache:
+        await self.initialize()
+        return self
+
+    async def __aexit__(self, *exc_info: typing.Any) -> None:
+        await self.close()
+
     async def _clear_cache(self, conn: aiosqlite.Connection) -> None:
         """Clear timed-out items."""
         now = time.time()
@@ -237,20 +728,90 @@ class SQLiteCache(BaseCache):
         await conn.execute("DELETE FROM cache WHERE expiration < ?", (now,))
         await conn.commit()
 
+    async def _prune_periodically(self) -> None:
+        """Clear timed-out items in the background."""
+        while True:
+            await asyncio.sleep(self.prune_interval)
+
+            try:
+                await self._clear_cache(await self._connect())
+            except Exception:
+                _LOGGER.exception("Failed to prune the sqlite cache")
+
+    async def _flush_later(self) -> None:
+        """Flush the pending writes after the flush interval."""
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+
+        try:
+            await self.flush()
+        except Exception:
+            _LOGGER.exception("Failed to flush the sqlite cache")
+
+    @concurrency.prevent_concurrency
     async def initialize(self) -> None:
         """Initialize the cache."""
+        if self._initialized:
+            return
+
         import aiosqlite
 
         if self.conn is None:
-            conn = await aiosqlite.connect(self.db_name)
-        else:
-            conn = self.conn
+            self.conn = await aiosqlite.connect(self.db_name)
+            self._owns_conn = True
+
+        # the journal mode persists in the database file, connections passed in keep their own settings
+        if self._owns_conn:
+            await self.conn.execute("PRAGMA journal_mode=WAL")
+            await self.conn.execute("PRAGMA synchronous=NORMAL")
+
+        await self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expiration INTEGER)"
+        )
+        await self.conn.execute("CREATE INDEX IF NOT EXISTS cache_expiration ON cache (expiration)")
+        await self.conn.commit()
+
+        self._prune_task = asyncio.create_task(self._prune_periodically())
+        self._initialized = True
+
+    async def _connect(self) -> aiosqlite.Connection:
+        """Get the connection, initializing the cache if needed."""
+        if not self._initialized:
+            await self.initialize()
+
+        assert self.conn is not None
+        return self.conn
+
+    async def flush(self) -> None:
+        """Write all pending items to the database."""
+        if not self._pending:
+            return
 
-        await conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expiration INTEGER)")
+        pending, self._pending = self._pending, {}
+
+        conn = await self._connect()
+        await conn.executemany(
+            "INSERT OR REPLACE INTO cache (key, value, expiration) VALUES (?, ?, ?)",
+            [(key, value, expiration) for key, (value, expiration) in pending.items()],
+        )
         await conn.commit()
 
-        if self.conn is None:
-            await conn.close()
+    async def close(self) -> None:
+        """Flush pending writes and close the connection if it's owned by the cache."""
+        for task in (self._prune_task, self._flush_task):
+            if task is not None:
+                task.cancel()
+
+        self._prune_task = self._flush_task = None
+
+        # writes are queued without connecting, the cache may not be initialized yet
+        await self.flush()
+
+        if self.conn is not None and self._owns_conn:
+            await self.conn.close()
+            self.conn = None
+
+        self._initialized = False
 
     def serialize_key(self, key: typing.Any) -> str:
         """Serialize a key by turning it into a string."""
@@ -264,62 +825,78 @@ class SQLiteCache(BaseCache):
         """Deserialize a value back into data."""
         return json.loads(value)
 
+    async def _set(self, key: typing.Any, value: typing.Any, ttl: float) -> None:
+        """Queue an object to be saved with a key and an explicit ttl."""
+        self._pending[self.serialize_key(key)] = (self.serialize_value(value), int(time.time() + ttl))
+
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
     async def get(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get an object with a key."""
-        import aiosqlite
-
-        if self.conn is None:
-            conn = await aiosqlite.connect(self.db_name)
-        else:
-            conn = self.conn
+        key = self.serialize_key(key)
 
-        try:
-            async with conn.execute(
-                "SELECT value FROM cache WHERE key = ? AND expiration > ?", (self.serialize_key(key), int(time.time()))
-            ) as cursor:
-                value = await cursor.fetchone()
-        except aiosqlite.OperationalError as e:
-            if "no such table" in str(e):
-                await self.initialize()
-                return None
-            else:
-                raise
+        if key in self._pending:
+            value, expiration = self._pending[key]
+            return self.deserialize_value(value) if expiration > time.time() else None
 
-        if self.conn is None:
-            await conn.close()
+        conn = await self._connect()
+        async with conn.execute(
+            "SELECT value FROM cache WHERE key = ? AND expiration > ?", (key, int(time.time()))
+        ) as cursor:
+            row = await cursor.fetchone()
 
-        if value is None:
+        if row is None:
             return None
 
-        return self.deserialize_value(value[0])
+        return self.deserialize_value(row[0])
 
     async def set(self, key: typing.Any, value: typing.Any) -> None:
         """Save an object with a key."""
-        import aiosqlite
-
-        if self.conn is None:
-            conn = await aiosqlite.connect(self.db_name)
-        else:
-            conn = self.conn
+        await self._set(key, value, self.ttl)
 
-        try:
-            await conn.execute(
-                "INSERT OR REPLACE INTO cache (key, value, expiration) VALUES (?, ?, ?)",
-                (self.serialize_key(key), self.serialize_value(value), int(time.time() + self.ttl)),
-            )
-        except aiosqlite.OperationalError as e:
-            if "no such table" in str(e):
-                await self.initialize()
-                await self.set(key, value)
-                return
+    async def get_many(self, keys: typing.Sequence[typing.Any]) -> typing.Sequence[typing.Optional[typing.Any]]:
+        """Get multiple objects with their keys in a single query."""
+        now = time.time()
+        serialized_keys = [self.serialize_key(key) for key in keys]
+
+        found: dict[str, typing.Any] = {}
+        missing: list[str] = []
+        for key in serialized_keys:
+            if key in self._pending:
+                value, expiration = self._pending[key]
+                if expiration > now:
+                    found[key] = self.deserialize_value(value)
             else:
-                raise
-
-        await conn.commit()
-        await self._clear_cache(conn)
-
-        if self.conn is None:
-            await conn.close()
+                missing.append(key)
+
+        if missing:
+            conn = await self._connect()
+            # stay well below the sqlite variable limit
+            for index in range(0, len(missing), 500):
+                chunk = missing[index : index + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                async with conn.execute(
+                    f"SELECT key, value FROM cache WHERE key IN ({placeholders}) AND expiration > ?",  # noqa: S608
+                    (*chunk, int(now)),
+                ) as cursor:
+                    for key, value in await cursor.fetchall():
+                        found[key] = self.deserialize_value(value)
+
+        return [found.get(key) for key in serialized_keys]
+
+    async def set_many(self, items: typing.Mapping[typing.Any, typing.Any], *, static: bool = False) -> None:
+        """Save multiple objects with their keys."""
+        expiration = int(time.time() + (self.static_ttl if static else self.ttl))
+        for key, value in items.items():
+            self._pending[self.serialize_key(key)] = (self.serialize_value(value), expiration)
+
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        elif self._pending and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
 
     async def get_static(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get a static object with a key."""
@@ -327,28 +904,289 @@ class SQLiteCache(BaseCache):
 
     async def set_static(self, key: typing.Any, value: typing.Any) -> None:
         """Save a static object with a key."""
-        import aiosqlite
+        await self._set(key, value, self.static_ttl)
 
-        if self.conn is None:
-            conn = await aiosqlite.connect(self.db_name)
-        else:
-            conn = self.conn
+    async def set_with_ttl(self, key: typing.Any, value: typing.Any, ttl: float, *, static: bool = False) -> None:
+        """Save an object with a key and an explicit ttl."""
+        await self._set(key, value, ttl)
+
+
+class _Remembered:
+    """A value kept in memory by a versioned tiered cache."""
+
+    __slots__ = ("checked_at", "value", "version")
+
+    value: typing.Any
+    version: typing.Optional[str]
+    checked_at: float
+
+    def __init__(self, value: typing.Any, version: typing.Optional[str]) -> None:
+        self.value = value
+        self.version = version
+        self.checked_at = time.monotonic()
+
+
+class TieredCache(BaseCache):
+    """Two-tier cache with a small in-memory cache in front of a shared cache.
+
+    Values found in the shared cache are kept in memory for at most `l1_ttl` seconds
+    (`l1_static_ttl` for static values). When the shared cache is a `RedisCache`,
+    every write is published so that other processes evict their outdated copies.
+    Other shared caches keep a version of every written key, the version of a value kept
+    in memory is compared at most once every `version_check_interval` seconds.
+    """
+
+    l1: Cache
+    l2: BaseCache
+    l1_ttl: float
+    l1_static_ttl: float
+    version_check_interval: float
+    channel: str
+
+    _worker_id: str
+    _listener: asyncio.Task[None] | None
+
+    def __init__(
+        self,
+        l2: BaseCache,
+        *,
+        l1: typing.Optional[Cache] = None,
+        l1_ttl: float = MINUTE,
+        l1_static_ttl: float = HOUR,
+        version_check_interval: float = 1,
+        channel: str = "genshin.py:invalidate",
+    ) -> None:
+        self.l1 = l1 if l1 is not None else Cache(1024)
+        self.l2 = l2
+        self.l1_ttl = l1_ttl
+        self.l1_static_ttl = l1_static_ttl
+        self.version_check_interval = version_check_interval
+        self.channel = channel
+
+        self._worker_id = uuid.uuid4().hex
+        self._listener = None
+
+    async def __aenter__(self) -> TieredCache:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: typing.Any) -> None:
+        await self.close()
+
+    @property
+    def batch_gets(self) -> bool:  # type: ignore[override]
+        """Whether lookups should be batched, depends on the shared cache."""
+        return self.l2.batch_gets
+
+    @property
+    def ttl(self) -> typing.Optional[float]:
+        """Default ttl of the shared cache."""
+        return getattr(self.l2, "ttl", None)
+
+    @property
+    def static_ttl(self) -> typing.Optional[float]:
+        """Default static ttl of the shared cache."""
+        return getattr(self.l2, "static_ttl", None)
+
+    @property
+    def versioned(self) -> bool:
+        """Whether values kept in memory are checked against key versions instead of published invalidations."""
+        return not isinstance(self.l2, RedisCache)
+
+    async def _listen(self, redis: aioredis.Redis) -> None:
+        """Evict values updated by other processes."""
+        pubsub = redis.pubsub()  # pyright: ignore
+        await pubsub.subscribe(self.channel)  # pyright: ignore
 
         try:
-            await conn.execute(
-                "INSERT OR REPLACE INTO cache (key, value, expiration) VALUES (?, ?, ?)",
-                (self.serialize_key(key), self.serialize_value(value), int(time.time() + self.static_ttl)),
-            )
-        except aiosqlite.OperationalError as e:
-            if "no such table" in str(e):
-                await self.initialize()
-                await self.set_static(key, value)
+            async for message in pubsub.listen():  # pyright: ignore
+                message = typing.cast("typing.Mapping[str, typing.Any]", message)
+                if message["type"] != "message":
+                    continue
+
+                data: typing.Union[str, bytes] = message["data"]
+                worker_id, _, key = (data.decode() if isinstance(data, bytes) else data).partition(":")
+                if worker_id != self._worker_id:
+                    self.invalidate(key)
+        finally:
+            await pubsub.unsubscribe(self.channel)  # pyright: ignore
+
+    async def start(self) -> None:
+        """Start listening for invalidations from other processes, restarting a listener which died."""
+        if not isinstance(self.l2, RedisCache):
+            return
+
+        if self._listener is not None:
+            if not self._listener.done():
                 return
+
+            if not self._listener.cancelled() and self._listener.exception() is not None:
+                _LOGGER.warning("Invalidation listener died, restarting", exc_info=self._listener.exception())
+
+            # invalidations were missed while nobody was listening
+            self.l1.cache.clear()
+
+        self._listener = asyncio.create_task(self._listen(self.l2.redis))
+
+    async def close(self) -> None:
+        """Stop listening for invalidations and close the shared cache."""
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+        await self.l2.close()
+
+    def invalidate(self, key: typing.Any) -> None:
+        """Evict a key from the in-memory cache."""
+        self.l1.cache.pop(str(key), None)
+
+    @staticmethod
+    def _version_key(key: typing.Any) -> str:
+        return f"tiered-version:{key}"
+
+    async def _get_versions(self, keys: typing.Sequence[typing.Any]) -> typing.Sequence[typing.Optional[str]]:
+        """Get the current versions of keys in the shared cache."""
+        if not self.versioned or not keys:
+            return [None] * len(keys)
+
+        return await self.l2.get_many([self._version_key(key) for key in keys])
+
+    async def _publish(self, keys: typing.Collection[typing.Any]) -> typing.Optional[str]:
+        """Tell other processes their copies of keys are outdated.
+
+        Returns the new version of the keys if the shared cache is versioned.
+        """
+        if self.versioned:
+            version = uuid.uuid4().hex
+            await self.l2.set_many({self._version_key(key): version for key in keys}, static=True)
+            return version
+
+        assert isinstance(self.l2, RedisCache)
+        async with self.l2.redis.pipeline(transaction=False) as pipe:  # pyright: ignore
+            for key in keys:
+                pipe.publish(self.channel, f"{self._worker_id}:{key}")  # pyright: ignore
+
+            await pipe.execute()  # pyright: ignore
+
+        return None
+
+    def _remember(self, key: typing.Any, value: typing.Any, ttl: float, version: typing.Optional[str]) -> None:
+        """Keep a value in memory."""
+        self.l1._set(str(key), _Remembered(value, version) if self.versioned else value, ttl)
+
+    async def _recall(self, keys: typing.Sequence[typing.Any]) -> list[typing.Optional[typing.Any]]:
+        """Get values kept in memory which are still up to date.
+
+        Versions checked within the last `version_check_interval` seconds are trusted without a round trip.
+        """
+        await self.start()
+
+        entries = list(await self.l1.get_many([str(key) for key in keys]))
+        if not self.versioned:
+            return entries
+
+        now = time.monotonic()
+        values: list[typing.Optional[typing.Any]] = [None] * len(keys)
+        unchecked: list[int] = []
+        for index, entry in enumerate(entries):
+            if entry is None:
+                continue
+
+            if now - typing.cast("_Remembered", entry).checked_at < self.version_check_interval:
+                values[index] = entry.value
+            else:
+                unchecked.append(index)
+
+        versions = await self._get_versions([keys[index] for index in unchecked])
+        for index, version in zip(unchecked, versions):
+            entry = typing.cast("_Remembered", entries[index])
+            if entry.version == version:
+                entry.checked_at = now
+                values[index] = entry.value
             else:
-                raise
+                self.invalidate(keys[index])
 
-        await conn.commit()
-        await self._clear_cache(conn)
+        return values
 
-        if self.conn is None:
-            await conn.close()
+    async def _get(self, key: typing.Any, *, static: bool) -> typing.Optional[typing.Any]:
+        value = (await self._recall([key]))[0]
+        if value is not None:
+            return value
+
+        # the version is read first, a concurrent write can only make the remembered value look outdated
+        (version,) = await self._get_versions([key])
+        value = await (self.l2.get_static(key) if static else self.l2.get(key))
+        if value is not None:
+            self._remember(key, value, self.l1_static_ttl if static else self.l1_ttl, version)
+
+        return value
+
+    async def get(self, key: typing.Any) -> typing.Optional[typing.Any]:
+        """Get an object with a key."""
+        return await self._get(key, static=False)
+
+    async def get_static(self, key: typing.Any) -> typing.Optional[typing.Any]:
+        """Get a static object with a key."""
+        return await self._get(key, static=True)
+
+    async def get_many(
+        self,
+        keys: typing.Sequence[typing.Any],
+        *,
+        static: bool = False,
+    ) -> typing.Sequence[typing.Optional[typing.Any]]:
+        """Get multiple objects with their keys, static objects are kept in memory for `l1_static_ttl`."""
+        values = await self._recall(keys)
+
+        missing = [index for index, value in enumerate(values) if value is None]
+        if missing:
+            versions = await self._get_versions([keys[index] for index in missing])
+            found = await self.l2.get_many([keys[index] for index in missing])
+            for index, value, version in zip(missing, found, versions):
+                if value is not None:
+                    values[index] = value
+                    self._remember(keys[index], value, self.l1_static_ttl if static else self.l1_ttl, version)
+
+        return values
+
+    async def set(self, key: typing.Any, value: typing.Any) -> None:
+        """Save an object with a key."""
+        await self.l2.set(key, value)
+        self._remember(key, value, self.l1_ttl, await self._publish([key]))
+
+    async def set_static(self, key: typing.Any, value: typing.Any) -> None:
+        """Save a static object with a key."""
+        await self.l2.set_static(key, value)
+        self._remember(key, value, self.l1_static_ttl, await self._publish([key]))
+
+    async def set_many(self, items: typing.Mapping[typing.Any, typing.Any], *, static: bool = False) -> None:
+        """Save multiple objects with their keys."""
+        await self.l2.set_many(items, static=static)
+
+        version = await self._publish(items.keys())
+        for key, value in items.items():
+            self._remember(key, value, self.l1_static_ttl if static else self.l1_ttl, version)
+
+    async def set_with_ttl(self, key: typing.Any, value: typing.Any, ttl: float, *, static: bool = False) -> None:
+        """Save an object with a key and an explicit ttl."""
+        await self.l2.set_with_ttl(key, value, ttl, static=static)
+        version = await self._publish([key])
+        self._remember(key, value, min(ttl, self.l1_static_ttl if static else self.l1_ttl), version)
+
+    async def get_model(self, key: typing.Any, *, static: bool = False) -> typing.Optional[typing.Any]:
+        """Get a parsed model with a key."""
+        model = (await self._recall([key]))[0]
+        if model is not None:
+            return model
+
+        (version,) = await self._get_versions([key])
+        model = await self.l2.get_model(key, static=static)
+        if model is not None:
+            self._remember(key, model, self.l1_static_ttl if static else self.l1_ttl, version)
+
+        return model
+
+    async def set_model(self, key: typing.Any, model: typing.Any, *, static: bool = False) -> None:
+        """Save a parsed model with a key."""
+        await self.l2.set_model(key, model, static=static)
+        self._remember(key, model, self.l1_static_ttl if static else self.l1_ttl, await self._publish([key]))
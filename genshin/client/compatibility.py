@@ -77,7 +77,7 @@ class GenshinClient(clients.Client):
         return self
 
     async def __aexit__(self, *exc_info: typing.Any) -> None:
-        pass
+        await self.close()
 
     @deprecation.deprecated("get_partial_genshin_user")
     async def get_partial_user(
@@ -6,6 +6,7 @@ import functools
 import json
 import logging
 import os
+import time
 import typing
 import urllib.parse
 import warnings
@@ -18,6 +19,7 @@ from genshin import constants, errors, types, utility
 from genshin.client import cache as client_cache
 from genshin.client import routes
 from genshin.client.manager import managers
+from genshin.client.manager import transport as manager_transport
 from genshin.models import hoyolab as hoyolab_models
 from genshin.utility import concurrency, deprecation, ds
 from genshin.utility.uid import recognize_server
@@ -51,6 +53,8 @@ class BaseClient(abc.ABC):
         "_hoyolab_id",
         "_accounts",
         "custom_headers",
+        "cache_policy",
+        "cache_models",
     )
 
     USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36"  # noqa: E501
@@ -68,6 +72,8 @@ class BaseClient(abc.ABC):
     _hoyolab_id: typing.Optional[int]
     _accounts: dict[types.Game, hoyolab_models.GenshinAccount]
     custom_headers: multidict.CIMultiDict[str]
+    cache_policy: client_cache.CachePolicy
+    cache_models: bool
 
     def __init__(
         self,
@@ -84,10 +90,13 @@ class BaseClient(abc.ABC):
         device_fp: typing.Optional[str] = None,
         headers: typing.Optional[aiohttp.typedefs.LooseHeaders] = None,
         cache: typing.Optional[client_cache.BaseCache] = None,
+        transport: typing.Optional[manager_transport.Transport] = None,
         debug: bool = False,
     ) -> None:
-        self.cookie_manager = managers.BaseCookieManager.from_cookies(cookies)
-        self.cache = cache or client_cache.StaticCache()
+        self.cookie_manager = managers.BaseCookieManager.from_cookies(cookies, transport=transport)
+        self.cache = cache if cache is not None else client_cache.StaticCache()
+        self.cache_policy = client_cache.CachePolicy()
+        self.cache_models = False
 
         self.uids = {}
         self.authkeys = {}
@@ -119,6 +128,17 @@ class BaseClient(abc.ABC):
         )
         return f"<{type(self).__name__} {', '.join(f'{k}={v!r}' for k, v in kwargs.items() if v)}>"
 
+    async def __aenter__(self: T) -> T:
+        return self
+
+    async def __aexit__(self, *exc_info: typing.Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close all pooled connections of the client and flush its cache."""
+        await self.cookie_manager.close()
+        await self.cache.close()
+
     @property
     def device_id(self) -> typing.Optional[str]:
         """The device id used in headers."""
@@ -262,14 +282,19 @@ class BaseClient(abc.ABC):
         if not bool(cookies) ^ bool(kwargs):
             raise TypeError("Cannot use both positional and keyword arguments at once")
 
-        self.cookie_manager = managers.BaseCookieManager.from_cookies(cookies or kwargs)
+        self._replace_cookie_manager(managers.BaseCookieManager.from_cookies(cookies or kwargs))
 
     def set_browser_cookies(self, browser: typing.Optional[str] = None) -> None:
         """Extract cookies from your browser and set them as client cookies.
 
         Available browsers: chrome, chromium, opera, edge, firefox.
         """
-        self.cookie_manager = managers.BaseCookieManager.from_browser_cookies(browser)
+        self._replace_cookie_manager(managers.BaseCookieManager.from_browser_cookies(browser))
+
+    def _replace_cookie_manager(self, cookie_manager: managers.BaseCookieManager) -> None:
+        """Replace the cookie manager while keeping the pooled connections."""
+        cookie_manager.inherit_transport(self.cookie_manager)
+        self.cookie_manager = cookie_manager
 
     def set_authkey(self, authkey: typing.Optional[str] = None, *, game: typing.Optional[types.Game] = None) -> None:
         """Set an authkey for wish & transaction logs.
@@ -294,13 +319,22 @@ class BaseClient(abc.ABC):
         self.cache = client_cache.Cache(maxsize, ttl=ttl, static_ttl=static_ttl)
 
     def set_redis_cache(
-        self, url: str, *, ttl: int = client_cache.HOUR, static_ttl: int = client_cache.DAY, **redis_kwargs: typing.Any
+        self,
+        url: str,
+        *,
+        ttl: int = client_cache.HOUR,
+        static_ttl: int = client_cache.DAY,
+        encoding: typing.Literal["json", "orjson", "msgpack"] = "json",
+        compression: typing.Optional[typing.Literal["zlib", "zstd"]] = None,
+        **redis_kwargs: typing.Any,
     ) -> None:
         """Create and set a new redis cache."""
         import aioredis
 
         redis = aioredis.Redis.from_url(url, **redis_kwargs)  # pyright: ignore[reportUnknownMemberType]
-        self.cache = client_cache.RedisCache(redis, ttl=ttl, static_ttl=static_ttl)
+        self.cache = client_cache.RedisCache(
+            redis, ttl=ttl, static_ttl=static_ttl, encoding=encoding, compression=compression
+        )
 
     @property
     def proxy(self) -> typing.Optional[str]:
@@ -314,6 +348,11 @@ class BaseClient(abc.ABC):
     def proxy(self, proxy: typing.Optional[aiohttp.typedefs.StrOrURL]) -> None:
         self.cookie_manager.proxy = yarl.URL(proxy) if proxy else None
 
+    @property
+    def single_flight(self) -> concurrency.SingleFlight:
+        """Coalesces identical concurrent requests, shared by all clients using the same transport."""
+        return self.cookie_manager.transport.single_flight
+
     async def _request_hook(
         self,
         method: str,
@@ -337,6 +376,122 @@ class BaseClient(abc.ABC):
         else:
             self.logger.debug("%s %s", method, url)
 
+    def _get_flight_key(
+        self,
+        method: str,
+        url: aiohttp.typedefs.StrOrURL,
+        *,
+        params: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        data: typing.Any = None,
+        headers: typing.Optional[multidict.CIMultiDict[str]] = None,
+        cache: typing.Any = None,
+        static_cache: typing.Any = None,
+        coalesce: typing.Optional[bool] = None,
+        **kwargs: typing.Any,
+    ) -> typing.Optional[typing.Hashable]:
+        """Get a key under which identical concurrent requests are coalesced.
+
+        Returns None if the request must not be coalesced.
+        """
+        # static resources are public
+        if static_cache is not None:
+            return ("static", static_cache)
+
+        # private resources must never be shared between different cookies
+        identifier = self.cookie_manager.identifier
+
+        if cache is not None:
+            return ("cache", cache, identifier)
+
+        # requests without side effects only
+        if not (method == "GET" if coalesce is None else coalesce):
+            return None
+
+        # dynamic secrets are unique for every request
+        relevant_headers = sorted((k.lower(), v) for k, v in (headers or {}).items() if k.lower() != "ds")
+        # extra aiohttp options like timeouts or proxies change the request too
+        payload = json.dumps([params, data, kwargs], sort_keys=True, default=str)
+        return (method, str(url), payload, tuple(relevant_headers), identifier)
+
+    async def _get_cached(
+        self,
+        key: typing.Any,
+        *,
+        static: bool = False,
+        flight_key: typing.Hashable,
+        refresh: typing.Callable[[], typing.Awaitable[typing.Any]],
+    ) -> tuple[bool, typing.Any]:
+        """Get a cached response and whether it was found.
+
+        Stale responses are refreshed in the background, cached errors are raised.
+        """
+        if static:
+            value = await self.cache.get_static(key)
+        else:
+            value = await client_cache.batched_get(self.cache, key)
+
+        if value is None:
+            return False, None
+
+        value, fresh_until, error = self.cache_policy.unwrap(value)
+        if error is not None:
+            errors.raise_for_retcode(dict(error))
+
+        if fresh_until is not None and fresh_until < time.time():
+            self.single_flight.run_in_background(flight_key, refresh)
+
+        return True, value
+
+    async def _set_cached(self, key: typing.Any, value: typing.Any, *, static: bool = False) -> None:
+        """Cache a response according to the cache policy."""
+        policy = self.cache_policy
+
+        ttl = policy.get_ttl_override(key)
+        if ttl is None and policy.stale_ttl:
+            ttl = getattr(self.cache, "static_ttl" if static else "ttl", None)
+
+        if ttl is None:
+            if static:
+                await self.cache.set_static(key, value)
+            else:
+                await self.cache.set(key, value)
+
+            return
+
+        await self.cache.set_with_ttl(key, policy.wrap(value, ttl), ttl + policy.stale_ttl, static=static)
+
+    async def _set_cached_error(self, key: typing.Any, error: errors.GenshinException, *, static: bool = False) -> None:
+        """Cache an error response according to the cache policy."""
+        policy = self.cache_policy
+        if not policy.negative_ttl or error.retcode not in policy.negative_retcodes:
+            return
+
+        await self.cache.set_with_ttl(key, policy.wrap_error(error.response), policy.negative_ttl, static=static)
+
+    async def _request_model(
+        self,
+        key: typing.Any,
+        parse: typing.Callable[[typing.Any], T],
+        fetch: typing.Callable[[], typing.Awaitable[typing.Any]],
+        *,
+        static: bool = False,
+    ) -> T:
+        """Fetch a response and parse it, reusing previously parsed models if cache_models is enabled.
+
+        Models are keyed by the key of their response and the parser, cached models must not be mutated.
+        """
+        if key is None or not self.cache_models:
+            return parse(await fetch())
+
+        model_key = client_cache.ModelCacheKey(f"{parse.__module__}.{parse.__qualname__}", key)
+        model = await self.cache.get_model(model_key, static=static)
+        if model is not None:
+            return model
+
+        model = parse(await fetch())
+        await self.cache.set_model(model_key, model, static=static)
+        return model
+
     async def request(
         self,
         url: aiohttp.typedefs.StrOrURL,
@@ -347,20 +502,13 @@ class BaseClient(abc.ABC):
         headers: typing.Optional[aiohttp.typedefs.LooseHeaders] = None,
         cache: typing.Any = None,
         static_cache: typing.Any = None,
+        coalesce: typing.Optional[bool] = None,
         **kwargs: typing.Any,
     ) -> typing.Mapping[str, typing.Any]:
-        """Make a request and return a parsed json response."""
-        if cache is not None:
-            value = await self.cache.get(cache)
-            if value is not None:
-                return value
-        elif static_cache is not None:
-            value = await self.cache.get_static(static_cache)
-            if value is not None:
-                return value
-
-        # actual request
+        """Make a request and return a parsed json response.
 
+        Identical concurrent requests are coalesced into one, by default only cached and GET requests are.
+        """
         headers = parse_loose_headers(headers)
         headers["User-Agent"] = self.USER_AGENT
         headers.update(self.custom_headers)
@@ -371,20 +519,53 @@ class BaseClient(abc.ABC):
         if "json" in kwargs:
             raise TypeError("Use data instead of json in request.")
 
-        await self._request_hook(method, url, params=params, data=data, headers=headers, **kwargs)
-
-        response = await self.cookie_manager.request(
-            url, method=method, params=params, json=data, headers=headers, **kwargs
+        cache_key = cache if cache is not None else static_cache
+        static = cache is None
+
+        async def send() -> typing.Mapping[str, typing.Any]:
+            assert method is not None
+            await self._request_hook(method, url, params=params, data=data, headers=headers, **kwargs)
+
+            try:
+                response = await self.cookie_manager.request(
+                    url, method=method, params=params, json=data, headers=headers, **kwargs
+                )
+            except errors.GenshinException as e:
+                if cache_key is not None:
+                    await self._set_cached_error(cache_key, e, static=static)
+
+                raise
+
+            if cache_key is not None:
+                await self._set_cached(cache_key, response, static=static)
+
+            return response
+
+        flight_key = self._get_flight_key(
+            method,
+            url,
+            params=params,
+            data=data,
+            headers=headers,
+            cache=cache,
+            static_cache=static_cache,
+            coalesce=coalesce,
+            **kwargs,
         )
+        if flight_key is None:
+            return await send()
+
+        if cache_key is not None:
+            found, value = await self._get_cached(
+                cache_key,
+                static=static,
+                flight_key=flight_key,
+                refresh=send,
+            )
+            if found:
+                return value
 
-        # cache
-
-        if cache is not None:
-            await self.cache.set(cache, response)
-        elif static_cache is not None:
-            await self.cache.set_static(static_cache, response)
-
-        return response
+        return await self.single_flight.run(flight_key, send)
 
     async def request_webstatic(
         self,
@@ -396,28 +577,32 @@ class BaseClient(abc.ABC):
         **kwargs: typing.Any,
     ) -> typing.Any:
         """Request a static json file."""
-        if cache is not None:
-            value = await self.cache.get_static(cache)
-            if value is not None:
-                return value
-
         url = routes.WEBSTATIC_URL.get_url(region).join(yarl.URL(url))
 
         headers = parse_loose_headers(headers)
         headers["User-Agent"] = self.USER_AGENT
         headers.update(self.custom_headers)
 
-        await self._request_hook("GET", url, headers=headers, **kwargs)
+        async def send() -> typing.Any:
+            await self._request_hook("GET", url, headers=headers, **kwargs)
 
-        async with self.cookie_manager.create_session() as session:
-            async with session.get(url, headers=headers, proxy=self.proxy, **kwargs) as r:
+            async with self.cookie_manager._send("GET", url, headers=headers, **kwargs) as r:
                 r.raise_for_status()
                 data = await r.json()
 
+            if cache is not None:
+                await self._set_cached(cache, data, static=True)
+
+            return data
+
+        flight_key = ("webstatic", str(url))
+
         if cache is not None:
-            await self.cache.set_static(cache, data)
+            found, value = await self._get_cached(cache, static=True, flight_key=flight_key, refresh=send)
+            if found:
+                return value
 
-        return data
+        return await self.single_flight.run(flight_key, send)
 
     async def request_bbs(
         self,
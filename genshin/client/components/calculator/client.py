@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import typing
 import warnings
 
@@ -14,7 +13,7 @@ from genshin.client import cache as client_cache
 from genshin.client import routes
 from genshin.client.components import base
 from genshin.models.genshin import calculator as models
-from genshin.utility import deprecation
+from genshin.utility import deprecation, extdb
 
 from .calculator import BatchCalculator, Calculator, FurnishingCalculator
 
@@ -51,14 +50,15 @@ class CalculatorClient(base.BaseClient):
             data["lang"] = lang or self.lang
 
         headers["referer"] = str(routes.CALCULATOR_REFERER_URL.get_url(self.region))
-        update_task = asyncio.create_task(utility.update_characters_any(lang or self.lang, lenient=True))
+        update_task = extdb.CHARACTER_DB.warm_up(lang or self.lang)
 
         data = await self.request(url, method=method, params=params, data=data, headers=headers, **kwargs)
 
-        try:
-            await update_task
-        except Exception as e:
-            warnings.warn(f"Failed to update characters: {e!r}")
+        if update_task is not None:
+            try:
+                await update_task
+            except Exception as e:
+                warnings.warn(f"Failed to update characters: {e!r}")
 
         return data
 
@@ -320,4 +320,4 @@ class CalculatorClient(base.BaseClient):
                 char.id, icon, char.name, "" if "Player" in icon else char.element, char.rarity
             )
 
-            genshin_models.CHARACTER_NAMES[lang or self.lang][dbchar.id] = dbchar
+            genshin_models.constants.set_character(lang or self.lang, dbchar)
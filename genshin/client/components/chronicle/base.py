@@ -1,17 +1,16 @@
 """Base battle chronicle component."""
 
-import asyncio
 import dataclasses
 import typing
 import warnings
 
-from genshin import errors, models, types, utility
+from genshin import errors, models, types
 from genshin.client import cache, routes
 from genshin.client.components import base
 from genshin.client.manager import managers
 from genshin.constants import GAME_LANGS
 from genshin.models import hoyolab as hoyolab_models
-from genshin.utility import deprecation
+from genshin.utility import deprecation, extdb
 
 __all__ = ["BaseBattleChronicleClient"]
 
@@ -66,14 +65,15 @@ class BaseBattleChronicleClient(base.BaseClient):
 
         url = base_url / endpoint
 
-        update_task = asyncio.create_task(utility.update_characters_any(lang or self.lang, lenient=True))
+        update_task = extdb.CHARACTER_DB.warm_up(lang or self.lang)
 
         data = await self.request_hoyolab(url, lang=lang, region=region, **kwargs)
 
-        try:
-            await update_task
-        except Exception as e:
-            warnings.warn(f"Failed to update characters: {e!r}")
+        if update_task is not None:
+            try:
+                await update_task
+            except Exception as e:
+                warnings.warn(f"Failed to update characters: {e!r}")
 
         return data
 
@@ -17,6 +17,23 @@ __all__ = ["GenshinBattleChronicleClient"]
 class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
     """Genshin battle chronicle component."""
 
+    def _get_genshin_cache_key(
+        self,
+        endpoint: str,
+        uid: int,
+        *,
+        lang: typing.Optional[str] = None,
+        payload: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+    ) -> base.ChronicleCacheKey:
+        """Get the cache key of a genshin record."""
+        return base.ChronicleCacheKey(
+            types.Game.GENSHIN,
+            endpoint,
+            uid,
+            lang=lang or self.lang,
+            params=tuple((payload or {}).values()),
+        )
+
     async def _request_genshin_record(
         self,
         endpoint: str,
@@ -42,13 +59,7 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
 
         cache_key: typing.Optional[base.ChronicleCacheKey] = None
         if cache:
-            cache_key = base.ChronicleCacheKey(
-                types.Game.GENSHIN,
-                endpoint,
-                uid,
-                lang=lang or self.lang,
-                params=tuple(original_payload.values()),
-            )
+            cache_key = self._get_genshin_cache_key(endpoint, uid, lang=lang, payload=original_payload)
 
         return await self.request_game_record(
             endpoint,
@@ -58,6 +69,7 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
             params=params,
             data=data,
             cache=cache_key,
+            coalesce=True,
         )
 
     async def get_partial_genshin_user(
@@ -82,8 +94,12 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
         lang: typing.Optional[str] = None,
     ) -> typing.Sequence[models.Character]:
         """Get genshin user characters."""
-        data = await self._request_genshin_record("character/list", uid, lang=lang, method="POST")
-        return [models.Character(**i) for i in data["list"]]
+        uid = uid or await self._get_uid(types.Game.GENSHIN)
+        return await self._request_model(
+            self._get_genshin_cache_key("character/list", uid, lang=lang),
+            lambda data: [models.Character(**i) for i in data["list"]],
+            lambda: self._request_genshin_record("character/list", uid, lang=lang, method="POST", cache=True),
+        )
 
     @typing.overload
     async def get_genshin_detailed_characters(
@@ -112,18 +128,30 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
         return_raw_data: bool = False,
     ) -> typing.Union[models.GenshinDetailCharacters, typing.Mapping[str, typing.Any]]:
         """Return a list of genshin characters with full details."""
+        uid = uid or await self._get_uid(types.Game.GENSHIN)
         if (
             characters is None
         ):  # If characters aren't provided, fetch the list of owned ID's first as they're required in the payload.
-            character_data = await self._request_genshin_record("character/list", uid, lang=lang, method="POST")
+            character_data = await self._request_genshin_record(
+                "character/list", uid, lang=lang, method="POST", cache=True
+            )
             characters = [char["id"] for char in character_data["list"]]
 
-        data = await self._request_genshin_record(
-            "character/detail", uid, lang=lang, method="POST", payload={"character_ids": (*characters,)}
-        )
+        payload = {"character_ids": (*characters,)}
+
+        def fetch() -> typing.Awaitable[typing.Mapping[str, typing.Any]]:
+            return self._request_genshin_record(
+                "character/detail", uid, lang=lang, method="POST", payload=payload, cache=True
+            )
+
         if return_raw_data:
-            return data
-        return models.GenshinDetailCharacters(**data)
+            return await fetch()
+
+        return await self._request_model(
+            self._get_genshin_cache_key("character/detail", uid, lang=lang, payload=payload),
+            lambda data: models.GenshinDetailCharacters(**data),
+            fetch,
+        )
 
     async def get_genshin_user(
         self,
@@ -167,12 +195,20 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
         raw: bool = False,
     ) -> typing.Union[models.SpiralAbyss, typing.Mapping[str, typing.Any]]:
         """Get genshin spiral abyss runs."""
+        uid = uid or await self._get_uid(types.Game.GENSHIN)
         payload = dict(schedule_type=2 if previous else 1)
-        data = await self._request_genshin_record("spiralAbyss", uid, lang=lang, payload=payload)
+
+        def fetch() -> typing.Awaitable[typing.Mapping[str, typing.Any]]:
+            return self._request_genshin_record("spiralAbyss", uid, lang=lang, payload=payload, cache=True)
+
         if raw:
-            return data
+            return await fetch()
 
-        return models.SpiralAbyss(**data)
+        return await self._request_model(
+            self._get_genshin_cache_key("spiralAbyss", uid, lang=lang, payload=payload),
+            lambda data: models.SpiralAbyss(**data),
+            fetch,
+        )
 
     @typing.overload
     async def get_imaginarium_theater(
@@ -209,12 +245,20 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
                 "The 'previous' parameter does nothing for this endpoint, previous data will always be returned."
             )
 
+        uid = uid or await self._get_uid(types.Game.GENSHIN)
         payload = {"need_detail": str(need_detail).lower()}
-        data = await self._request_genshin_record("role_combat", uid, lang=lang, payload=payload)
+
+        def fetch() -> typing.Awaitable[typing.Mapping[str, typing.Any]]:
+            return self._request_genshin_record("role_combat", uid, lang=lang, payload=payload, cache=True)
+
         if raw:
-            return data
+            return await fetch()
 
-        return models.ImgTheater(**data)
+        return await self._request_model(
+            self._get_genshin_cache_key("role_combat", uid, lang=lang, payload=payload),
+            lambda data: models.ImgTheater(**data),
+            fetch,
+        )
 
     @typing.overload
     async def get_genshin_notes(
@@ -307,6 +351,7 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
         action: bool = True,
         page_size: int = 32,
         lang: typing.Optional[str] = None,
+        concurrency: int = 1,
     ) -> paginators.PagedPaginator[models.TCGBaseCard]:
         """Get genshin tcg cards."""
         return paginators.PagedPaginator(
@@ -320,6 +365,7 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
             ),
             limit=limit,
             page_size=page_size,
+            concurrency=concurrency,
         )
 
     async def get_full_genshin_user(
@@ -42,6 +42,7 @@ class HonkaiBattleChronicleClient(base.BaseBattleChronicleClient):
             region=self.region,
             params=dict(server=account.server, role_id=uid),
             cache=cache_key,
+            coalesce=True,
         )
 
     async def get_honkai_user(
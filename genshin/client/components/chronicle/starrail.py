@@ -14,6 +14,23 @@ __all__ = ["StarRailBattleChronicleClient"]
 class StarRailBattleChronicleClient(base.BaseBattleChronicleClient):
     """StarRail battle chronicle component."""
 
+    def _get_starrail_cache_key(
+        self,
+        endpoint: str,
+        uid: int,
+        *,
+        lang: typing.Optional[str] = None,
+        payload: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+    ) -> base.ChronicleCacheKey:
+        """Get the cache key of a starrail record."""
+        return base.ChronicleCacheKey(
+            types.Game.STARRAIL,
+            endpoint,
+            uid,
+            lang=lang or self.lang,
+            params=tuple((payload or {}).values()),
+        )
+
     async def _request_starrail_record(
         self,
         endpoint: str,
@@ -39,13 +56,7 @@ class StarRailBattleChronicleClient(base.BaseBattleChronicleClient):
 
         cache_key: typing.Optional[base.ChronicleCacheKey] = None
         if cache:
-            cache_key = base.ChronicleCacheKey(
-                types.Game.STARRAIL,
-                endpoint,
-                uid,
-                lang=lang or self.lang,
-                params=tuple(original_payload.values()),
-            )
+            cache_key = self._get_starrail_cache_key(endpoint, uid, lang=lang, payload=original_payload)
 
         return await self.request_game_record(
             endpoint,
@@ -55,6 +66,7 @@ class StarRailBattleChronicleClient(base.BaseBattleChronicleClient):
             params=params,
             data=data,
             cache=cache_key,
+            coalesce=True,
         )
 
     @typing.overload
@@ -140,12 +152,15 @@ class StarRailBattleChronicleClient(base.BaseBattleChronicleClient):
         simple: bool = False,
     ) -> typing.Union[models.StarRailSimpleCharacterResponse, models.StarRailDetailCharacterResponse]:
         """Get starrail characters."""
+        uid = uid or await self._get_uid(types.Game.STARRAIL)
         payload = {"need_wiki": "true"}
-        data = await self._request_starrail_record("avatar/info", uid, lang=lang, payload=payload)
+        model = models.StarRailSimpleCharacterResponse if simple else models.StarRailDetailCharacterResponse
 
-        if simple:
-            return models.StarRailSimpleCharacterResponse(**data)
-        return models.StarRailDetailCharacterResponse(**data)
+        return await self._request_model(
+            self._get_starrail_cache_key("avatar/info", uid, lang=lang, payload=payload),
+            lambda data: model(**data),
+            lambda: self._request_starrail_record("avatar/info", uid, lang=lang, payload=payload, cache=True),
+        )
 
     @typing.overload
     async def get_starrail_challenge(
@@ -265,8 +280,13 @@ class StarRailBattleChronicleClient(base.BaseBattleChronicleClient):
         lang: typing.Optional[str] = None,
     ) -> models.HSREventCalendar:
         """Get HSR event calendar."""
-        data = await self._request_starrail_record("get_act_calender", uid, lang=lang, cache=True)
-        return models.HSREventCalendar(**data)
+        uid = uid or await self._get_uid(types.Game.STARRAIL)
+
+        return await self._request_model(
+            self._get_starrail_cache_key("get_act_calender", uid, lang=lang),
+            lambda data: models.HSREventCalendar(**data),
+            lambda: self._request_starrail_record("get_act_calender", uid, lang=lang, cache=True),
+        )
 
     get_apocalyptic_shadow = get_starrail_apc_shadow
     """Alias for :meth:`get_starrail_apc_shadow`."""
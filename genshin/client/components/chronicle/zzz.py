@@ -83,6 +83,7 @@ class ZZZBattleChronicleClient(base.BaseBattleChronicleClient):
             params=params,
             data=data,
             cache=cache_key,
+            coalesce=True,
             custom_route=routes.NAP_LEDGER_URL if is_nap_ledger else None,
         )
 
@@ -133,6 +133,7 @@ class DailyRewardClient(base.BaseClient):
         limit: typing.Optional[int] = None,
         game: typing.Optional[types.Game] = None,
         lang: typing.Optional[str] = None,
+        concurrency: int = 1,
     ) -> paginators.Paginator[models.ClaimedDailyReward]:
         """Get all claimed rewards for the current user."""
         return paginators.PagedPaginator(
@@ -143,6 +144,7 @@ class DailyRewardClient(base.BaseClient):
             ),
             limit=limit,
             page_size=10,
+            concurrency=concurrency,
         )
 
     @typing.overload
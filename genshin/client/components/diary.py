@@ -29,11 +29,18 @@ class DiaryPaginator(paginators.PagedPaginator[models.DiaryAction]):
     _data: typing.Optional[models.DiaryPage]
     """Metadata of the paginator"""
 
-    def __init__(self, getter: DiaryCallback, *, limit: typing.Optional[int] = None) -> None:
+    def __init__(
+        self,
+        getter: DiaryCallback,
+        *,
+        limit: typing.Optional[int] = None,
+        prefetch: int = 0,
+        concurrency: int = 1,
+    ) -> None:
         self._get_page = getter
         self._data = None
 
-        super().__init__(self._getter, limit=limit, page_size=100)
+        super().__init__(self._getter, limit=limit, page_size=100, prefetch=prefetch, concurrency=concurrency)
 
     async def _getter(self, page: int) -> typing.Sequence[models.DiaryAction]:
         self._data = await self._get_page(page)
@@ -65,11 +72,18 @@ class StarRailDiaryPaginator(paginators.PagedPaginator[models.StarRailDiaryActio
     _data: typing.Optional[models.StarRailDiaryPage]
     """Metadata of the paginator"""
 
-    def __init__(self, getter: StarRailDiaryCallback, *, limit: typing.Optional[int] = None) -> None:
+    def __init__(
+        self,
+        getter: StarRailDiaryCallback,
+        *,
+        limit: typing.Optional[int] = None,
+        prefetch: int = 0,
+        concurrency: int = 1,
+    ) -> None:
         self._get_page = getter
         self._data = None
 
-        super().__init__(self._getter, limit=limit, page_size=100)
+        super().__init__(self._getter, limit=limit, page_size=100, prefetch=prefetch, concurrency=concurrency)
 
     async def _getter(self, page: int) -> typing.Sequence[models.StarRailDiaryAction]:
         self._data = await self._get_page(page)
@@ -156,8 +170,11 @@ class DiaryClient(base.BaseClient):
         cache_key = cache.cache_key(
             "diary", uid=uid, game=game, month=month or datetime.datetime.now(CN_TIMEZONE).month, lang=lang or self.lang
         )
-        data = await self.request_ledger(uid, game=game, month=month, lang=lang, cache=cache_key)
-        return models.Diary(**data)
+        return await self._request_model(
+            cache_key,
+            lambda data: models.Diary(**data),
+            lambda: self.request_ledger(uid, game=game, month=month, lang=lang, cache=cache_key),
+        )
 
     async def get_starrail_diary(
         self,
@@ -172,8 +189,11 @@ class DiaryClient(base.BaseClient):
         cache_key = cache.cache_key(
             "diary", uid=uid, game=game, month=month or datetime.datetime.now(CN_TIMEZONE).month, lang=lang or self.lang
         )
-        data = await self.request_ledger(uid, game=game, month=month, lang=lang, cache=cache_key)
-        return models.StarRailDiary(**data)
+        return await self._request_model(
+            cache_key,
+            lambda data: models.StarRailDiary(**data),
+            lambda: self.request_ledger(uid, game=game, month=month, lang=lang, cache=cache_key),
+        )
 
     async def _get_genshin_diary_page(
         self,
@@ -221,6 +241,8 @@ class DiaryClient(base.BaseClient):
         type: int = models.DiaryType.PRIMOGEMS,
         month: typing.Optional[int] = None,
         lang: typing.Optional[str] = None,
+        prefetch: int = 0,
+        concurrency: int = 1,
     ) -> DiaryPaginator:
         """Create a new daily reward paginator."""
         return DiaryPaginator(
@@ -232,6 +254,8 @@ class DiaryClient(base.BaseClient):
                 lang=lang,
             ),
             limit=limit,
+            prefetch=prefetch,
+            concurrency=concurrency,
         )
 
     async def _get_starrail_diary_page(
@@ -261,6 +285,8 @@ class DiaryClient(base.BaseClient):
         type: int = models.StarRailDiaryType.STELLARJADE,
         month: typing.Optional[str] = None,
         lang: typing.Optional[str] = None,
+        prefetch: int = 0,
+        concurrency: int = 1,
     ) -> StarRailDiaryPaginator:
         """Create a new daily reward paginator."""
         return StarRailDiaryPaginator(
@@ -272,4 +298,6 @@ class DiaryClient(base.BaseClient):
                 lang=lang,
             ),
             limit=limit,
+            prefetch=prefetch,
+            concurrency=concurrency,
         )
@@ -122,7 +122,7 @@ class WishClient(base.BaseClient):
             authkey=authkey,
             game=types.Game.GENSHIN,
         )
-        return [models.Wish(**i, banner_type=banner_type, tz_offset=tz_offset) for i in data]
+        return models.Wish.from_page(data, banner_type, tz_offset)
 
     async def _get_mw_wish_page(
         self,
@@ -166,7 +166,7 @@ class WishClient(base.BaseClient):
             game=types.Game.STARRAIL,
         )
 
-        return [models.Warp(**i, banner_type=banner_type, tz_offset=tz_offset) for i in data]
+        return models.Warp.from_page(data, banner_type, tz_offset)
 
     async def _get_signal_page(
         self,
@@ -185,7 +185,7 @@ class WishClient(base.BaseClient):
             game=types.Game.ZZZ,
         )
 
-        return [models.SignalSearch(**i, banner_type=banner_type, tz_offset=tz_offset) for i in data]
+        return models.SignalSearch.from_page(data, banner_type, tz_offset)
 
     def wish_history(
         self,
@@ -195,8 +195,13 @@ class WishClient(base.BaseClient):
         lang: typing.Optional[str] = None,
         authkey: typing.Optional[str] = None,
         end_id: int = 0,
+        since: typing.Optional[typing.Mapping[int, int]] = None,
+        prefetch: int = 0,
     ) -> paginators.Paginator[models.Wish]:
-        """Get the wish history of a user."""
+        """Get the wish history of a user.
+
+        If `since` maps banner types to the ids of their newest known items, only newer items are fetched.
+        """
         banner_types = banner_type or list(models.GenshinBannerType)
 
         if not isinstance(banner_types, typing.Sequence):
@@ -214,6 +219,8 @@ class WishClient(base.BaseClient):
                     ),
                     limit=limit,
                     end_id=end_id,
+                    stop_id=since.get(banner, 0) if since else 0,
+                    prefetch=prefetch,
                 )
             )
 
@@ -230,8 +237,13 @@ class WishClient(base.BaseClient):
         lang: typing.Optional[str] = None,
         authkey: typing.Optional[str] = None,
         end_id: int = 0,
+        since: typing.Optional[typing.Mapping[int, int]] = None,
+        prefetch: int = 0,
     ) -> paginators.Paginator[models.MWWish]:
-        """Get the Miliastra Wonderland wish history of a user."""
+        """Get the Miliastra Wonderland wish history of a user.
+
+        If `since` maps banner types to the ids of their newest known items, only newer items are fetched.
+        """
         banner_types = banner_type or (models.MWBannerType.STANDARD, models.MWBannerType.EVENT)
 
         if not isinstance(banner_types, typing.Sequence):
@@ -249,7 +261,9 @@ class WishClient(base.BaseClient):
                     ),
                     limit=limit,
                     end_id=end_id,
+                    stop_id=since.get(banner, 0) if since else 0,
                     page_size=5,
+                    prefetch=prefetch,
                 )
             )
 
@@ -266,8 +280,13 @@ class WishClient(base.BaseClient):
         lang: typing.Optional[str] = None,
         authkey: typing.Optional[str] = None,
         end_id: int = 0,
+        since: typing.Optional[typing.Mapping[int, int]] = None,
+        prefetch: int = 0,
     ) -> paginators.Paginator[models.Warp]:
-        """Get the warp history of a user."""
+        """Get the warp history of a user.
+
+        If `since` maps banner types to the ids of their newest known items, only newer items are fetched.
+        """
         banner_types = banner_type or list(models.StarRailBannerType)
 
         if not isinstance(banner_types, typing.Sequence):
@@ -285,6 +304,8 @@ class WishClient(base.BaseClient):
                     ),
                     limit=limit,
                     end_id=end_id,
+                    stop_id=since.get(banner, 0) if since else 0,
+                    prefetch=prefetch,
                 )
             )
 
@@ -301,8 +322,13 @@ class WishClient(base.BaseClient):
         lang: typing.Optional[str] = None,
         authkey: typing.Optional[str] = None,
         end_id: int = 0,
+        since: typing.Optional[typing.Mapping[int, int]] = None,
+        prefetch: int = 0,
     ) -> paginators.Paginator[models.SignalSearch]:
-        """Get the signal search history of a user."""
+        """Get the signal search history of a user.
+
+        If `since` maps banner types to the ids of their newest known items, only newer items are fetched.
+        """
         banner_types = banner_type or list(models.ZZZBannerType)
 
         if not isinstance(banner_types, typing.Sequence):
@@ -320,6 +346,8 @@ class WishClient(base.BaseClient):
                     ),
                     limit=limit,
                     end_id=end_id,
+                    stop_id=since.get(banner, 0) if since else 0,
+                    prefetch=prefetch,
                 )
             )
 
@@ -61,13 +61,7 @@ class TransactionClient(base.BaseClient):
             params=dict(end_id=end_id, size=20),
         )
 
-        transactions: list[models.BaseTransaction] = []
-        for trans in data["list"]:
-            model = models.ItemTransaction if "name" in trans else models.Transaction
-            model = typing.cast("type[models.BaseTransaction]", model)
-            transactions.append(model(**trans, kind=kind))
-
-        return transactions
+        return models.BaseTransaction.from_page(data["list"], kind)
 
     def transaction_log(
         self,
@@ -77,6 +71,7 @@ class TransactionClient(base.BaseClient):
         lang: typing.Optional[str] = None,
         authkey: typing.Optional[str] = None,
         end_id: int = 0,
+        prefetch: int = 0,
     ) -> paginators.Paginator[models.BaseTransaction]:
         """Get the transaction log of a user."""
         kinds = kind or ["primogem", "crystal", "resin", "artifact", "weapon"]
@@ -96,6 +91,7 @@ class TransactionClient(base.BaseClient):
                     ),
                     limit=limit,
                     end_id=end_id,
+                    prefetch=prefetch,
                 )
             )
 
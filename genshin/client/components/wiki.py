@@ -78,11 +78,14 @@ class WikiClient(base.BaseClient):
         """Get a list of wiki previews."""
         payload = dict(filters=[], menu_id=int(menu), page_num=1, page_size=1000, use_es=True)
         cache_key = cache.cache_key("wiki", endpoint="entry", menu=menu, lang=lang or self.lang)
-        data = await self.request_wiki("get_entry_page_list", data=payload, lang=lang, static_cache=cache_key)
-
         cls = models._ENTRY_PAGE_MODELS.get(typing.cast(models.WikiPageType, menu), models.BaseWikiPreview)
 
-        return [cls(**i) for i in data["list"] if i["icon_url"]]
+        return await self._request_model(
+            cache_key,
+            lambda data: [cls(**i) for i in data["list"] if i["icon_url"]],
+            lambda: self.request_wiki("get_entry_page_list", data=payload, lang=lang, static_cache=cache_key),
+            static=True,
+        )
 
     async def get_wiki_page(
         self,
@@ -93,10 +96,17 @@ class WikiClient(base.BaseClient):
         """Get a wiki page."""
         params = dict(entry_page_id=int(id))
         cache_key = cache.cache_key("wiki", endpoint="page", id=id, lang=lang or self.lang)
-        data = await self.request_wiki("entry_page", lang=lang, params=params, static_cache=cache_key)
 
-        data["page"].pop("lang", "")  # always an empty string
-        return models.WikiPage(**data["page"])
+        def parse(data: typing.Mapping[str, typing.Any]) -> models.WikiPage:
+            data["page"].pop("lang", "")  # always an empty string
+            return models.WikiPage(**data["page"])
+
+        return await self._request_model(
+            cache_key,
+            parse,
+            lambda: self.request_wiki("entry_page", lang=lang, params=params, static_cache=cache_key),
+            static=True,
+        )
 
     async def get_wiki_pages(
         self,
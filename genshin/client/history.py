@@ -0,0 +1,341 @@
+"""Local storage of gacha histories."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import typing
+
+from genshin.models.genshin import gacha as models
+from genshin.utility import concurrency
+
+if typing.TYPE_CHECKING:
+    import aiosqlite
+
+    from genshin.client.components.gacha import WishClient
+
+__all__ = ["GachaHistoryStore"]
+
+WishT = typing.TypeVar("WishT", bound=models.BaseWish)
+
+HISTORY_MODELS: dict[str, type[models.BaseWish]] = {
+    "wish": models.Wish,
+    "mw_wish": models.MWWish,
+    "warp": models.Warp,
+    "signal": models.SignalSearch,
+}
+HISTORY_KINDS = {model: kind for kind, model in HISTORY_MODELS.items()}
+HISTORY_METHODS: dict[type[models.BaseWish], str] = {
+    models.Wish: "wish_history",
+    models.MWWish: "mw_wish_history",
+    models.Warp: "warp_history",
+    models.SignalSearch: "signal_history",
+}
+# UIGF game keys
+UIGF_GAMES: dict[str, type[models.BaseWish]] = {
+    "hk4e": models.Wish,
+    "hkrpg": models.Warp,
+    "nap": models.SignalSearch,
+}
+
+
+def _to_uigf_record(item: models.BaseWish) -> dict[str, str]:
+    """Convert a wish into a UIGF record."""
+    banner_type = int(getattr(item, "banner_type"))
+    record = {
+        "id": str(item.id),
+        "name": item.name,
+        "item_type": str(getattr(item, "type", "")),
+        "rank_type": str(item.rarity),
+        "gacha_type": str(banner_type),
+        "time": item.time.strftime("%Y-%m-%d %H:%M:%S"),
+        "count": "1",
+    }
+    # genshin wish logs carry no item ids, rather than writing an empty one the key is left out
+    if isinstance(item, (models.Warp, models.SignalSearch)):
+        record["item_id"] = str(item.item_id)
+    if isinstance(item, models.Wish):
+        # both character banners are counted as the same
+        record["uigf_gacha_type"] = str(int(models.GenshinBannerType.CHARACTER if banner_type == 400 else banner_type))
+    if isinstance(item, models.Warp):
+        record["gacha_id"] = str(item.banner_id)
+
+    return record
+
+
+def _from_uigf_record(
+    model: type[WishT], record: typing.Mapping[str, typing.Any], *, uid: int, timezone: int
+) -> WishT:
+    """Convert a UIGF record into a wish."""
+    # uigf_gacha_type merges both character banners, gacha_type keeps the original banner
+    banner_type = record.get("gacha_type") or record["uigf_gacha_type"]
+    return model.model_validate({**record, "uid": uid, "tz_offset": timezone - 8, "banner_type": int(banner_type)})
+
+
+class GachaHistoryStore:
+    """SQLite storage of wish, warp and signal search histories.
+
+    Items are deduplicated by their id, so the same history may be added any amount of times.
+    New items can be fetched with `sync` which stops as soon as it reaches an already stored item.
+    """
+
+    conn: aiosqlite.Connection | None
+    db_name: str
+
+    _initialized: bool
+    _owns_conn: bool
+
+    def __init__(
+        self,
+        conn: aiosqlite.Connection | None = None,
+        *,
+        db_name: str = ".cache/genshin_py_history.db",
+    ) -> None:
+        self.conn = conn
+        self.db_name = db_name
+
+        self._initialized = False
+        self._owns_conn = conn is None
+
+        if conn is None:
+            directory = os.path.dirname(db_name)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+    async def __aenter__(self) -> GachaHistoryStore:
+        await self.initialize()
+        return self
+
+    async def __aexit__(self, *exc_info: typing.Any) -> None:
+        await self.close()
+
+    @concurrency.prevent_concurrency
+    async def initialize(self) -> None:
+        """Initialize the store."""
+        if self._initialized:
+            return
+
+        import aiosqlite
+
+        if self.conn is None:
+            self.conn = await aiosqlite.connect(self.db_name)
+            self._owns_conn = True
+
+        await self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS gacha ("
+            "kind TEXT, id INTEGER, uid INTEGER, banner_type INTEGER, data TEXT, PRIMARY KEY (kind, id))"
+        )
+        await self.conn.execute("CREATE INDEX IF NOT EXISTS gacha_history ON gacha (kind, uid, banner_type, id)")
+        await self.conn.commit()
+
+        self._initialized = True
+
+    async def _connect(self) -> aiosqlite.Connection:
+        """Get the connection, initializing the store if needed."""
+        if not self._initialized:
+            await self.initialize()
+
+        assert self.conn is not None
+        return self.conn
+
+    async def close(self) -> None:
+        """Close the connection if it's owned by the store."""
+        if self.conn is not None and self._owns_conn:
+            await self.conn.close()
+            self.conn = None
+
+        self._initialized = False
+
+    async def add(self, items: typing.Iterable[models.BaseWish]) -> int:
+        """Save items, returns the amount of items which were not stored yet."""
+        rows = [
+            (
+                HISTORY_KINDS[type(item)],
+                item.id,
+                item.uid,
+                int(getattr(item, "banner_type")),
+                item.model_dump_json(by_alias=True),
+            )
+            for item in items
+        ]
+        if not rows:
+            return 0
+
+        conn = await self._connect()
+        before = conn.total_changes
+        await conn.executemany(
+            "INSERT OR IGNORE INTO gacha (kind, id, uid, banner_type, data) VALUES (?, ?, ?, ?, ?)", rows
+        )
+        await conn.commit()
+
+        return conn.total_changes - before
+
+    async def get(
+        self,
+        model: type[WishT],
+        uid: int,
+        banner_type: typing.Optional[typing.Union[int, typing.Sequence[int]]] = None,
+        *,
+        limit: typing.Optional[int] = None,
+    ) -> typing.Sequence[WishT]:
+        """Get the stored history of a user, newest items first."""
+        query = "SELECT data FROM gacha WHERE kind = ? AND uid = ?"
+        params: list[typing.Any] = [HISTORY_KINDS[model], uid]
+
+        if banner_type is not None:
+            banner_types = banner_type if isinstance(banner_type, typing.Sequence) else [banner_type]
+            query += f" AND banner_type IN ({', '.join('?' * len(banner_types))})"
+            params += [int(banner) for banner in banner_types]
+
+        query += " ORDER BY id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        conn = await self._connect()
+        async with conn.execute(query, params) as cursor:
+            return [model.model_validate_json(data) for (data,) in await cursor.fetchall()]
+
+    async def get_uids(self, model: type[models.BaseWish]) -> typing.Sequence[int]:
+        """Get the uids of all users with a stored history."""
+        conn = await self._connect()
+        async with conn.execute("SELECT DISTINCT uid FROM gacha WHERE kind = ?", (HISTORY_KINDS[model],)) as cursor:
+            return [uid for (uid,) in await cursor.fetchall()]
+
+    async def get_latest_ids(self, model: type[models.BaseWish], uid: int) -> typing.Mapping[int, int]:
+        """Get the id of the newest stored item of every banner."""
+        conn = await self._connect()
+        async with conn.execute(
+            "SELECT banner_type, MAX(id) FROM gacha WHERE kind = ? AND uid = ? GROUP BY banner_type",
+            (HISTORY_KINDS[model], uid),
+        ) as cursor:
+            return dict(typing.cast("typing.Iterable[tuple[int, int]]", await cursor.fetchall()))
+
+    async def sync(
+        self,
+        client: WishClient,
+        model: type[WishT],
+        uid: int,
+        banner_type: typing.Optional[typing.Union[int, typing.Sequence[int]]] = None,
+        *,
+        lang: typing.Optional[str] = None,
+        authkey: typing.Optional[str] = None,
+    ) -> typing.Sequence[WishT]:
+        """Fetch only the new items of a history and return the whole stored history."""
+        history = getattr(client, HISTORY_METHODS[model])
+        since = await self.get_latest_ids(model, uid)
+
+        items = await history(banner_type, lang=lang, authkey=authkey, since=since).flatten()
+        await self.add(items)
+
+        return await self.get(model, uid, banner_type)
+
+    async def export_uigf(
+        self,
+        uids: typing.Optional[typing.Sequence[int]] = None,
+        *,
+        lang: str = "en-us",
+    ) -> typing.Mapping[str, typing.Any]:
+        """Export stored histories in the UIGF v4 format.
+
+        Genshin records have no item_id since wish logs do not provide one,
+        so they are only accepted by importers lenient about that field.
+        """
+        import genshin
+
+        data: dict[str, typing.Any] = {
+            "info": {
+                "export_timestamp": int(time.time()),
+                "export_app": "genshin.py",
+                "export_app_version": genshin.__version__,
+                "version": "v4.0",
+            },
+        }
+
+        for game, model in UIGF_GAMES.items():
+            accounts: list[dict[str, typing.Any]] = []
+            for uid in uids or await self.get_uids(model):
+                items = await self.get(model, uid)
+                if not items:
+                    continue
+
+                accounts.append(
+                    {
+                        "uid": str(uid),
+                        "timezone": items[0].tz_offset + 8,
+                        "lang": lang,
+                        "list": [_to_uigf_record(item) for item in reversed(items)],
+                    }
+                )
+
+            if accounts:
+                data[game] = accounts
+
+        return data
+
+    async def import_uigf(self, data: typing.Mapping[str, typing.Any]) -> int:
+        """Import histories in the UIGF v4, UIGF v3 or SRGF format.
+
+        Returns the amount of items which were not stored yet.
+        """
+        info = data.get("info", {})
+        games: list[tuple[type[models.BaseWish], typing.Sequence[typing.Mapping[str, typing.Any]]]]
+        if "list" in data:
+            # single account formats
+            single = {"uid": info["uid"], "timezone": info.get("region_time_zone", 8), "list": data["list"]}
+            games = [(models.Warp if "srgf_version" in info else models.Wish, [single])]
+        else:
+            games = [(model, data.get(game, [])) for game, model in UIGF_GAMES.items()]
+
+        items: list[models.BaseWish] = []
+        for model, accounts in games:
+            for account in accounts:
+                uid, timezone = int(account["uid"]), int(account.get("timezone", 8))
+                items += [_from_uigf_record(model, record, uid=uid, timezone=timezone) for record in account["list"]]
+
+        return await self.add(items)
+
+    async def export_columns(self, model: type[models.BaseWish], uid: int) -> typing.Mapping[str, typing.Any]:
+        """Export a stored history in a compact columnar format.
+
+        Every field is stored as a single list, strings are deduplicated into a shared table.
+        """
+        rows = [json.loads(item.model_dump_json(by_alias=True)) for item in await self.get(model, uid)]
+
+        strings: dict[str, int] = {}
+        columns: dict[str, list[typing.Any]] = {}
+        encoded: list[str] = []
+        for key in rows[0] if rows else ():
+            values = [row[key] for row in rows]
+            if all(isinstance(value, str) for value in values):
+                values = [strings.setdefault(value, len(strings)) for value in values]
+                encoded.append(key)
+
+            columns[key] = values
+
+        return {
+            "kind": HISTORY_KINDS[model],
+            "uid": uid,
+            "strings": list(strings),
+            "encoded": encoded,
+            "columns": columns,
+        }
+
+    async def import_columns(self, data: typing.Mapping[str, typing.Any]) -> int:
+        """Import a history in the columnar format.
+
+        Returns the amount of items which were not stored yet.
+        """
+        model = HISTORY_MODELS[data["kind"]]
+        strings: typing.Sequence[str] = data["strings"]
+        encoded: typing.Collection[str] = data["encoded"]
+        raw_columns: typing.Mapping[str, typing.Sequence[typing.Any]] = data["columns"]
+
+        columns = {
+            key: [strings[value] for value in values] if key in encoded else values
+            for key, values in raw_columns.items()
+        }
+        rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+        return await self.add(model.model_validate(row) for row in rows)
@@ -2,3 +2,5 @@
 
 from .cookie import *
 from .managers import *
+from .quota import *
+from .transport import *
@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import abc
+import asyncio
+import contextlib
 import functools
 import http.cookies
 import logging
+import time
 import typing
 import warnings
 
@@ -14,7 +17,11 @@ import aiohttp.typedefs
 import yarl
 
 from genshin import errors, types
-from genshin.client import ratelimit
+from genshin.client import ratelimit, routes
+from genshin.client.manager import quota as manager_quota
+from genshin.client.manager import scheduler as manager_scheduler
+from genshin.client.manager import transport as manager_transport
+from genshin.utility import ds as ds_utility
 from genshin.utility import fs as fs_utility
 
 _LOGGER = logging.getLogger(__name__)
@@ -75,17 +82,29 @@ class BaseCookieManager(abc.ABC):
 
     _proxy: typing.Optional[yarl.URL] = None
     _socks_proxy: typing.Optional[str] = None
+    _transport: typing.Optional[manager_transport.Transport] = None
+    _owns_transport: bool = True
 
     @classmethod
-    def from_cookies(cls, cookies: typing.Optional[AnyCookieOrHeader] = None) -> BaseCookieManager:
+    def from_cookies(
+        cls,
+        cookies: typing.Optional[AnyCookieOrHeader] = None,
+        *,
+        transport: typing.Optional[manager_transport.Transport] = None,
+    ) -> BaseCookieManager:
         """Create an arbitrary cookie manager implementation instance."""
+        manager: BaseCookieManager
         if not cookies:
-            return CookieManager()
+            manager = CookieManager()
+        elif isinstance(cookies, typing.Sequence) and not isinstance(cookies, str):
+            manager = RotatingCookieManager(cookies)
+        else:
+            manager = CookieManager(cookies)
 
-        if isinstance(cookies, typing.Sequence) and not isinstance(cookies, str):
-            return RotatingCookieManager(cookies)
+        if transport is not None:
+            manager.transport = transport
 
-        return CookieManager(cookies)
+        return manager
 
     @classmethod
     def from_browser_cookies(cls, browser: typing.Optional[str] = None) -> CookieManager:
@@ -113,6 +132,14 @@ class BaseCookieManager(abc.ABC):
         """
         return None
 
+    @property
+    def identifier(self) -> typing.Optional[str]:
+        """A unique identifier of the cookies used for private data.
+
+        Returns None for anonymous and multi-cookie managers which may only be used for public data.
+        """
+        return None
+
     @property
     def proxy(self) -> typing.Optional[yarl.URL]:
         """Proxy for http(s) requests."""
@@ -136,8 +163,48 @@ class BaseCookieManager(abc.ABC):
 
         self._proxy = proxy
 
+    @property
+    def transport(self) -> manager_transport.Transport:
+        """Pooled transport used for making requests.
+
+        An explicitly set transport may be shared with other managers and is never closed by this one.
+        """
+        if self._transport is None:
+            self._transport = manager_transport.Transport()
+            self._owns_transport = True
+
+        return self._transport
+
+    @transport.setter
+    def transport(self, transport: typing.Optional[manager_transport.Transport]) -> None:
+        self._transport = transport
+        self._owns_transport = transport is None
+
+    def inherit_transport(self, manager: BaseCookieManager) -> None:
+        """Take over the transport of another manager, including its ownership."""
+        self._transport = manager._transport
+        self._owns_transport = manager._owns_transport
+
+    async def __aenter__(self) -> BaseCookieManager:
+        return self
+
+    async def __aexit__(self, *exc_info: typing.Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close all pooled connections unless the transport is shared."""
+        if self._transport is not None and self._owns_transport:
+            await self._transport.close()
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled session for the current proxy."""
+        return self.transport.get_session(self._socks_proxy)
+
     def create_session(self, **kwargs: typing.Any) -> aiohttp.ClientSession:
-        """Create a client session."""
+        """Create a new standalone client session.
+
+        Prefer `get_session` which reuses connections between requests.
+        """
         if self._socks_proxy is not None:
             import aiohttp_socks
 
@@ -152,6 +219,23 @@ class BaseCookieManager(abc.ABC):
             **kwargs,
         )
 
+    @contextlib.asynccontextmanager
+    async def _send(
+        self,
+        method: str,
+        str_or_url: aiohttp.typedefs.StrOrURL,
+        **kwargs: typing.Any,
+    ) -> typing.AsyncGenerator[aiohttp.ClientResponse, None]:
+        """Send a request through the pooled transport within its concurrency limits."""
+        transport = self.transport
+        if transport.rate_limiter is not None:
+            await transport.rate_limiter.acquire(str_or_url)
+
+        session = self.get_session()
+        async with transport.acquire(yarl.URL(str_or_url).host):
+            async with session.request(method, str_or_url, proxy=self.proxy, **kwargs) as response:
+                yield response
+
     @ratelimit.handle_ratelimits()
     @ratelimit.handle_proxy_errors
     @ratelimit.handle_request_timeouts()
@@ -163,30 +247,39 @@ class BaseCookieManager(abc.ABC):
         **kwargs: typing.Any,
     ) -> typing.Any:
         """Make a request towards any json resource."""
-        async with self.create_session() as session:
-            async with session.request(method, str_or_url, proxy=self.proxy, cookies=cookies, **kwargs) as response:
-                if response.content_type != "application/json":
-                    content = await response.text()
-                    raise errors.GenshinException(msg="Recieved a response with an invalid content type:\n" + content)
+        async with self._send(method, str_or_url, cookies=cookies, **kwargs) as response:
+            if response.content_type != "application/json":
+                content = await response.text()
+                raise errors.GenshinException(msg="Recieved a response with an invalid content type:\n" + content)
 
-                data = await response.json()
+            data = await response.json()
 
-                if not self.multi:
-                    new_cookies = parse_cookie(response.cookies)
-                    new_keys = new_cookies.keys() - cookies.keys()
-                    if new_keys:
-                        cookies.update(new_cookies)
-                        _LOGGER.debug("Updating cookies for %s: %s", get_cookie_identifier(cookies), new_keys)
+            if not self.multi:
+                new_cookies = parse_cookie(response.cookies)
+                new_keys = new_cookies.keys() - cookies.keys()
+                if new_keys:
+                    cookies.update(new_cookies)
+                    _LOGGER.debug("Updating cookies for %s: %s", get_cookie_identifier(cookies), new_keys)
 
         errors.check_for_geetest(data)
 
+        rate_limiter = self.transport.rate_limiter
+
         retcode = data.get("retcode")
         if retcode is None or retcode == 0:
+            if rate_limiter is not None:
+                rate_limiter.record(str_or_url)
+
             if "data" in data:
                 return data["data"]
             return data
 
-        errors.raise_for_retcode(data)
+        try:
+            errors.raise_for_retcode(data)
+        except errors.GenshinException as e:
+            if rate_limiter is not None:
+                rate_limiter.record(str_or_url, e)
+            raise
 
     @ratelimit.handle_ratelimits()
     @ratelimit.handle_proxy_errors
@@ -200,17 +293,16 @@ class BaseCookieManager(abc.ABC):
         **kwargs: typing.Any,
     ) -> RawResponse:
         """Make a request and return data + headers + cookies (no retcode enforcement)."""
-        async with self.create_session() as session:
-            async with session.request(method, str_or_url, proxy=self.proxy, cookies=cookies, **kwargs) as response:
-                if response.content_type != "application/json":
-                    content = await response.text()
-                    raise errors.GenshinException(msg="Recieved a response with an invalid content type:\n" + content)
-                data = await response.json()
-                return RawResponse(
-                    data=data,
-                    headers=response.headers,
-                    cookies=response.cookies,
-                )
+        async with self._send(method, str_or_url, cookies=cookies, **kwargs) as response:
+            if response.content_type != "application/json":
+                content = await response.text()
+                raise errors.GenshinException(msg="Recieved a response with an invalid content type:\n" + content)
+            data = await response.json()
+            return RawResponse(
+                data=data,
+                headers=response.headers,
+                cookies=response.cookies,
+            )
 
     @abc.abstractmethod
     async def request(
@@ -263,6 +355,13 @@ class CookieManager(BaseCookieManager):
     def multi(self) -> bool:
         return False
 
+    @property
+    def identifier(self) -> typing.Optional[str]:
+        if not self._cookies:
+            return None
+
+        return get_cookie_identifier(self._cookies) or str(hash(frozenset(self._cookies.items())))
+
     @property
     def jar(self) -> http.cookies.SimpleCookie:
         """SimpleCookie containing the cookies."""
@@ -322,29 +421,73 @@ class CookieManager(BaseCookieManager):
         return await self._request(method, url, cookies=self.cookies, **kwargs)
 
 
+# authenticated endpoints used to check whether invalid cookies became valid again
+_VALIDATION_URLS: dict[types.Region, str] = {
+    types.Region.OVERSEAS: "community/painter/wapi/user/full",
+    types.Region.CHINESE: "user/wapi/getUserFullInfo",
+}
+
+
+def guess_region(url: yarl.URL) -> types.Region:
+    """Guess the region from the URL."""
+    assert url.host is not None
+
+    if "os" in url.host or "os" in url.path:
+        return types.Region.OVERSEAS
+
+    if "takumi" in url.host:
+        return types.Region.CHINESE
+
+    if "sg" in url.host:
+        return types.Region.OVERSEAS
+
+    return types.Region.CHINESE
+
+
 class CookieSequence(typing.Sequence[typing.Mapping[str, str]]):
-    MAX_USES: int = 30
+    """Sequence of rotating cookies sharing a daily quota.
+
+    Invalid cookies are set aside and re-validated in the background every `revalidate_interval` seconds.
+    They are deleted after failing `max_revalidations` times.
+    """
+
+    quota: manager_quota.BaseQuotaStore
+    scheduler: manager_scheduler.CookieScheduler
+    region: typing.Optional[types.Region]
 
-    # {id: ({cookie}, uses), ...}
-    _cookies: dict[str, tuple[dict[str, str], int]]
+    revalidate_interval: float = 60 * 60
+    max_revalidations: int = 3
 
-    def __init__(self, cookies: typing.Optional[typing.Sequence[CookieOrHeader]] = None) -> None:
+    # {id: {cookie}, ...}
+    _cookies: dict[str, dict[str, str]]
+    # {id: (failed validations, region), ...}
+    _invalid: dict[str, tuple[int, types.Region]]
+    _revalidation: typing.Optional[asyncio.Task[None]]
+
+    def __init__(
+        self,
+        cookies: typing.Optional[typing.Sequence[CookieOrHeader]] = None,
+        *,
+        quota: typing.Optional[manager_quota.BaseQuotaStore] = None,
+        region: typing.Optional[types.Region] = None,
+    ) -> None:
+        self.quota = quota if quota is not None else manager_quota.MemoryQuotaStore()
+        self.region = region
+        self._revalidation = None
         self.cookies = [parse_cookie(cookie) for cookie in cookies or []]
 
     @property
     def cookies(self) -> typing.Sequence[typing.Mapping[str, str]]:
         """Cookies used for authentication"""
-        cookies = sorted(self._cookies.values(), key=lambda x: 0 if x[1] >= self.MAX_USES else x[1], reverse=True)
-        return [cookies for cookies, _ in cookies]
+        return [cookie for account_id, cookie in self._cookies.items() if account_id not in self._invalid]
 
     @cookies.setter
     def cookies(self, cookies: typing.Optional[typing.Sequence[CookieOrHeader]]) -> None:
-        if not cookies:
-            self._cookies = {}
-            return
+        self.close()
 
         self._cookies = {}
-        for cookie in cookies:
+        self._invalid = {}
+        for cookie in cookies or []:
             cookie = parse_cookie(cookie)
 
             account_id = get_cookie_identifier(cookie)
@@ -354,27 +497,125 @@ class CookieSequence(typing.Sequence[typing.Mapping[str, str]]):
             if account_id in self._cookies:
                 raise ValueError(f"Cannot use the same identifier for multiple cookies: {account_id}.")
 
-            self._cookies[account_id] = (cookie, 0)
+            self._cookies[account_id] = cookie
+
+        self.scheduler = manager_scheduler.CookieScheduler(self._cookies)
 
     def __repr__(self) -> str:
-        return f"<{self.__class__.__name__} len={len(self._cookies)}>"
+        return f"<{self.__class__.__name__} len={len(self)} invalid={len(self._invalid)}>"
 
     def __getitem__(self, index: int) -> typing.Mapping[str, str]:  # type: ignore # I can't be fucked with slices
         return self.cookies[index]
 
     def __len__(self) -> int:
-        return len(self.cookies)
+        return len(self._cookies) - len(self._invalid)
 
     def __iter__(self) -> typing.Iterator[typing.Mapping[str, str]]:
         return iter(self.cookies)
 
+    def close(self) -> None:
+        """Stop re-validating invalid cookies."""
+        if self._revalidation is not None:
+            self._revalidation.cancel()
+            self._revalidation = None
+
+    async def request(
+        self,
+        manager: BaseCookieManager,
+        method: str,
+        url: aiohttp.typedefs.StrOrURL,
+        **kwargs: typing.Any,
+    ) -> typing.Any:
+        """Make a request with the most used cookie which still has quota left."""
+        scheduler = self.scheduler
+
+        while (account_id := scheduler.pop()) is not None:
+            # keep the cookie schedulable while its quota is checked, the quota store decides who gets to use it
+            scheduler.release(account_id)
+            use = await self.quota.acquire(account_id)
+
+            if not use.acquired:
+                # another process used up the quota, make sure the cookie is not picked again right away
+                scheduler.update(account_id, use.uses, max(use.available_at, time.time() + 1))
+                continue
+
+            scheduler.update(account_id, use.uses, use.available_at)
+
+            cookie = self._cookies[account_id]
+            try:
+                return await manager._request(method, url, cookies=cookie, **kwargs)
+            except errors.TooManyRequests:
+                _LOGGER.debug("Putting cookie %s on cooldown.", account_id)
+                await self.quota.exhaust(account_id)
+                scheduler.update(account_id, self.quota.max_uses, self.quota.next_reset())
+            except errors.InvalidCookies:
+                warnings.warn(f"Setting aside invalid cookie {cookie}")
+                self._invalidate(manager, account_id, self.region or guess_region(yarl.URL(url)))
+
+        msg = f"All cookies have hit their request limit of {self.quota.max_uses} accounts per day."
+        raise errors.TooManyRequests({"retcode": 10101}, msg)
+
+    def _invalidate(self, manager: BaseCookieManager, account_id: str, region: types.Region) -> None:
+        """Set aside an invalid cookie until it is re-validated."""
+        self.scheduler.remove(account_id)
+        self._invalid[account_id] = (0, region)
+
+        if self._revalidation is None or self._revalidation.done():
+            self._revalidation = asyncio.create_task(self._revalidate(manager))
+
+    async def _validate(self, manager: BaseCookieManager, account_id: str, region: types.Region) -> bool:
+        """Check whether a cookie is valid."""
+        url = routes.BBS_URL.get_url(region).join(yarl.URL(_VALIDATION_URLS[region]))
+        headers = ds_utility.get_ds_headers(region, lang="en-us")
+
+        try:
+            await manager._request("GET", url, cookies=self._cookies[account_id], headers=headers)
+        except errors.InvalidCookies:
+            return False
+
+        return True
+
+    async def _revalidate(self, manager: BaseCookieManager) -> None:
+        """Periodically re-validate invalid cookies."""
+        while self._invalid:
+            await asyncio.sleep(self.revalidate_interval)
+
+            for account_id, (failures, region) in list(self._invalid.items()):
+                try:
+                    valid = await self._validate(manager, account_id, region)
+                except Exception as e:
+                    _LOGGER.debug("Could not re-validate cookie %s: %s", account_id, e)
+                    continue
+
+                if valid:
+                    _LOGGER.debug("Cookie %s is valid again.", account_id)
+                    del self._invalid[account_id]
+                    self.scheduler.add(account_id)
+                elif failures + 1 >= self.max_revalidations:
+                    warnings.warn(f"Deleting invalid cookie {self._cookies[account_id]}")
+                    del self._invalid[account_id]
+                    del self._cookies[account_id]
+                else:
+                    self._invalid[account_id] = (failures + 1, region)
+
 
 class RotatingCookieManager(BaseCookieManager):
-    """Cookie Manager with rotating cookies."""
+    """Cookie Manager with rotating cookies.
+
+    The daily quota of cookies may be shared between processes with a `RedisQuotaStore`.
+    """
 
+    quota: manager_quota.BaseQuotaStore
     _cookies: CookieSequence
 
-    def __init__(self, cookies: typing.Optional[typing.Sequence[CookieOrHeader]] = None) -> None:
+    def __init__(
+        self,
+        cookies: typing.Optional[typing.Sequence[CookieOrHeader]] = None,
+        *,
+        quota: typing.Optional[manager_quota.BaseQuotaStore] = None,
+    ) -> None:
+        self.quota = quota if quota is not None else manager_quota.MemoryQuotaStore()
+        self._cookies = CookieSequence(quota=self.quota)
         self.set_cookies(cookies)
 
     @property
@@ -402,9 +643,14 @@ class RotatingCookieManager(BaseCookieManager):
         cookies: typing.Optional[typing.Sequence[CookieOrHeader]] = None,
     ) -> typing.Sequence[typing.Mapping[str, str]]:
         """Parse and set cookies."""
-        self._cookies = CookieSequence(cookies)
+        self._cookies.cookies = cookies  # type: ignore # mypy does not understand property setters
         return self.cookies
 
+    async def close(self) -> None:
+        """Stop re-validating invalid cookies and close all pooled connections."""
+        self._cookies.close()
+        await super().close()
+
     async def request(
         self,
         url: aiohttp.typedefs.StrOrURL,
@@ -416,31 +662,26 @@ class RotatingCookieManager(BaseCookieManager):
         if not self.cookies:
             raise RuntimeError("Tried to make a request before setting cookies")
 
-        for account_id, (cookie, uses) in self._cookies._cookies.copy().items():
-            try:
-                data = await self._request(method, url, cookies=cookie, **kwargs)
-            except errors.TooManyRequests:
-                _LOGGER.debug("Putting cookie %s on cooldown.", account_id)
-                self._cookies._cookies[account_id] = (cookie, self._cookies.MAX_USES)
-            except errors.InvalidCookies:
-                warnings.warn(f"Deleting invalid cookie {cookie}")
-                # prevent race conditions
-                if account_id in self._cookies._cookies:
-                    del self._cookies._cookies[account_id]
-            else:
-                self._cookies._cookies[account_id] = (cookie, 1 if uses >= self._cookies.MAX_USES else uses + 1)
-                return data
-
-        msg = "All cookies have hit their request limit of 30 accounts per day."
-        raise errors.TooManyRequests({"retcode": 10101}, msg)
+        return await self._cookies.request(self, method, url, **kwargs)
 
 
 class InternationalCookieManager(BaseCookieManager):
-    """Cookie Manager with international rotating cookies."""
+    """Cookie Manager with international rotating cookies.
 
+    Cookies of all regions share the same quota store.
+    """
+
+    quota: manager_quota.BaseQuotaStore
     _cookies: typing.Mapping[types.Region, CookieSequence]
 
-    def __init__(self, cookies: typing.Optional[typing.Mapping[str, MaybeSequence[CookieOrHeader]]] = None) -> None:
+    def __init__(
+        self,
+        cookies: typing.Optional[typing.Mapping[str, MaybeSequence[CookieOrHeader]]] = None,
+        *,
+        quota: typing.Optional[manager_quota.BaseQuotaStore] = None,
+    ) -> None:
+        self.quota = quota if quota is not None else manager_quota.MemoryQuotaStore()
+        self._cookies = {}
         self.set_cookies(cookies)
 
     @property
@@ -464,6 +705,9 @@ class InternationalCookieManager(BaseCookieManager):
         cookies: typing.Optional[typing.Mapping[str, MaybeSequence[CookieOrHeader]]] = None,
     ) -> typing.Mapping[types.Region, typing.Sequence[typing.Mapping[str, str]]]:
         """Parse and set cookies."""
+        for sequence in self._cookies.values():
+            sequence.close()
+
         self._cookies = {}
         if not cookies:
             return {}
@@ -472,24 +716,21 @@ class InternationalCookieManager(BaseCookieManager):
             if not isinstance(regional_cookies, typing.Sequence):
                 regional_cookies = [regional_cookies]
 
-            self._cookies[types.Region(region)] = CookieSequence(regional_cookies)
+            sequence = CookieSequence(regional_cookies, quota=self.quota, region=types.Region(region))
+            self._cookies[types.Region(region)] = sequence
 
         return self.cookies
 
-    def guess_region(self, url: yarl.URL) -> types.Region:
-        """Guess the region from the URL."""
-        assert url.host is not None
-
-        if "os" in url.host or "os" in url.path:
-            return types.Region.OVERSEAS
+    async def close(self) -> None:
+        """Stop re-validating invalid cookies and close all pooled connections."""
+        for sequence in self._cookies.values():
+            sequence.close()
 
-        if "takumi" in url.host:
-            return types.Region.CHINESE
+        await super().close()
 
-        if "sg" in url.host:
-            return types.Region.OVERSEAS
-
-        return types.Region.CHINESE
+    def guess_region(self, url: yarl.URL) -> types.Region:
+        """Guess the region from the URL."""
+        return guess_region(url)
 
     async def request(
         self,
@@ -503,28 +744,7 @@ class InternationalCookieManager(BaseCookieManager):
             raise RuntimeError("Tried to make a request before setting cookies")
 
         region = self.guess_region(yarl.URL(url))
-
-        # TODO: less copy-paste
-        for account_id, (cookie, uses) in self._cookies[region]._cookies.copy().items():
-            try:
-                data = await self._request(method, url, cookies=cookie, **kwargs)
-            except errors.TooManyRequests:
-                _LOGGER.debug("Putting cookie %s on cooldown.", account_id)
-                self._cookies[region]._cookies[account_id] = (cookie, self._cookies[region].MAX_USES)
-            except errors.InvalidCookies:
-                warnings.warn(f"Deleting invalid cookie {cookie}")
-                # prevent race conditions
-                if account_id in self._cookies[region]._cookies:
-                    del self._cookies[region]._cookies[account_id]
-            else:
-                self._cookies[region]._cookies[account_id] = (
-                    cookie,
-                    1 if uses >= self._cookies[region].MAX_USES else uses + 1,
-                )
-                return data
-
-        msg = "All cookies have hit their request limit of 30 accounts per day."
-        raise errors.TooManyRequests({"retcode": 10101}, msg)
+        return await self._cookies[region].request(self, method, url, **kwargs)
 
 
 def no_multi(func: CallableT) -> CallableT:
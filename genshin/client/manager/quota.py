@@ -0,0 +1,213 @@
+"""Daily quota accounting for rotating cookies."""
+
+from __future__ import annotations
+
+import abc
+import datetime
+import math
+import time
+import typing
+
+from genshin.constants import CN_TIMEZONE
+
+if typing.TYPE_CHECKING:
+    import aioredis
+
+__all__ = ["BaseQuotaStore", "MemoryQuotaStore", "QuotaUse", "RedisQuotaStore"]
+
+
+class QuotaUse(typing.NamedTuple):
+    """Outcome of trying to use a cookie."""
+
+    acquired: bool
+    """Whether a use was counted."""
+
+    uses: int
+    """Amount of uses of the cookie today."""
+
+    available_at: float
+    """Timestamp since which the cookie may be used again, 0 if it still has quota left."""
+
+
+class BaseQuotaStore(abc.ABC):
+    """Store of cookie uses and cooldowns.
+
+    Every cookie may be used for `max_uses` accounts per day, the quota resets at midnight in `timezone`.
+    """
+
+    max_uses: int
+    timezone: datetime.tzinfo
+
+    def __init__(self, *, max_uses: int = 30, timezone: datetime.tzinfo = CN_TIMEZONE) -> None:
+        self.max_uses = max_uses
+        self.timezone = timezone
+
+    def today(self) -> datetime.date:
+        """Get the current quota day."""
+        return datetime.datetime.now(self.timezone).date()
+
+    def next_reset(self) -> float:
+        """Get the timestamp of the next quota reset."""
+        tomorrow = self.today() + datetime.timedelta(days=1)
+        return datetime.datetime.combine(tomorrow, datetime.time(), tzinfo=self.timezone).timestamp()
+
+    @abc.abstractmethod
+    async def acquire(self, id: str) -> QuotaUse:
+        """Count a use of a cookie if it has quota left and is not on cooldown."""
+
+    @abc.abstractmethod
+    async def cooldown(self, id: str, until: float) -> None:
+        """Prevent a cookie from being picked until a timestamp."""
+
+    @abc.abstractmethod
+    async def get_uses(self, ids: typing.Sequence[str]) -> typing.Mapping[str, int]:
+        """Get the amount of uses of cookies today."""
+
+    async def exhaust(self, id: str) -> None:
+        """Mark a cookie as having no quota left today."""
+        await self.cooldown(id, self.next_reset())
+
+
+class MemoryQuotaStore(BaseQuotaStore):
+    """Quota store for a single process."""
+
+    _day: typing.Optional[datetime.date]
+    _uses: dict[str, int]
+    _cooldowns: dict[str, float]
+
+    def __init__(self, *, max_uses: int = 30, timezone: datetime.tzinfo = CN_TIMEZONE) -> None:
+        super().__init__(max_uses=max_uses, timezone=timezone)
+
+        self._day = None
+        self._uses = {}
+        self._cooldowns = {}
+
+    def _check_reset(self) -> None:
+        """Reset the uses if the day changed."""
+        today = self.today()
+        if self._day != today:
+            self._day = today
+            self._uses = {}
+
+    async def acquire(self, id: str) -> QuotaUse:
+        """Count a use of a cookie if it has quota left and is not on cooldown."""
+        self._check_reset()
+        uses = self._uses.get(id, 0)
+
+        until = self._cooldowns.get(id)
+        if until is not None:
+            if until > time.time():
+                return QuotaUse(False, uses, until)
+
+            del self._cooldowns[id]
+
+        if uses >= self.max_uses:
+            return QuotaUse(False, uses, self.next_reset())
+
+        uses = self._uses[id] = uses + 1
+        return QuotaUse(True, uses, self.next_reset() if uses >= self.max_uses else 0)
+
+    async def cooldown(self, id: str, until: float) -> None:
+        """Prevent a cookie from being picked until a timestamp."""
+        self._cooldowns[id] = until
+
+    async def get_uses(self, ids: typing.Sequence[str]) -> typing.Mapping[str, int]:
+        """Get the amount of uses of cookies today."""
+        self._check_reset()
+        return {id: self._uses.get(id, 0) for id in ids}
+
+
+# KEYS: uses, cooldowns
+# ARGV: id, max uses, now, next reset
+# returns: {acquired, uses, available at}
+_ACQUIRE_SCRIPT = """
+local id, max_uses, now, reset = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local uses = tonumber(redis.call("HGET", KEYS[1], id) or "0")
+
+local until = tonumber(redis.call("HGET", KEYS[2], id) or "0")
+if until > now then
+    return {0, uses, until}
+elseif until > 0 then
+    redis.call("HDEL", KEYS[2], id)
+end
+
+if uses >= max_uses then
+    return {0, uses, reset}
+end
+
+uses = redis.call("HINCRBY", KEYS[1], id, 1)
+-- keep the uses for a while after the reset in case of clock skew
+redis.call("EXPIRE", KEYS[1], math.ceil(reset - now) + 3600)
+
+if uses >= max_uses then
+    return {1, uses, reset}
+end
+
+return {1, uses, 0}
+"""
+
+# KEYS: cooldowns
+# ARGV: id, until, ttl
+_COOLDOWN_SCRIPT = """
+redis.call("HSET", KEYS[1], ARGV[1], ARGV[2])
+if redis.call("TTL", KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call("EXPIRE", KEYS[1], ARGV[3])
+end
+"""
+
+
+class RedisQuotaStore(BaseQuotaStore):
+    """Quota store shared by all processes using the same redis server.
+
+    Using a cookie is a single atomic script, so concurrent workers never exceed the quota.
+    """
+
+    redis: aioredis.Redis
+    prefix: str
+
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        *,
+        prefix: str = "genshin.py:quota",
+        max_uses: int = 30,
+        timezone: datetime.tzinfo = CN_TIMEZONE,
+    ) -> None:
+        super().__init__(max_uses=max_uses, timezone=timezone)
+
+        self.redis = redis
+        self.prefix = prefix
+
+        self._acquire = redis.register_script(_ACQUIRE_SCRIPT)  # pyright: ignore
+        self._cooldown = redis.register_script(_COOLDOWN_SCRIPT)  # pyright: ignore
+
+    @property
+    def uses_key(self) -> str:
+        """Key of the uses of the current day."""
+        return f"{self.prefix}:uses:{self.today().isoformat()}"
+
+    @property
+    def cooldowns_key(self) -> str:
+        """Key of the cooldowns."""
+        return f"{self.prefix}:cooldowns"
+
+    async def acquire(self, id: str) -> QuotaUse:
+        """Count a use of a cookie if it has quota left and is not on cooldown."""
+        acquired, uses, available_at = await self._acquire(  # pyright: ignore
+            keys=[self.uses_key, self.cooldowns_key],
+            args=[id, self.max_uses, math.floor(time.time()), math.ceil(self.next_reset())],
+        )
+        return QuotaUse(bool(acquired), int(uses), float(available_at))  # pyright: ignore
+
+    async def cooldown(self, id: str, until: float) -> None:
+        """Prevent a cookie from being picked until a timestamp."""
+        ttl = max(1, math.ceil(until - time.time()))
+        await self._cooldown(keys=[self.cooldowns_key], args=[id, until, ttl])  # pyright: ignore
+
+    async def get_uses(self, ids: typing.Sequence[str]) -> typing.Mapping[str, int]:
+        """Get the amount of uses of cookies today."""
+        if not ids:
+            return {}
+
+        values = await self.redis.hmget(self.uses_key, list(ids))  # pyright: ignore
+        return {id: int(value or 0) for id, value in zip(ids, values)}  # pyright: ignore
@@ -0,0 +1,131 @@
+"""Scheduling of rotating cookies."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+import typing
+
+__all__ = ["CookieScheduler"]
+
+
+class CookieScheduler:
+    """Priority queue of cookie ids.
+
+    Available cookies are ordered by their uses so the most used cookies are exhausted first
+    and the remaining cookies keep their full quota. Cookies on cooldown are ordered by the time
+    they become available again. Stale heap entries are skipped lazily.
+    """
+
+    # {id: uses, ...}
+    _uses: dict[str, int]
+    # {id: available at, ...}
+    _cooldowns: dict[str, float]
+    # {id: latest entry order, ...}
+    _entries: dict[str, int]
+
+    # [(-uses, order, id), ...]
+    _ready: list[tuple[int, int, str]]
+    # [(available at, order, id), ...]
+    _cooling: list[tuple[float, int, str]]
+    _order: typing.Iterator[int]
+
+    def __init__(self, ids: typing.Iterable[str] = ()) -> None:
+        self._uses = {}
+        self._cooldowns = {}
+        self._entries = {}
+
+        self._ready = []
+        self._cooling = []
+        self._order = itertools.count()
+
+        for id in ids:
+            self.add(id)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} len={len(self)} cooling={len(self._cooldowns)}>"
+
+    def __len__(self) -> int:
+        return len(self._uses)
+
+    def __contains__(self, id: object) -> bool:
+        return id in self._uses
+
+    def _push(self, id: str) -> None:
+        """Push the current state of a cookie onto its heap."""
+        order = self._entries[id] = next(self._order)
+
+        if id in self._cooldowns:
+            heapq.heappush(self._cooling, (self._cooldowns[id], order, id))
+        else:
+            heapq.heappush(self._ready, (-self._uses[id], order, id))
+
+        # prevent the heaps from growing indefinitely with stale entries
+        if len(self._ready) + len(self._cooling) > 2 * len(self._entries) + 64:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Drop all stale entries."""
+        entries = self._entries.items()
+        self._ready = [(-self._uses[id], order, id) for id, order in entries if id not in self._cooldowns]
+        self._cooling = [(self._cooldowns[id], order, id) for id, order in entries if id in self._cooldowns]
+        heapq.heapify(self._ready)
+        heapq.heapify(self._cooling)
+
+    def _promote(self, now: float) -> None:
+        """Make cookies whose cooldown expired available again."""
+        while self._cooling and self._cooling[0][0] <= now:
+            _, order, id = heapq.heappop(self._cooling)
+            if self._entries.get(id) != order:
+                continue
+
+            del self._cooldowns[id]
+            # the quota was likely reset, the real amount of uses is known after the next use
+            self._uses[id] = 0
+            self._push(id)
+
+    def add(self, id: str, uses: int = 0) -> None:
+        """Add a cookie."""
+        self._uses[id] = uses
+        self._cooldowns.pop(id, None)
+        self._push(id)
+
+    def remove(self, id: str) -> None:
+        """Remove a cookie."""
+        self._uses.pop(id, None)
+        self._cooldowns.pop(id, None)
+        self._entries.pop(id, None)
+
+    def update(self, id: str, uses: int, available_at: float = 0) -> None:
+        """Update the uses and cooldown of a cookie."""
+        if id not in self._uses:
+            return
+
+        self._uses[id] = uses
+        if available_at > time.time():
+            self._cooldowns[id] = available_at
+        else:
+            self._cooldowns.pop(id, None)
+
+        self._push(id)
+
+    def release(self, id: str) -> None:
+        """Put back a taken cookie without changing its state."""
+        if id in self._uses:
+            self._push(id)
+
+    def pop(self) -> typing.Optional[str]:
+        """Take the next available cookie.
+
+        The cookie must be put back with `update` once its new state is known.
+        """
+        self._promote(time.time())
+
+        while self._ready:
+            _, order, id = heapq.heappop(self._ready)
+            if self._entries.get(id) == order:
+                del self._entries[id]
+                return id
+
+        return None
@@ -0,0 +1,196 @@
+"""Pooled HTTP transport shared by cookie managers."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import typing
+
+import aiohttp
+
+from genshin.client import ratelimit
+from genshin.utility import concurrency
+
+__all__ = ["Transport"]
+
+_LOGGER = logging.getLogger(__name__)
+
+# default argument telling apart an omitted ratelimiter from an explicitly disabled one
+_DEFAULT_RATE_LIMITER: typing.Any = object()
+
+
+class Transport:
+    """Long-lived pool of HTTP sessions.
+
+    One session (and therefore one connector) is kept per socks proxy so TCP and TLS
+    connections are reused between requests. Sessions are created lazily on first use.
+
+    A single transport may be shared by any amount of clients, cookies and headers are
+    always sent per request and are never stored in the pooled sessions.
+    """
+
+    limit: int
+    """Total number of simultaneous connections per connector."""
+
+    limit_per_host: int
+    """Number of simultaneous connections to a single host, 0 for no limit."""
+
+    keepalive_timeout: float
+    """Time in seconds an idle connection is kept alive."""
+
+    ttl_dns_cache: typing.Optional[int]
+    """Time in seconds resolved addresses are cached, None to cache forever."""
+
+    max_concurrency: typing.Optional[int]
+    """Maximum amount of concurrent requests across all proxies."""
+
+    max_concurrency_per_host: typing.Optional[int]
+    """Maximum amount of concurrent requests towards a single host across all proxies."""
+
+    rate_limiter: typing.Optional[ratelimit.RateLimiter]
+    """Adaptive ratelimiter shared by all requests, None to disable."""
+
+    single_flight: concurrency.SingleFlight
+    """Coalesces identical concurrent requests of all clients using this transport."""
+
+    # {socks proxy: (session, loop), ...}
+    _sessions: dict[typing.Optional[str], tuple[aiohttp.ClientSession, asyncio.AbstractEventLoop]]
+
+    _loop: typing.Optional[asyncio.AbstractEventLoop]
+    _semaphore: typing.Optional[asyncio.Semaphore]
+    _host_semaphores: dict[str, asyncio.Semaphore]
+
+    def __init__(
+        self,
+        *,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 30,
+        ttl_dns_cache: typing.Optional[int] = 300,
+        max_concurrency: typing.Optional[int] = None,
+        max_concurrency_per_host: typing.Optional[int] = None,
+        rate_limiter: typing.Optional[ratelimit.RateLimiter] = _DEFAULT_RATE_LIMITER,
+    ) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.max_concurrency = max_concurrency
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self.rate_limiter = ratelimit.RateLimiter() if rate_limiter is _DEFAULT_RATE_LIMITER else rate_limiter
+
+        self.single_flight = concurrency.SingleFlight()
+
+        self._sessions = {}
+
+        self._loop = None
+        self._semaphore = None
+        self._host_semaphores = {}
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} sessions={len(self._sessions)} limit={self.limit}>"
+
+    async def __aenter__(self) -> Transport:
+        return self
+
+    async def __aexit__(self, *exc_info: typing.Any) -> None:
+        await self.close()
+
+    @property
+    def closed(self) -> bool:
+        """Whether there are no open sessions."""
+        return all(session.closed for session, _ in self._sessions.values())
+
+    def create_connector(self, socks_proxy: typing.Optional[str] = None) -> aiohttp.BaseConnector:
+        """Create a new connector with the pool settings."""
+        kwargs: dict[str, typing.Any] = dict(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+        )
+
+        if socks_proxy is not None:
+            import aiohttp_socks
+
+            return aiohttp_socks.ProxyConnector.from_url(socks_proxy, **kwargs)
+
+        return aiohttp.TCPConnector(**kwargs)
+
+    def get_session(self, socks_proxy: typing.Optional[str] = None) -> aiohttp.ClientSession:
+        """Get the pooled session for a socks proxy, creating it when needed.
+
+        Must be called from within a running event loop.
+        """
+        loop = asyncio.get_running_loop()
+
+        entry = self._sessions.get(socks_proxy)
+        if entry is not None:
+            session, session_loop = entry
+            if not session.closed and session_loop is loop:
+                return session
+
+            # sessions are bound to their loop, a closed loop cannot be reused
+            _LOGGER.debug("Discarding stale session for proxy %s", socks_proxy)
+            self._discard_session(session, session_loop)
+
+        session = aiohttp.ClientSession(
+            cookie_jar=aiohttp.DummyCookieJar(),
+            connector=self.create_connector(socks_proxy),
+        )
+        self._sessions[socks_proxy] = (session, loop)
+        return session
+
+    @staticmethod
+    def _discard_session(session: aiohttp.ClientSession, loop: asyncio.AbstractEventLoop) -> None:
+        """Release the connections of a session bound to another event loop."""
+        if session.closed:
+            return
+
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+
+        # nothing can be awaited on a stopped loop, drop the sockets synchronously
+        connector = session.connector
+        session.detach()
+        if connector is not None:
+            connector._close()
+
+    def _prepare_semaphores(self) -> None:
+        """Recreate the semaphores if the event loop changed."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+
+        self._loop = loop
+        self._semaphore = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        self._host_semaphores = {}
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, host: typing.Optional[str] = None) -> typing.AsyncGenerator[None, None]:
+        """Wait until a request towards a host can be made within the concurrency limits."""
+        self._prepare_semaphores()
+
+        async with contextlib.AsyncExitStack() as stack:
+            if self._semaphore is not None:
+                await stack.enter_async_context(self._semaphore)
+
+            if host and self.max_concurrency_per_host:
+                semaphore = self._host_semaphores.get(host)
+                if semaphore is None:
+                    semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.max_concurrency_per_host)
+
+                await stack.enter_async_context(semaphore)
+
+            yield
+
+    async def close(self) -> None:
+        """Close all pooled sessions."""
+        sessions, self._sessions = self._sessions, {}
+
+        loop = asyncio.get_running_loop()
+        for session, session_loop in sessions.values():
+            if session_loop is loop:
+                await session.close()
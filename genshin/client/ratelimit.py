@@ -1,10 +1,15 @@
 """Ratelimit handlers."""
 
+import asyncio
+import dataclasses
 import functools
 import logging
+import time
 import typing
 
 import aiohttp
+import aiohttp.typedefs
+import yarl
 from tenacity import (
     before_sleep_log,
     retry,
@@ -18,6 +23,7 @@ from genshin import errors
 LOGGER_ = logging.getLogger(__name__)
 TIMEOUT_ERRORS = (TimeoutError, aiohttp.ClientConnectionError, ConnectionResetError)
 CallableT = typing.TypeVar("CallableT", bound=typing.Callable[..., typing.Awaitable[typing.Any]])
+RATELIMIT_ERRORS = (errors.VisitsTooFrequently, errors.TooManyRequests)
 
 
 def handle_ratelimits(
@@ -75,3 +81,146 @@ def handle_proxy_errors(func: CallableT) -> CallableT:
                 self._socks_proxy = original_socks_proxy
 
     return typing.cast(CallableT, wrapper)
+
+
+@dataclasses.dataclass
+class TokenBucket:
+    """Token bucket with an additive-increase/multiplicative-decrease rate.
+
+    Requests reserve tokens in order, so concurrent callers are spaced out instead of retrying in bursts.
+    """
+
+    rate: float = 10
+    """Current amount of requests per second."""
+
+    min_rate: float = 0.2
+    """Lowest rate the bucket may slow down to."""
+
+    max_rate: float = 10
+    """Highest rate the bucket may recover to."""
+
+    burst: float = 10
+    """Maximum amount of requests which may be sent at once after being idle."""
+
+    increase: float = 0.1
+    """Amount the rate recovers by after every successful request."""
+
+    decrease: float = 0.5
+    """Factor the rate is multiplied by after being ratelimited."""
+
+    waiting: int = 0
+    """Amount of requests waiting for a token."""
+
+    _tokens: float = dataclasses.field(default=0, init=False, repr=False)
+    _updated: float = dataclasses.field(default_factory=time.monotonic, init=False, repr=False)
+    _slowed: float = dataclasses.field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._tokens = self.burst
+
+    def _refill(self) -> None:
+        """Add tokens for the time passed since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Reserve a token and return how long to wait for it."""
+        self._refill()
+        self._tokens -= 1
+        return max(0, -self._tokens / self.rate)
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        delay = self.reserve()
+        if delay <= 0:
+            return
+
+        self.waiting += 1
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.waiting -= 1
+
+    def on_success(self) -> None:
+        """Gradually recover the rate."""
+        self._refill()
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_ratelimit(self) -> None:
+        """Slow down the rate and drop any saved up tokens.
+
+        Ratelimits caused by the same burst only slow the rate down once.
+        """
+        self._refill()
+
+        now = time.monotonic()
+        if now - self._slowed < max(1, 1 / self.rate):
+            return
+
+        self._slowed = now
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self._tokens = min(self._tokens, 0)
+
+
+class RateLimiter:
+    """Adaptive ratelimiter with a separate token bucket for every endpoint family.
+
+    Endpoints are grouped into "record", "gacha", "reward" and "hoyolab".
+    """
+
+    buckets: dict[str, TokenBucket]
+    bucket_factory: typing.Callable[[], TokenBucket]
+
+    def __init__(self, bucket_factory: typing.Callable[[], TokenBucket] = TokenBucket) -> None:
+        self.buckets = {}
+        self.bucket_factory = bucket_factory
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} rates={self.rates} queue_depths={self.queue_depths}>"
+
+    @staticmethod
+    def get_family(url: aiohttp.typedefs.StrOrURL) -> str:
+        """Get the endpoint family of a url."""
+        path = yarl.URL(url).path
+
+        if "game_record" in path:
+            return "record"
+        if "gacha" in path:
+            return "gacha"
+        if path.startswith(("/event/sol", "/event/luna", "/event/mani")):
+            return "reward"
+
+        return "hoyolab"
+
+    def get_bucket(self, url: aiohttp.typedefs.StrOrURL) -> TokenBucket:
+        """Get the token bucket of a url."""
+        family = self.get_family(url)
+
+        bucket = self.buckets.get(family)
+        if bucket is None:
+            bucket = self.buckets[family] = self.bucket_factory()
+
+        return bucket
+
+    @property
+    def rates(self) -> dict[str, float]:
+        """Current rates of every endpoint family."""
+        return {family: bucket.rate for family, bucket in self.buckets.items()}
+
+    @property
+    def queue_depths(self) -> dict[str, int]:
+        """Amount of waiting requests of every endpoint family."""
+        return {family: bucket.waiting for family, bucket in self.buckets.items()}
+
+    async def acquire(self, url: aiohttp.typedefs.StrOrURL) -> None:
+        """Wait until a request towards a url may be sent."""
+        await self.get_bucket(url).acquire()
+
+    def record(self, url: aiohttp.typedefs.StrOrURL, error: typing.Optional[BaseException] = None) -> None:
+        """Adjust the rate of a url according to the outcome of a request."""
+        if error is None:
+            self.get_bucket(url).on_success()
+        elif isinstance(error, RATELIMIT_ERRORS):
+            LOGGER_.debug("Ratelimited on %s, slowing down.", self.get_family(url))
+            self.get_bucket(url).on_ratelimit()
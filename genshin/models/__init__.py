@@ -1,9 +1,20 @@
 """API models."""
 
-from .auth import *
-from .genshin import *
-from .honkai import *
-from .hoyolab import *
-from .model import *
-from .starrail import *
-from .zzz import *
+import typing as _typing
+
+from genshin.utility import lazy as _lazy
+
+if _typing.TYPE_CHECKING:
+    from .auth import *
+    from .genshin import *
+    from .honkai import *
+    from .hoyolab import *
+    from .model import *
+    from .starrail import *
+    from .zzz import *
+
+# every game has its own subpackage, only import the ones that are actually used
+__getattr__, __dir__ = _lazy.lazy_import(
+    __name__,
+    exports=("model", "hoyolab", "auth", "genshin", "honkai", "starrail", "zzz"),
+)
@@ -1,5 +1,6 @@
 """Genshin character model."""
 
+import functools
 import logging
 import re
 import typing
@@ -19,8 +20,30 @@ ENKA_ICON_BASE = "https://enka.network/ui/"
 AMBR_ICON_BASE = "https://gi.yatta.moe/assets/UI/"
 
 
+def _load_character_names(lang: str) -> None:
+    """Load the cached character names of a language, they are only read when first needed."""
+    from genshin.utility import extdb  # circular import
+
+    extdb._load_cache(lang)
+
+
+ICON_PATTERN = re.compile(r"UI_AvatarIcon(?:_Side)?_(.*).png")
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_icon_name(icon: str) -> str:
+    match = ICON_PATTERN.search(icon)
+    if match:
+        return match[1]
+
+    return icon
+
+
 def _parse_icon(icon: typing.Union[str, int]) -> str:
     if isinstance(icon, int):
+        if not constants.CHARACTER_NAMES:
+            _load_character_names("en-us")
+
         for names in constants.CHARACTER_NAMES.values():
             char = names.get(icon)
             if char:
@@ -28,14 +51,11 @@ def _parse_icon(icon: typing.Union[str, int]) -> str:
 
         raise ValueError(f"Invalid character id {icon}")
 
-    match = re.search(r"UI_AvatarIcon(?:_Side)?_(.*).png", icon)
-    if match:
-        return match[1]
-
-    return icon
+    return _parse_icon_name(icon)
 
 
 def _get_icon_name_from_id(character_id: int) -> str:
+    _load_character_names("en-us")
     if "en-us" not in constants.CHARACTER_NAMES:
         raise ValueError(
             "Character names not loaded for en-us. Please run `await genshin.utility.update_characters_any()`."
@@ -71,15 +91,17 @@ def _get_db_char(
     lang: str,
 ) -> constants.DBChar:
     """Get the appropriate DBChar object from specific fields."""
-    if lang not in constants.CHARACTER_NAMES:
+    _load_character_names(lang)
+    index = constants.get_character_index(lang)
+    if index is None:
         if id and name and icon and element and rarity:
             return constants.DBChar(id or 0, _parse_icon(icon), name, element, rarity, guessed=True)
         raise Exception(
             f"Character names not loaded for {lang!r}. Please run `await genshin.utility.update_characters_any()`."
         )
 
-    if id and id in constants.CHARACTER_NAMES[lang]:
-        char = constants.CHARACTER_NAMES[lang][id]
+    if id and id in index.characters:
+        char = index.characters[id]
         if name is not None:
             char = char._replace(name=name, element=element or char.element or "")
 
@@ -88,18 +110,18 @@ def _get_db_char(
     if icon and "genshin" in icon:
         icon_name = _parse_icon(icon)
 
-        for char in constants.CHARACTER_NAMES[lang].values():
-            if char.icon_name == icon_name:
-                if name is not None:
-                    char = char._replace(name=name)
+        found = index.by_icon.get(icon_name)
+        if found is not None:
+            if name is not None:
+                found = found._replace(name=name)
 
-                return char
+            return found
 
         # might as well just update the CHARACTER_NAMES if we have all required data
         if id and name and icon and element and rarity:
             char = constants.DBChar(id, icon_name, name, element, rarity, guessed=True)
             _LOGGER.debug("Updating CHARACTER_NAMES with %s", char)
-            constants.CHARACTER_NAMES[lang][char.id] = char
+            constants.set_character(lang, char)
             return char
 
         return constants.DBChar(
@@ -112,9 +134,9 @@ def _get_db_char(
         )
 
     if name:
-        for char in constants.CHARACTER_NAMES[lang].values():
-            if char.name == name:
-                return char
+        found = index.by_name.get(name)
+        if found is not None:
+            return found
 
         return constants.DBChar(id or 0, icon or name, name, element or "Anemo", rarity or 5, guessed=True)
 
@@ -92,4 +92,81 @@ class DBChar(typing.NamedTuple):
 #     10000071: ("Cyno", "Electro", 5),
 #     10000072: ("Candace", "Hydro", 4),
 # }
+# Languages may be replaced as a whole, single characters must be written with `set_character`
+# since in-place replacements are not noticed by the lookup indexes.
 CHARACTER_NAMES: dict[str, dict[int, DBChar]] = {}
+
+
+class CharacterIndex:
+    """Lookup tables for the character names of a single language."""
+
+    __slots__ = ("by_icon", "by_name", "characters", "size")
+
+    characters: dict[int, DBChar]
+    """Characters by their id, this is the indexed dictionary itself."""
+
+    by_icon: dict[str, DBChar]
+    """Characters by their standardized icon name."""
+
+    by_name: dict[str, DBChar]
+    """Characters by their localized name."""
+
+    size: int
+
+    def __init__(self, characters: dict[int, DBChar]) -> None:
+        self.characters = characters
+        self.by_icon = {}
+        self.by_name = {}
+        self.size = 0
+
+        for char in characters.values():
+            self.add(char)
+
+    def add(self, char: DBChar) -> None:
+        """Index a newly added character, earlier characters take precedence."""
+        self.by_icon.setdefault(char.icon_name, char)
+        self.by_name.setdefault(char.name, char)
+        self.size += 1
+
+    def is_current(self, characters: dict[int, DBChar]) -> bool:
+        """Whether the index still reflects the given characters.
+
+        Only replaced languages and added characters are detected, a character replaced in-place
+        without `set_character` keeps being found by its old icon and name.
+        """
+        return self.characters is characters and self.size == len(characters)
+
+
+_INDEXES: dict[str, CharacterIndex] = {}
+
+
+def get_character_index(lang: str) -> typing.Optional[CharacterIndex]:
+    """Get the lookup tables for the character names of a language.
+
+    Indexes are rebuilt whenever a language was replaced or extended without `set_character`.
+    """
+    characters = CHARACTER_NAMES.get(lang)
+    if characters is None:
+        return None
+
+    index = _INDEXES.get(lang)
+    if index is None or not index.is_current(characters):
+        index = _INDEXES[lang] = CharacterIndex(characters)
+
+    return index
+
+
+def set_character(lang: str, char: DBChar) -> None:
+    """Add or replace a character while keeping its language indexed."""
+    characters = CHARACTER_NAMES.setdefault(lang, {})
+    replaced = char.id in characters
+    characters[char.id] = char
+
+    index = _INDEXES.get(lang)
+    if index is None or index.characters is not characters:
+        return
+
+    if replaced:
+        del _INDEXES[lang]  # the replaced character may still be indexed by its old name
+    else:
+        index.add(char)
@@ -6,8 +6,9 @@ import re
 import typing
 
 import pydantic
+import typing_extensions
 
-from genshin.models.model import Aliased, APIModel, Unique
+from genshin.models.model import Aliased, APIModel, Unique, get_list_adapter, get_timezone
 
 __all__ = [
     "BannerDetailItem",
@@ -146,9 +147,15 @@ class BaseWish(APIModel, Unique):
 
     @pydantic.field_validator("time", mode="before")
     def __parse_time(cls, v: str, info: pydantic.ValidationInfo) -> datetime.datetime:
-        return datetime.datetime.fromisoformat(v).replace(
-            tzinfo=datetime.timezone(datetime.timedelta(hours=8 + info.data["tz_offset"]))
-        )
+        return datetime.datetime.fromisoformat(v).replace(tzinfo=get_timezone(8 + info.data["tz_offset"]))
+
+    @classmethod
+    def from_page(
+        cls, rows: typing.Sequence[typing.Mapping[str, typing.Any]], banner_type: int, tz_offset: int
+    ) -> list[typing_extensions.Self]:
+        """Create every wish of a gacha log page in a single validation call."""
+        rows = [{**row, "banner_type": banner_type, "tz_offset": tz_offset} for row in rows]
+        return get_list_adapter(cls).validate_python(rows)
 
 
 class Wish(BaseWish):
@@ -3,7 +3,7 @@
 import enum
 import typing
 
-from genshin.models.model import Aliased, APIModel, TZDateTime, Unique
+from genshin.models.model import Aliased, APIModel, TZDateTime, Unique, get_list_adapter
 
 __all__ = ["BaseTransaction", "ItemTransaction", "Transaction", "TransactionKind"]
 
@@ -37,6 +37,14 @@ class BaseTransaction(APIModel, Unique):
     amount: int = Aliased("add_num")
     reason: str = Aliased("reason")
 
+    @classmethod
+    def from_page(
+        cls, rows: typing.Sequence[typing.Mapping[str, typing.Any]], kind: TransactionKind
+    ) -> typing.Sequence["BaseTransaction"]:
+        """Create every transaction of a page in a single validation call."""
+        model = ItemTransaction if kind in (TransactionKind.ARTIFACT, TransactionKind.WEAPON) else Transaction
+        return get_list_adapter(model).validate_python([{**row, "kind": kind} for row in rows])
+
 
 class Transaction(BaseTransaction):
     """Genshin transaction of currency."""
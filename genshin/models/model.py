@@ -5,6 +5,7 @@ from __future__ import annotations
 import abc
 import datetime
 import enum
+import functools
 import logging
 import typing
 from typing import Annotated
@@ -45,6 +46,22 @@ def Aliased(
     return pydantic.Field(default, alias=alias, **kwargs)
 
 
+ModelT = typing.TypeVar("ModelT", bound=pydantic.BaseModel)
+
+
+@functools.lru_cache(maxsize=None)
+def get_list_adapter(model: type[ModelT]) -> pydantic.TypeAdapter[list[ModelT]]:
+    """Get a cached adapter validating a whole page of models in a single call."""
+    list_type = typing.List[model]  # type: ignore[valid-type]  # pyright: ignore[reportInvalidTypeForm]
+    return pydantic.TypeAdapter(list_type)
+
+
+@functools.lru_cache(maxsize=None)
+def get_timezone(hours: int) -> datetime.timezone:
+    """Get a shared timezone with a fixed offset from UTC."""
+    return datetime.timezone(datetime.timedelta(hours=hours))
+
+
 def add_timezone(value: datetime.datetime) -> datetime.datetime:
     return value.replace(tzinfo=CN_TIMEZONE)
 
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import abc
+import asyncio
+import collections
 import typing
 import warnings
 
@@ -47,10 +49,11 @@ class APIPaginator(typing.Generic[T], base.BufferedPaginator[T], abc.ABC):
 class PagedPaginator(typing.Generic[T], APIPaginator[T]):
     """Paginator for resources which only require a page number.
 
-    Due to ratelimits the requests must be sequential.
+    Pages are requested sequentially by default. With a concurrency above 1 windows of that many pages
+    are requested at once, the requests are still paced by the client's ratelimiter.
     """
 
-    __slots__ = ("_page_size", "current_page")
+    __slots__ = ("_page_size", "current_page", "concurrency", "_window", "_received")
 
     getter: GetterCallback[T]
     """Underlying getter that yields the next page."""
@@ -61,25 +64,77 @@ class PagedPaginator(typing.Generic[T], APIPaginator[T]):
     current_page: typing.Optional[int]
     """Current page counter.."""
 
+    concurrency: int
+    """Amount of pages to request at once."""
+
+    _window: collections.deque[typing.Sequence[T]]
+    """Pages fetched concurrently which have not been returned yet."""
+
+    _received: int
+    """Amount of items received so far."""
+
     def __init__(
         self,
         getter: GetterCallback[T],
         *,
         limit: typing.Optional[int] = None,
         page_size: typing.Optional[int] = None,
+        prefetch: int = 0,
+        concurrency: int = 1,
     ) -> None:
-        super().__init__(limit=limit)
+        super().__init__(limit=limit, prefetch=prefetch)
         self.getter = getter
         self._page_size = page_size
+        self.concurrency = concurrency
 
         self.current_page = 1
+        self._window = collections.deque()
+        self._received = 0
+
+    def _get_cursor(self) -> typing.Optional[int]:
+        return self.current_page
+
+    def _set_cursor(self, cursor: typing.Optional[int]) -> None:
+        self.current_page = cursor
+        self._window.clear()
+        self._received = self._counter - self._skip
+
+    async def _next_window(self, page: int, page_size: int) -> typing.Sequence[T]:
+        """Request a window of pages at once and return the first one."""
+        size = self.concurrency
+        if self.limit:
+            # don't request pages beyond the limit
+            remaining = self.limit - self._received
+            size = max(1, min(size, -(-remaining // page_size)))
+
+        pages = await asyncio.gather(*(self.getter(page + offset) for offset in range(size)))
+
+        self.current_page = page + size
+        for offset, data in enumerate(pages):
+            self._received += len(data)
+            self._window.append(data)
+            self._cursors.append(page + offset)
+
+            if len(data) < page_size:
+                self.current_page = None
+                break
+
+        return self._window.popleft()
 
     async def next_page(self) -> typing.Optional[typing.Iterable[T]]:
         """Get the next page of the paginator."""
+        if self._window:
+            return self._window.popleft()
+
         if self.current_page is None:
             return None
 
+        if self.concurrency > 1 and self._page_size is not None:
+            return await self._next_window(self.current_page, self._page_size)
+
         data = await self.getter(self.current_page)
+        self._received += len(data)
+        self._cursors.append(self.current_page)
 
         if self._page_size is None:
             warnings.warn("No page size specified for resource, having to guess.")
@@ -112,19 +167,28 @@ class TokenPaginator(typing.Generic[T], APIPaginator[T]):
         *,
         limit: typing.Optional[int] = None,
         page_size: typing.Optional[int] = None,
+        prefetch: int = 0,
     ) -> None:
-        super().__init__(limit=limit)
+        super().__init__(limit=limit, prefetch=prefetch)
         self.getter = getter
         self._page_size = page_size
 
         self.token = ""
 
+    def _get_cursor(self) -> typing.Optional[str]:
+        return self.token
+
+    def _set_cursor(self, cursor: typing.Optional[str]) -> None:
+        self.token = cursor
+
     async def next_page(self) -> typing.Optional[typing.Iterable[T]]:
         """Get the next page of the paginator."""
         if self.token is None:
             return None
 
-        self.token, data = await self.getter(self.token)
+        token = self.token
+        self.token, data = await self.getter(token)
+        self._cursors.append(token)
 
         if self._page_size is None:
             warnings.warn("No page size specified for resource, having to guess.")
@@ -138,9 +202,13 @@ class TokenPaginator(typing.Generic[T], APIPaginator[T]):
 
 
 class CursorPaginator(typing.Generic[UniqueT], APIPaginator[UniqueT]):
-    """Paginator based on end_id cursors."""
+    """Paginator based on end_id cursors.
+
+    Items are expected to be ordered by descending ids, if a stop id is set the paginator
+    stops as soon as it reaches an item which is not newer than it.
+    """
 
-    __slots__ = ("_page_size", "end_id")
+    __slots__ = ("_page_size", "end_id", "stop_id")
 
     getter: GetterCallback[UniqueT]
     """Underlying getter that yields the next page."""
@@ -151,31 +219,50 @@ class CursorPaginator(typing.Generic[UniqueT], APIPaginator[UniqueT]):
     end_id: typing.Optional[int]
     """Current end id. If none then exhausted."""
 
+    stop_id: int
+    """Id of the newest already known item. If zero then the whole history is fetched."""
+
     def __init__(
         self,
         getter: GetterCallback[UniqueT],
         *,
         limit: typing.Optional[int] = None,
         end_id: int = 0,
+        stop_id: int = 0,
         page_size: typing.Optional[int] = 20,
+        prefetch: int = 0,
     ) -> None:
-        super().__init__(limit=limit)
+        super().__init__(limit=limit, prefetch=prefetch)
         self.getter = getter
         self.end_id = end_id
+        self.stop_id = stop_id
 
         self._page_size = page_size
 
+    def _get_cursor(self) -> typing.Optional[int]:
+        return self.end_id
+
+    def _set_cursor(self, cursor: typing.Optional[int]) -> None:
+        self.end_id = cursor
+
     async def next_page(self) -> typing.Optional[typing.Iterable[UniqueT]]:
         """Get the next page of the paginator."""
         if self.end_id is None:
             return None
 
         data = await self.getter(self.end_id)
+        self._cursors.append(self.end_id)
 
         if self._page_size is None:
             warnings.warn("No page size specified for resource, having to guess.")
             self._page_size = len(data)
 
+        if self.stop_id:
+            for index, item in enumerate(data):
+                if item.id <= self.stop_id:
+                    self.end_id = None
+                    return data[:index]
+
         if len(data) < self._page_size:
             self.end_id = None
             return data
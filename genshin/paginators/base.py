@@ -4,9 +4,17 @@ from __future__ import annotations
 
 import abc
 import asyncio
+import collections
+import contextlib
+import csv
 import heapq
-import random
+import json
+import os
 import typing
+import weakref
+
+import pydantic
+import typing_extensions
 
 __all__ = ["BufferedPaginator", "MergedPaginator", "Paginator"]
 
@@ -27,6 +35,54 @@ async def aiterate(iterable: typing.Iterable[T]) -> typing.AsyncIterator[T]:
         yield i
 
 
+def _dump_json(item: typing.Any) -> str:
+    """Encode an item as json."""
+    if isinstance(item, pydantic.BaseModel):
+        return item.model_dump_json()
+
+    return json.dumps(item, default=str, ensure_ascii=False)
+
+
+async def _export_ndjson(iterable: typing.AsyncIterable[typing.Any], stream: typing.TextIO) -> int:
+    """Write every item as a line of json."""
+    count = 0
+    async for item in iterable:
+        stream.write(_dump_json(item) + "\n")
+        count += 1
+
+    return count
+
+
+async def _export_csv(
+    iterable: typing.AsyncIterable[typing.Any],
+    stream: typing.TextIO,
+    fieldnames: typing.Optional[typing.Sequence[str]] = None,
+) -> int:
+    """Write every item as a csv row.
+
+    The columns are taken from the first item unless given, items with other fields raise a ValueError
+    instead of being silently cut off.
+    """
+    writer: typing.Optional[csv.DictWriter[str]] = None
+
+    count = 0
+    async for item in iterable:
+        row = item.model_dump(mode="json") if isinstance(item, pydantic.BaseModel) else dict(item)
+        row = {
+            key: value if value is None or isinstance(value, (str, int, float)) else json.dumps(value)
+            for key, value in row.items()
+        }
+
+        if writer is None:
+            writer = csv.DictWriter(stream, fieldnames=list(fieldnames or row))
+            writer.writeheader()
+
+        writer.writerow(row)
+        count += 1
+
+    return count
+
+
 class Paginator(typing.Generic[T], abc.ABC):
     """Base paginator."""
 
@@ -90,6 +146,33 @@ class Paginator(typing.Generic[T], abc.ABC):
     def __await__(self) -> typing.Generator[None, None, typing.Sequence[T]]:
         return self.flatten().__await__()
 
+    async def export(
+        self,
+        target: typing.Union[str, os.PathLike[str], typing.TextIO],
+        *,
+        format: typing.Literal["ndjson", "csv"] = "ndjson",
+        fieldnames: typing.Optional[typing.Sequence[str]] = None,
+    ) -> int:
+        """Write items to a file or a text stream as they arrive.
+
+        Models are encoded with pydantic's json encoder. In csv nested fields are encoded as json and
+        the columns are taken from the first item unless `fieldnames` are given.
+        Returns the amount of written items.
+        """
+        with contextlib.ExitStack() as stack:
+            stream: typing.TextIO
+            if isinstance(target, (str, os.PathLike)):
+                stream = stack.enter_context(open(target, "w", encoding="utf-8", newline=""))  # noqa: SIM115
+            else:
+                stream = target
+
+            if format == "ndjson":
+                return await _export_ndjson(self, stream)
+            if format == "csv":
+                return await _export_csv(self, stream, fieldnames)
+
+            raise ValueError(f"Unknown export format: {format!r}")
+
     @abc.abstractmethod
     async def __anext__(self) -> T: ...
 
@@ -115,40 +198,230 @@ class BasicPaginator(typing.Generic[T], Paginator[T], abc.ABC):
             self._complete()
 
 
+async def _prefetch_pages(
+    paginator_ref: weakref.ref[BufferedPaginator[T]],
+    pages: asyncio.Queue[tuple[typing.Optional[typing.Sequence[T]], typing.Optional[Exception]]],
+    capacity: asyncio.Semaphore,
+) -> None:
+    """Fetch pages ahead of the consumer.
+
+    The paginator is only referenced while fetching so an abandoned paginator can be garbage collected.
+    """
+    while True:
+        await capacity.acquire()
+
+        paginator = paginator_ref()
+        if paginator is None:
+            return
+
+        try:
+            page = await paginator.next_page()
+        except Exception as e:
+            pages.put_nowait((None, e))
+            return
+
+        page = list(page) if page else None
+        paginator._fetched += len(page or ())
+        reached_limit = bool(paginator.limit and paginator._fetched >= paginator.limit)
+        del paginator
+
+        pages.put_nowait((page, None))
+        if page is None:
+            return
+
+        if reached_limit:
+            pages.put_nowait((None, None))
+            return
+
+
 class BufferedPaginator(typing.Generic[T], Paginator[T], abc.ABC):
-    """Paginator with a support for buffers."""
+    """Paginator with a support for buffers.
 
-    __slots__ = ("limit", "_buffer", "_counter")
+    With a non-zero prefetch up to that many pages are fetched in the background while the current one is consumed.
+    """
+
+    __slots__ = (
+        "limit",
+        "prefetch",
+        "_buffer",
+        "_counter",
+        "_fetched",
+        "_pages",
+        "_capacity",
+        "_prefetcher",
+        "_cursors",
+        "_page_cursor",
+        "_consumed",
+        "_skip",
+        "__weakref__",
+    )
 
     limit: typing.Optional[int]
     """Limit of items to be yielded."""
 
+    prefetch: int
+    """Amount of pages to fetch ahead of time."""
+
     _buffer: typing.Optional[typing.Iterator[T]]
     """Item buffer. If none then exhausted."""
 
     _counter: int
     """Amount of yielded items so far. No guarantee to be synchronized."""
 
-    def __init__(self, *, limit: typing.Optional[int] = None) -> None:
+    _fetched: int
+    """Amount of prefetched items so far."""
+
+    _pages: typing.Optional[asyncio.Queue[tuple[typing.Optional[typing.Sequence[T]], typing.Optional[Exception]]]]
+    """Prefetched pages or the error raised while fetching them."""
+
+    _capacity: typing.Optional[asyncio.Semaphore]
+    """Amount of pages which may still be prefetched."""
+
+    _prefetcher: typing.Optional[asyncio.Task[None]]
+    """Background task fetching pages."""
+
+    _cursors: collections.deque[typing.Any]
+    """Cursors of the fetched pages which have not been consumed yet."""
+
+    _page_cursor: typing.Any
+    """Cursor of the page currently being consumed. If none then no page has been fetched yet."""
+
+    _consumed: int
+    """Amount of yielded items of the current page."""
+
+    _skip: int
+    """Amount of already yielded items to skip from the next page after resuming."""
+
+    def __init__(self, *, limit: typing.Optional[int] = None, prefetch: int = 0) -> None:
         self.limit = limit
+        self.prefetch = prefetch
 
         self._buffer = iter(())
         self._counter = 0
+        self._fetched = 0
+        self._pages = None
+        self._capacity = None
+        self._prefetcher = None
+
+        self._cursors = collections.deque()
+        self._page_cursor = None
+        self._consumed = 0
+        self._skip = 0
+
+    def __del__(self) -> None:
+        prefetcher = getattr(self, "_prefetcher", None)
+        if prefetcher is not None and not prefetcher.get_loop().is_closed():
+            prefetcher.cancel()
 
     @property
     def exhausted(self) -> bool:
         """Whether all pages have been fetched."""
         return self._buffer is None
 
+    def _stop_prefetching(self) -> None:
+        """Cancel the background fetching of pages."""
+        if self._prefetcher is not None:
+            self._prefetcher.cancel()
+
+        self._prefetcher = None
+        self._pages = None
+        self._capacity = None
+
     def _complete(self) -> typing.NoReturn:
         self._buffer = None
+        self._stop_prefetching()
 
         super()._complete()
         raise  # pyright bug
 
+    async def aclose(self) -> None:
+        """Stop the paginator early and cancel any prefetching."""
+        self._buffer = None
+        self._stop_prefetching()
+
     @abc.abstractmethod
     async def next_page(self) -> typing.Optional[typing.Iterable[T]]:
-        """Get the next page of the paginator."""
+        """Get the next page of the paginator.
+
+        Paginators which support checkpoints append the cursor of every fetched page to `_cursors`.
+        """
+
+    def _get_cursor(self) -> typing.Any:
+        """Get the cursor of the next page to be fetched."""
+        raise TypeError(f"{self.__class__.__name__} does not support checkpoints.")
+
+    def _set_cursor(self, cursor: typing.Any) -> None:
+        """Set the cursor of the next page to be fetched."""
+        raise TypeError(f"{self.__class__.__name__} does not support checkpoints.")
+
+    def state(self) -> dict[str, typing.Any]:
+        """Get a json-serializable snapshot of the paginator's progress.
+
+        The snapshot only covers the yielded items, pages fetched ahead of time are fetched again after resuming.
+        """
+        if self._buffer is None:
+            return {"exhausted": True, "counter": self._counter}
+
+        if self._page_cursor is None:
+            cursor, consumed = self._get_cursor(), self._skip
+        else:
+            cursor, consumed = self._page_cursor, self._consumed
+
+        return {"exhausted": False, "counter": self._counter, "cursor": cursor, "skip": consumed}
+
+    def resume(self, state: typing.Mapping[str, typing.Any]) -> typing_extensions.Self:
+        """Continue from a snapshot created with `state`."""
+        self._stop_prefetching()
+        self._cursors.clear()
+        self._page_cursor = None
+        self._consumed = 0
+        self._counter = state["counter"]
+
+        if state["exhausted"]:
+            self._buffer = None
+            return self
+
+        self._buffer = iter(())
+        self._skip = state["skip"]
+        self._set_cursor(state["cursor"])
+
+        return self
+
+    async def _next_prefetched_page(self) -> typing.Optional[typing.Iterable[T]]:
+        """Get the next page from the background task."""
+        if self._pages is None or self._capacity is None:
+            # the item currently being requested has not been fetched yet
+            self._fetched = self._counter - 1
+            self._pages = asyncio.Queue()
+            self._capacity = asyncio.Semaphore(self.prefetch)
+            self._prefetcher = asyncio.create_task(_prefetch_pages(weakref.ref(self), self._pages, self._capacity))
+
+        page, error = await self._pages.get()
+        self._capacity.release()
+        if error is not None:
+            # allow retrying from the failed page
+            self._stop_prefetching()
+            raise error
+
+        return page
+
+    async def _next_buffer(self) -> typing.Optional[typing.Sequence[T]]:
+        """Get the items of the next page which have not been yielded yet."""
+        while True:
+            if self.prefetch > 0:
+                page = await self._next_prefetched_page()
+            else:
+                page = await self.next_page()
+
+            if not page:
+                return None
+
+            self._page_cursor = self._cursors.popleft() if self._cursors else None
+            self._consumed, self._skip = self._skip, 0
+
+            buffer = list(page)[self._consumed :]
+            if buffer:
+                return buffer
 
     async def __anext__(self) -> T:
         if not self._buffer:
@@ -160,24 +433,48 @@ class BufferedPaginator(typing.Generic[T], Paginator[T], abc.ABC):
         self._counter += 1
 
         try:
-            return next(self._buffer)
+            item = next(self._buffer)
         except StopIteration:
-            pass
+            try:
+                buffer = await self._next_buffer()
+            except BaseException:
+                # nothing was yielded
+                self._counter -= 1
+                raise
 
-        buffer = await self.next_page()
-        if not buffer:
-            self._complete()
+            if not buffer:
+                self._complete()
 
-        self._buffer = iter(buffer)
-        return next(self._buffer)
+            self._buffer = iter(buffer)
+            item = next(self._buffer)
+
+        self._consumed += 1
+        return item
+
+
+class HeapEntry(typing.NamedTuple):
+    """Entry of the heap queue of a merged paginator."""
+
+    key: typing.Any
+    """Comparable sorting key."""
+
+    order: int
+    """Index of the iterator, breaks ties between equal keys."""
+
+    value: typing.Any
+    """Yielded value."""
+
+    iterator: typing.AsyncIterator[typing.Any]
+    """Iterator the value comes from."""
 
 
 class MergedPaginator(typing.Generic[T], Paginator[T]):
-    """A paginator merging a collection of iterators."""
+    """A paginator merging a collection of iterators.
 
-    __slots__ = ("iterators", "_heap", "limit", "_key", "_prepared", "_counter")
+    Items are merged lazily, so only the pages needed for the yielded items are fetched.
+    """
 
-    # TODO: Use named tuples for the heap
+    __slots__ = ("iterators", "_heap", "limit", "concurrency", "_key", "_prepared", "_counter")
 
     iterators: typing.Sequence[typing.AsyncIterator[T]]
     """Entry iterators.
@@ -185,15 +482,15 @@ class MergedPaginator(typing.Generic[T], Paginator[T]):
     Only used as pointers to a heap.
     """
 
-    _heap: list[tuple[typing.Any, int, T, typing.AsyncIterator[T]]]
-    """Underlying heap queue.
-
-    List of (comparable, unique order id, value, iterator)
-    """
+    _heap: list[HeapEntry]
+    """Underlying heap queue."""
 
     limit: typing.Optional[int]
     """Limit of items to be yielded"""
 
+    concurrency: typing.Optional[int]
+    """Amount of iterators which may fetch at once. If none then unbounded."""
+
     _key: typing.Optional[typing.Callable[[T], typing.Any]]
     """Sorting key."""
 
@@ -209,11 +506,14 @@ class MergedPaginator(typing.Generic[T], Paginator[T]):
         *,
         key: typing.Optional[typing.Callable[[T], typing.Any]] = None,
         limit: typing.Optional[int] = None,
+        concurrency: typing.Optional[int] = None,
     ) -> None:
         self.iterators = [iterable.__aiter__() for iterable in iterables]
         self._key = key
         self.limit = limit
+        self.concurrency = concurrency
 
+        self._heap = []
         self._prepared = False
         self._counter = 0
 
@@ -226,23 +526,59 @@ class MergedPaginator(typing.Generic[T], Paginator[T]):
         super()._complete()
         raise  # pyright bug
 
-    def _create_heap_item(
-        self,
-        value: T,
-        iterator: typing.AsyncIterator[T],
-        order: typing.Optional[int] = None,
-    ) -> tuple[typing.Any, int, T, typing.AsyncIterator[T]]:
-        """Create a new item for the heap queue."""
-        sort_value = self._key(value) if self._key else value
-        if order is None:
-            order = random.getrandbits(16)
+    def _create_heap_entry(self, value: T, iterator: typing.AsyncIterator[T], order: int) -> HeapEntry:
+        """Create a new entry for the heap queue."""
+        return HeapEntry(self._key(value) if self._key else value, order, value, iterator)
 
-        return (sort_value, order, value, iterator)
+    async def _gather(self, coros: typing.Iterable[typing.Awaitable[typing.Any]]) -> list[typing.Any]:
+        """Await coroutines of the iterators with a bounded concurrency, exceptions are returned."""
+        if self.concurrency is None:
+            return await asyncio.gather(*coros, return_exceptions=True)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(coro: typing.Awaitable[typing.Any]) -> typing.Any:
+            async with semaphore:
+                return await coro
+
+        return await asyncio.gather(*(bounded(coro) for coro in coros), return_exceptions=True)
+
+    def state(self) -> dict[str, typing.Any]:
+        """Get a json-serializable snapshot of the paginator's progress.
+
+        Every iterator must be a paginator supporting checkpoints. Items waiting in the heap are yielded again
+        by their iterators after resuming.
+        """
+        heads = {id(entry.iterator) for entry in self._heap}
+
+        states: list[dict[str, typing.Any]] = []
+        for iterator in self.iterators:
+            if not isinstance(iterator, BufferedPaginator):
+                raise TypeError(f"{iterator.__class__.__name__} does not support checkpoints.")
+
+            state = iterator.state()
+            if id(iterator) in heads:
+                state["counter"] -= 1
+                state["skip"] -= 1
+
+            states.append(state)
+
+        return {"counter": self._counter, "iterators": states}
+
+    def resume(self, state: typing.Mapping[str, typing.Any]) -> typing_extensions.Self:
+        """Continue from a snapshot created with `state`."""
+        for iterator, iterator_state in zip(self.iterators, state["iterators"]):
+            typing.cast("BufferedPaginator[T]", iterator).resume(iterator_state)
+
+        self._counter = state["counter"]
+        self._prepared = False
+        self._heap = []
+
+        return self
 
     async def _prepare(self) -> None:
         """Prepare the heap queue by filling it with initial values."""
-        coros = (it.__anext__() for it in self.iterators)
-        first_values = await asyncio.gather(*coros, return_exceptions=True)
+        first_values = await self._gather(it.__anext__() for it in self.iterators)
 
         self._heap = []
         for order, (it, value) in enumerate(zip(self.iterators, first_values)):
@@ -252,7 +588,7 @@ class MergedPaginator(typing.Generic[T], Paginator[T]):
 
                 raise value
 
-            heapq.heappush(self._heap, self._create_heap_item(value, iterator=it, order=order))
+            heapq.heappush(self._heap, self._create_heap_entry(value, it, order))
 
         self._prepared = True
 
@@ -266,26 +602,42 @@ class MergedPaginator(typing.Generic[T], Paginator[T]):
         if self.limit and self._counter >= self.limit:
             self._complete()
 
-        self._counter += 1
-
-        _, order, value, it = self._heap[0]
+        entry = self._heap[0]
+        if self.limit and self._counter + 1 >= self.limit:
+            # don't fetch a page which is never going to be used
+            heapq.heappop(self._heap)
+            self._counter += 1
+            return entry.value
 
         try:
-            new_value = await it.__anext__()
+            new_value = await entry.iterator.__anext__()
         except StopAsyncIteration:
             heapq.heappop(self._heap)
-            return value
+            self._counter += 1
+            return entry.value
 
-        heapq.heapreplace(self._heap, self._create_heap_item(new_value, iterator=it, order=order))
+        self._counter += 1
+
+        heapq.heapreplace(self._heap, self._create_heap_entry(new_value, entry.iterator, entry.order))
 
-        return value
+        return entry.value
 
     async def flatten(self, *, lazy: bool = False) -> typing.Sequence[T]:
-        """Flatten the paginator."""
-        if self.limit is not None and lazy:
+        """Flatten the paginator.
+
+        With a limit the items are merged lazily, otherwise every iterator is flattened at once.
+        `lazy` is kept for backwards compatibility.
+        """
+        if self.limit is not None or self._prepared:
             return [item async for item in self]
 
-        coros = (flatten(i) for i in self.iterators)
-        lists: typing.Sequence[typing.Sequence[T]] = await asyncio.gather(*coros)  # pyright: ignore
+        lists = await self._gather(flatten(i) for i in self.iterators)
+        for value in lists:
+            if isinstance(value, BaseException):
+                raise value
+
+        self._prepared = True
+        self._counter = sum(len(value) for value in lists)
+        self._heap = []
 
-        return list(heapq.merge(*lists, key=self._key))[: self.limit]  # pyright: ignore
+        return list(heapq.merge(*lists, key=self._key))  # pyright: ignore
@@ -1,9 +1,20 @@
 """Utilities for genshin.py."""
 
-from .auth import *
-from .concurrency import *
-from .ds import *
-from .extdb import *
-from .fs import *
-from .logfile import *
-from .uid import *
+import typing as _typing
+
+from . import lazy as _lazy
+
+if _typing.TYPE_CHECKING:
+    from .auth import *
+    from .concurrency import *
+    from .ds import *
+    from .extdb import *
+    from .fs import *
+    from .gacha import *
+    from .logfile import *
+    from .uid import *
+
+__getattr__, __dir__ = _lazy.lazy_import(
+    __name__,
+    exports=("auth", "concurrency", "ds", "extdb", "fs", "gacha", "logfile", "uid"),
+)
@@ -4,9 +4,12 @@ from __future__ import annotations
 
 import asyncio
 import functools
+import logging
 import typing
 
-__all__ = ["prevent_concurrency"]
+__all__ = ["SingleFlight", "prevent_concurrency"]
+
+_LOGGER = logging.getLogger(__name__)
 
 T = typing.TypeVar("T")
 AnyCallable = typing.Callable[..., typing.Any]
@@ -64,3 +67,90 @@ class MethodDecorator:
         func = self.decorator(self.method).__get__(instance, type(instance))  # type: ignore # mypy doesn't understand methods
         setattr(instance, self.name, func)
         return func
+
+
+class _Flight:
+    """A call in flight and the amount of callers waiting for it."""
+
+    __slots__ = ("task", "waiters")
+
+    task: asyncio.Future[typing.Any]
+    waiters: int
+
+    def __init__(self, task: asyncio.Future[typing.Any]) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Share a single in-flight call between identical concurrent calls.
+
+    The call runs in its own task, a cancelled caller only stops waiting for it.
+    The call itself is cancelled once no callers are waiting for it anymore.
+    """
+
+    calls: int
+    """Amount of calls made through the single flight."""
+
+    coalesced: int
+    """Amount of calls which reused an already in-flight call."""
+
+    _in_flight: dict[typing.Hashable, _Flight]
+    _background: set[asyncio.Task[typing.Any]]
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight = {}
+        self._background = set()
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        return key in self._in_flight
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} calls={self.calls} coalesced={self.coalesced} in_flight={self.in_flight}>"
+
+    @property
+    def in_flight(self) -> int:
+        """Amount of calls currently in flight."""
+        return len(self._in_flight)
+
+    def _discard(self, key: typing.Hashable, flight: _Flight) -> None:
+        if self._in_flight.get(key) is flight:
+            del self._in_flight[key]
+
+    async def run(self, key: typing.Hashable, func: typing.Callable[[], typing.Awaitable[T]]) -> T:
+        """Run a function unless an identical call is already in flight, in which case share its result."""
+        self.calls += 1
+
+        flight = self._in_flight.get(key)
+        if flight is None:
+            flight = self._in_flight[key] = _Flight(asyncio.ensure_future(func()))
+            flight.task.add_done_callback(lambda _: self._discard(key, flight))
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # every caller was cancelled, nobody is interested in the result anymore
+                self._discard(key, flight)
+                flight.task.cancel()
+
+    def run_in_background(self, key: typing.Hashable, func: typing.Callable[[], typing.Awaitable[typing.Any]]) -> None:
+        """Run a function in the background unless an identical call is already in flight."""
+        if key in self._in_flight:
+            return
+
+        async def runner() -> None:
+            try:
+                await self.run(key, func)
+            except Exception:
+                _LOGGER.debug("Background call %r failed", key, exc_info=True)
+
+        task = asyncio.create_task(runner())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
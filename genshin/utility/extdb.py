@@ -3,6 +3,9 @@
 import asyncio
 import json
 import logging
+import os
+import pathlib
+import tempfile
 import time
 import typing
 import warnings
@@ -12,9 +15,10 @@ import aiohttp
 
 from genshin.constants import LANGS
 from genshin.models.genshin import constants as model_constants
-from genshin.utility import fs
+from genshin.utility import concurrency, fs
 
 __all__ = (
+    "CharacterDatabase",
     "update_characters_ambr",
     "update_characters_any",
     "update_characters_enka",
@@ -23,18 +27,58 @@ __all__ = (
 
 LOGGER_ = logging.getLogger(__name__)
 
-CACHE_FILE = fs.get_tempdir() / "characters.json"
+CACHE_DIR = fs.get_tempdir() / "characters"
+CACHE_TTL = 24 * 60 * 60  # how long cached names are trusted before the version of their source is checked
+
+_cache_versions: dict[str, typing.Optional[str]] = {}
+
+
+def _get_cache_file(lang: str) -> pathlib.Path:
+    return CACHE_DIR / f"{lang}.json"
+
+
+def _load_cache(lang: str) -> None:
+    """Load the character names of a language cached by a previous update.
+
+    Every language is cached in its own file and only read the first time it's used.
+    """
+    if lang in _cache_versions:
+        return
+
+    _cache_versions[lang] = None
+    file = _get_cache_file(lang)
+    if not file.exists():
+        return
 
-if CACHE_FILE.exists() and time.time() - CACHE_FILE.stat().st_mtime < 7 * 24 * 60 * 60:
-    names: typing.Mapping[str, typing.Any] = json.loads(CACHE_FILE.read_text())
     try:
-        model_constants.CHARACTER_NAMES = {
-            lang: {int(char_id): model_constants.DBChar(*char) for char_id, char in chars.items()}
-            for lang, chars in names.items()
-        }
+        data: typing.Mapping[str, typing.Any] = json.loads(file.read_text(encoding="utf-8"))
+        cached = {int(char_id): model_constants.DBChar(*char) for char_id, char in data["characters"].items()}
     except Exception:
-        warnings.warn("Failed to load character names from cache")
-        CACHE_FILE.unlink()
+        warnings.warn(f"Failed to load {lang} character names from cache")
+        file.unlink(missing_ok=True)
+        return
+
+    _cache_versions[lang] = data.get("version")
+    model_constants.CHARACTER_NAMES[lang] = {**cached, **model_constants.CHARACTER_NAMES.get(lang, {})}
+
+
+def _save_cache(langs: typing.Iterable[str], version: typing.Optional[str] = None) -> None:
+    """Atomically write the character names of the updated languages."""
+    CACHE_DIR.mkdir(exist_ok=True, parents=True)
+
+    for lang in langs:
+        data = {"version": version, "characters": model_constants.CHARACTER_NAMES.get(lang, {})}
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=CACHE_DIR, suffix=".tmp", delete=False) as file:
+            json.dump(data, file, ensure_ascii=False)
+
+        os.replace(file.name, _get_cache_file(lang))
+        _cache_versions[lang] = version
+
+
+def _is_cache_stale(lang: str) -> bool:
+    file = _get_cache_file(lang)
+    return file.exists() and time.time() - file.stat().st_mtime >= CACHE_TTL
+
 
 GENSHINDATA_REPO = parse_token("aHR0cHM6Ly9naXRsYWIuY29tL0RpbWJyZWF0aC9BbmltZUdhbWVEYXRhLy0vcmF3L21hc3Rlci8=").decode()
 GENSHINDATA_CHARACTERS_URL = GENSHINDATA_REPO + "ExcelBinOutput/AvatarExcelConfigData.json"
@@ -121,8 +165,8 @@ def update_character_name(
     rarity: int,
 ) -> None:
     """Update the character names for a specific language."""
-    char = model_constants.DBChar(id, icon_name, name, element, rarity)
-    model_constants.CHARACTER_NAMES.setdefault(lang, {})[id] = char
+    _load_cache(lang)
+    model_constants.set_character(lang, model_constants.DBChar(id, icon_name, name, element, rarity))
 
 
 async def update_characters_genshindata(langs: typing.Sequence[str] = ()) -> None:
@@ -164,12 +208,13 @@ async def update_characters_genshindata(langs: typing.Sequence[str] = ()) -> Non
                 rarity=RARITY_MAP[char["qualityType"]],
             )
 
-    CACHE_FILE.write_text(json.dumps(model_constants.CHARACTER_NAMES))
+    _save_cache(langs)
 
 
 async def update_characters_enka(langs: typing.Sequence[str] = ()) -> None:
     """Update characters with https://github.com/EnkaNetwork/API-docs/."""
     characters, locs = await _fetch_jsons(ENKA_CHARACTERS_URL, ENKA_LOC_URL)
+    updated: set[str] = set()
 
     for strid, char in characters.items():
         if "-" in strid or not char:
@@ -178,6 +223,7 @@ async def update_characters_enka(langs: typing.Sequence[str] = ()) -> None:
         for short_lang, loc in locs.items():
             if (lang := ENKA_LANG_MAP.get(short_lang)) is None:
                 continue
+            updated.add(lang)
             update_character_name(
                 lang=lang,
                 id=int(strid),
@@ -187,12 +233,41 @@ async def update_characters_enka(langs: typing.Sequence[str] = ()) -> None:
                 rarity=RARITY_MAP[char["QualityType"]],
             )
 
-    CACHE_FILE.write_text(json.dumps(model_constants.CHARACTER_NAMES))
+    _save_cache(updated)
+
+
+async def _fetch_ambr_version() -> str:
+    return (await _fetch_jsons(AMBR_VERSION_URL))[0]["data"]["vh"]
+
+
+async def _revalidate_cache(langs: typing.Sequence[str]) -> typing.Sequence[str]:
+    """Return the languages whose cached character names are outdated.
+
+    Languages cached from ambr are kept when their version marker matches the current one.
+    """
+    stale = [lang for lang in langs if not model_constants.CHARACTER_NAMES.get(lang) or _is_cache_stale(lang)]
+    if not any(_cache_versions.get(lang) for lang in stale):
+        return stale
+
+    try:
+        version = await _fetch_ambr_version()
+    except Exception:
+        LOGGER_.exception("Failed to fetch the ambr version")
+        return stale
+
+    outdated: list[str] = []
+    for lang in stale:
+        if model_constants.CHARACTER_NAMES.get(lang) and _cache_versions.get(lang) == version:
+            _get_cache_file(lang).touch()
+        else:
+            outdated.append(lang)
+
+    return outdated
 
 
 async def update_characters_ambr(langs: typing.Sequence[str] = ()) -> None:
     """Update characters with https://ambr.top/."""
-    version = (await _fetch_jsons(AMBR_VERSION_URL))[0]["data"]["vh"]
+    version = await _fetch_ambr_version()
     langs = langs or list(LANGS.keys())
     urls = [AMBR_URL.format(lang=LANG_MAP[lang]) + f"?vh={version}" for lang in langs]
 
@@ -212,7 +287,7 @@ async def update_characters_ambr(langs: typing.Sequence[str] = ()) -> None:
                 rarity=char["rank"],
             )
 
-    CACHE_FILE.write_text(json.dumps(model_constants.CHARACTER_NAMES))
+    _save_cache(langs, version)
 
 
 async def update_characters_any(
@@ -222,14 +297,17 @@ async def update_characters_any(
 ) -> None:
     """Update characters with the most efficient resource.
 
-    Will not re-request data if lenient is True.
+    Will not re-request data if lenient is True, unless the cached data may be outdated.
     """
     if not langs:
         langs = list(LANGS.keys())
     if isinstance(langs, str):
         langs = [langs]
     if lenient:
-        langs = [lang for lang in langs if not model_constants.CHARACTER_NAMES.get(lang)]
+        for lang in langs:
+            _load_cache(lang)
+
+        langs = await _revalidate_cache(langs)
         if len(langs) == 0:
             return
 
@@ -249,3 +327,79 @@ async def update_characters_any(
             return
 
     raise Exception("Failed to update characters, all functions raised an error.")
+
+
+class CharacterDatabase:
+    """Process-wide manager keeping the character names of every language up to date.
+
+    Updates are shared between concurrent callers so an empty database is only downloaded once,
+    after that a language is considered ready and only refreshed in the background.
+    """
+
+    ttl: float
+    """Amount of seconds after which a ready language is refreshed."""
+
+    retry_after: float
+    """Amount of seconds to wait before retrying a failed update."""
+
+    _ready: dict[str, float]
+    _failed: dict[str, float]
+    _flight: concurrency.SingleFlight
+
+    def __init__(self, *, ttl: float = CACHE_TTL, retry_after: float = 5 * 60) -> None:
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._ready = {}
+        self._failed = {}
+        self._flight = concurrency.SingleFlight()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} ready={sorted(self._ready)} flight={self._flight!r}>"
+
+    def is_ready(self, lang: str) -> bool:
+        """Whether the character names of a language are up to date."""
+        return time.monotonic() < self._ready.get(lang, 0)
+
+    async def update(self, lang: str) -> None:
+        """Update the character names of a language, concurrent calls share a single update."""
+        await self._flight.run(lang, lambda: self._update(lang))
+
+    async def _update(self, lang: str) -> None:
+        try:
+            await update_characters_any(lang, lenient=True)
+        except Exception:
+            self._failed[lang] = time.monotonic()
+            raise
+
+        self._ready[lang] = time.monotonic() + self.ttl
+        self._failed.pop(lang, None)
+
+    def warm_up(self, lang: str) -> typing.Optional[asyncio.Future[None]]:
+        """Start updating the character names of a language unless they are ready.
+
+        Returns a future only when no names are available yet and callers should wait for it.
+        """
+        if self.is_ready(lang) or time.monotonic() - self._failed.get(lang, -self.retry_after) < self.retry_after:
+            return None
+
+        _load_cache(lang)
+        if model_constants.CHARACTER_NAMES.get(lang):
+            self._flight.run_in_background(lang, lambda: self._update(lang))
+            return None
+
+        future = asyncio.ensure_future(self.update(lang))
+        future.add_done_callback(lambda future: self._on_warm_up_done(lang, future))
+        return future
+
+    def _on_warm_up_done(self, lang: str, future: asyncio.Future[None]) -> None:
+        """Consume the failure of a warm-up even if its caller never awaited it."""
+        if future.cancelled() or future.exception() is None:
+            return
+
+        # no names are available at all, so the next call retries instead of waiting for retry_after
+        self._failed.pop(lang, None)
+        LOGGER_.debug("Failed to warm up characters for %s", lang, exc_info=future.exception())
+
+
+CHARACTER_DB = CharacterDatabase()
+"""Character database shared by all clients."""
@@ -0,0 +1,340 @@
+"""Pity and luck statistics of gacha histories."""
+
+import bisect
+import collections
+import importlib.util
+import typing
+
+from genshin import types
+from genshin.models.genshin import gacha as models
+
+__all__ = ["BannerStats", "GachaColumns", "analyze_gacha", "get_luck_percentiles"]
+
+# banners which share their pity with another banner
+SHARED_PITY: typing.Mapping[types.Game, typing.Mapping[int, int]] = {
+    types.Game.GENSHIN: {
+        models.GenshinBannerType.CHARACTER2: models.GenshinBannerType.CHARACTER1,
+        models.MWBannerType.EVENT_MALE_OUTFIT2: models.MWBannerType.EVENT_MALE_OUTFIT1,
+        models.MWBannerType.EVENT_FEMALE_OUTFIT2: models.MWBannerType.EVENT_FEMALE_OUTFIT1,
+    },
+    types.Game.STARRAIL: {},
+    types.Game.ZZZ: {
+        models.ZZZBannerType.EXCLUSIVE_RESCREENING: models.ZZZBannerType.CHARACTER,
+        models.ZZZBannerType.REVERBERATION: models.ZZZBannerType.WEAPON,
+    },
+}
+# banners with featured items, pulls on these may win or lose a 50/50
+RATE_UP_BANNERS: typing.Mapping[types.Game, typing.AbstractSet[int]] = {
+    types.Game.GENSHIN: {
+        models.GenshinBannerType.CHARACTER,
+        models.GenshinBannerType.WEAPON,
+        models.MWBannerType.EVENT,
+        models.MWBannerType.EVENT_MALE_OUTFIT1,
+        models.MWBannerType.EVENT_FEMALE_OUTFIT1,
+    },
+    types.Game.STARRAIL: {
+        models.StarRailBannerType.CHARACTER,
+        models.StarRailBannerType.WEAPON,
+        models.StarRailBannerType.FATE_CHARACTER,
+        models.StarRailBannerType.FATE_WEAPON,
+    },
+    types.Game.ZZZ: {models.ZZZBannerType.CHARACTER, models.ZZZBannerType.WEAPON},
+}
+HARD_PITY: typing.Mapping[types.Game, typing.Mapping[int, int]] = {
+    types.Game.GENSHIN: {
+        models.GenshinBannerType.NOVICE: 90,
+        models.GenshinBannerType.STANDARD: 90,
+        models.GenshinBannerType.CHARACTER: 90,
+        models.GenshinBannerType.WEAPON: 80,
+        models.GenshinBannerType.CHRONICLED: 90,
+    },
+    types.Game.STARRAIL: {
+        models.StarRailBannerType.STANDARD: 90,
+        models.StarRailBannerType.NOVICE: 50,
+        models.StarRailBannerType.CHARACTER: 90,
+        models.StarRailBannerType.WEAPON: 80,
+        models.StarRailBannerType.FATE_CHARACTER: 90,
+        models.StarRailBannerType.FATE_WEAPON: 80,
+    },
+    types.Game.ZZZ: {
+        models.ZZZBannerType.STANDARD: 90,
+        models.ZZZBannerType.CHARACTER: 90,
+        models.ZZZBannerType.WEAPON: 80,
+        models.ZZZBannerType.BANGBOO: 80,
+    },
+}
+# rarity of the rarest items, zzz S-rank items have a rarity of 4
+TOP_RARITY: typing.Mapping[types.Game, int] = {
+    types.Game.GENSHIN: 5,
+    types.Game.STARRAIL: 5,
+    types.Game.ZZZ: 4,
+}
+# english names of the rarest standard items, pulling these on a rate-up banner loses the 50/50
+STANDARD_ITEMS: typing.Mapping[types.Game, typing.AbstractSet[str]] = {
+    types.Game.GENSHIN: {
+        "Diluc", "Jean", "Keqing", "Mona", "Qiqi", "Tighnari", "Dehya", "Yumemizuki Mizuki",
+        "Amos' Bow", "Aquila Favonia", "Lost Prayer to the Sacred Winds", "Primordial Jade Winged-Spear",
+        "Skyward Atlas", "Skyward Blade", "Skyward Harp", "Skyward Pride", "Skyward Spine", "Wolf's Gravestone",
+    },  # fmt: skip
+    types.Game.STARRAIL: {
+        "Bailu", "Bronya", "Clara", "Gepard", "Himeko", "Welt", "Yanqing",
+        "But the Battle Isn't Over", "In the Name of the World", "Moment of Victory", "Night on the Milky Way",
+        "Something Irreplaceable", "Sleep Like the Dead", "Time Waits for No One",
+    },  # fmt: skip
+    types.Game.ZZZ: {
+        "Grace", "Koleda", "Lycaon", "Nekomata", "Rina", "Soldier 11",
+        "Fusion Compiler", "Hellfire Gears", "Steel Cushion", "Steam Oven", "The Restrained", "Weeping Cradle",
+    },  # fmt: skip
+}
+
+GAMES: typing.Mapping[type, types.Game] = {
+    models.Wish: types.Game.GENSHIN,
+    models.MWWish: types.Game.GENSHIN,
+    models.Warp: types.Game.STARRAIL,
+    models.SignalSearch: types.Game.ZZZ,
+}
+
+
+class GachaColumns(typing.NamedTuple):
+    """Gacha histories of any amount of users stored as columns.
+
+    Every column may be a sequence or a numpy array, all columns must have the same length.
+    Ids are expected to increase with time.
+    """
+
+    game: types.Game
+    uids: typing.Sequence[int]
+    ids: typing.Sequence[int]
+    rarities: typing.Sequence[int]
+    banner_types: typing.Sequence[int]
+    featured: typing.Optional[typing.Sequence[bool]] = None
+    """Whether the items were featured on their banner. Required to calculate 50/50 win rates."""
+
+    @classmethod
+    def from_wishes(
+        cls,
+        wishes: typing.Sequence[models.BaseWish],
+        *,
+        standard: typing.Optional[typing.AbstractSet[str]] = None,
+    ) -> "GachaColumns":
+        """Create columns from wishes, warps or signal searches of a single game.
+
+        Items are featured unless their name is in `standard`, which defaults to the english names
+        of standard items. Miliastra Wonderland wishes are featured if they have a rate-up.
+        """
+        game = GAMES[type(wishes[0])] if wishes else types.Game.GENSHIN
+        standard = STANDARD_ITEMS[game] if standard is None else standard
+
+        return cls(
+            game=game,
+            uids=[wish.uid for wish in wishes],
+            ids=[wish.id for wish in wishes],
+            rarities=[wish.rarity for wish in wishes],
+            banner_types=[int(getattr(wish, "banner_type")) for wish in wishes],
+            featured=[getattr(wish, "is_up", wish.name not in standard) for wish in wishes],
+        )
+
+
+class BannerStats(typing.NamedTuple):
+    """Statistics of a single banner of a user.
+
+    Banners which share their pity are counted as the same banner.
+    """
+
+    uid: int
+    banner_type: int
+    pulls: int
+    """Total amount of pulls."""
+    top_rarity: int
+    """Amount of pulled items of the highest rarity."""
+    pity: int
+    """Amount of pulls since the last item of the highest rarity."""
+    hard_pity: typing.Optional[int]
+    """Amount of pulls which guarantee an item of the highest rarity, if known."""
+    average_pity: typing.Optional[float]
+    """Average amount of pulls needed for an item of the highest rarity."""
+    won_50_50: int
+    lost_50_50: int
+
+    @property
+    def remaining(self) -> typing.Optional[int]:
+        """Amount of pulls left until hard pity."""
+        return None if self.hard_pity is None else self.hard_pity - self.pity
+
+    @property
+    def win_rate(self) -> typing.Optional[float]:
+        """Rate of won 50/50s."""
+        total = self.won_50_50 + self.lost_50_50
+        return self.won_50_50 / total if total else None
+
+
+def _create_stats(
+    game: types.Game,
+    uid: int,
+    banner_type: int,
+    pulls: int,
+    top_rarity: int,
+    pity_sum: int,
+    pity: int,
+    won: int,
+    lost: int,
+) -> BannerStats:
+    """Create stats from the accumulated values."""
+    return BannerStats(
+        uid=uid,
+        banner_type=banner_type,
+        pulls=pulls,
+        top_rarity=top_rarity,
+        pity=pity,
+        hard_pity=HARD_PITY[game].get(banner_type),
+        average_pity=pity_sum / top_rarity if top_rarity else None,
+        won_50_50=won,
+        lost_50_50=lost,
+    )
+
+
+def _analyze_python(columns: GachaColumns) -> list[BannerStats]:
+    """Calculate the stats item by item."""
+    shared, rate_up, rarest = SHARED_PITY[columns.game], RATE_UP_BANNERS[columns.game], TOP_RARITY[columns.game]
+    featured = columns.featured
+
+    groups: dict[tuple[int, int], list[tuple[int, int]]] = collections.defaultdict(list)
+    for index, (uid, banner_type) in enumerate(zip(columns.uids, columns.banner_types)):
+        groups[int(uid), shared.get(int(banner_type), int(banner_type))].append((int(columns.ids[index]), index))
+
+    stats: list[BannerStats] = []
+    for (uid, banner_type), rows in sorted(groups.items()):
+        rows.sort()
+        top_rarity = pity_sum = pity = won = lost = 0
+        guaranteed = False
+
+        for _, index in rows:
+            pity += 1
+            if columns.rarities[index] < rarest:
+                continue
+
+            top_rarity += 1
+            pity_sum += pity
+            pity = 0
+
+            if featured is None or banner_type not in rate_up:
+                continue
+
+            if not featured[index]:
+                lost += 1
+                guaranteed = True
+            elif guaranteed:
+                guaranteed = False
+            else:
+                won += 1
+
+        stats.append(_create_stats(columns.game, uid, banner_type, len(rows), top_rarity, pity_sum, pity, won, lost))
+
+    return stats
+
+
+def _analyze_numpy(columns: GachaColumns) -> list[BannerStats]:
+    """Calculate the stats in vectorized passes over the whole columns."""
+    import numpy
+
+    shared, rate_up, rarest = SHARED_PITY[columns.game], RATE_UP_BANNERS[columns.game], TOP_RARITY[columns.game]
+
+    banner_types = numpy.asarray(columns.banner_types, dtype=numpy.int64)
+    for banner_type, into in shared.items():
+        banner_types = numpy.where(banner_types == banner_type, into, banner_types)
+
+    uids = numpy.asarray(columns.uids, dtype=numpy.int64)
+    order = numpy.lexsort((numpy.asarray(columns.ids, dtype=numpy.int64), banner_types, uids))
+    uids, banner_types = uids[order], banner_types[order]
+    is_top = numpy.asarray(columns.rarities)[order] >= rarest
+
+    # every group is a banner of a single user
+    size = len(order)
+    new_group = numpy.ones(size, dtype=bool)
+    new_group[1:] = (uids[1:] != uids[:-1]) | (banner_types[1:] != banner_types[:-1])
+    starts = numpy.flatnonzero(new_group)
+    groups = numpy.cumsum(new_group) - 1
+    ends = numpy.append(starts[1:], size)
+
+    # pulls needed for every top rarity item
+    top = numpy.flatnonzero(is_top)
+    top_groups = groups[top]
+    same_group = numpy.zeros(len(top), dtype=bool)
+    same_group[1:] = top_groups[1:] == top_groups[:-1]
+    previous = numpy.where(same_group, numpy.append(-1, top[:-1]), starts[top_groups] - 1)
+    pities = top - previous
+
+    count = len(starts)
+    top_rarity = numpy.bincount(top_groups, minlength=count)
+    pity_sum = numpy.bincount(top_groups, weights=pities, minlength=count)
+    last = numpy.full(count, -1)
+    last[top_groups] = top  # top is sorted so the last write wins
+    pity = ends - 1 - numpy.where(last >= 0, last, starts - 1)
+
+    won = lost = numpy.zeros(count, dtype=numpy.int64)
+    if columns.featured is not None:
+        featured = numpy.asarray(columns.featured, dtype=bool)[order][top]
+        # a top rarity item after a lost 50/50 is guaranteed to be featured
+        guaranteed = numpy.zeros(len(top), dtype=bool)
+        guaranteed[1:] = same_group[1:] & ~featured[:-1]
+        eligible = numpy.isin(banner_types[top], list(rate_up))
+
+        won = numpy.bincount(top_groups, weights=eligible & featured & ~guaranteed, minlength=count)
+        lost = numpy.bincount(top_groups, weights=eligible & ~featured, minlength=count)
+
+    return [
+        _create_stats(columns.game, *values)
+        for values in zip(
+            uids[starts].tolist(),
+            banner_types[starts].tolist(),
+            (ends - starts).tolist(),
+            top_rarity.tolist(),
+            pity_sum.astype(numpy.int64).tolist(),
+            pity.tolist(),
+            numpy.asarray(won, dtype=numpy.int64).tolist(),
+            numpy.asarray(lost, dtype=numpy.int64).tolist(),
+        )
+    ]
+
+
+def analyze_gacha(columns: GachaColumns, *, use_numpy: typing.Optional[bool] = None) -> typing.Sequence[BannerStats]:
+    """Calculate the pity and 50/50 stats of every banner of every user.
+
+    Numpy is used if it's installed unless `use_numpy` is set.
+    """
+    if use_numpy is None:
+        use_numpy = importlib.util.find_spec("numpy") is not None
+
+    if use_numpy:
+        return _analyze_numpy(columns)
+
+    return _analyze_python(columns)
+
+
+def get_luck_percentiles(stats: typing.Sequence[BannerStats]) -> typing.Mapping[tuple[int, int], float]:
+    """Get how lucky users are compared to other users of the same banner.
+
+    Returns a mapping of (uid, banner type) to the percentage of users who needed more pulls on average.
+    Users who have not pulled any item of the highest rarity are left out.
+    """
+    populations: dict[int, list[float]] = collections.defaultdict(list)
+    for banner in stats:
+        if banner.average_pity is not None:
+            populations[banner.banner_type].append(banner.average_pity)
+
+    for population in populations.values():
+        population.sort()
+
+    percentiles: dict[tuple[int, int], float] = {}
+    for banner in stats:
+        if banner.average_pity is None:
+            continue
+
+        population = populations[banner.banner_type]
+        lower = bisect.bisect_left(population, banner.average_pity)
+        upper = bisect.bisect_right(population, banner.average_pity)
+        # ties count as half
+        unluckier = len(population) - upper
+        percentiles[banner.uid, banner.banner_type] = 100 * (unluckier + (upper - lower) / 2) / len(population)
+
+    return percentiles
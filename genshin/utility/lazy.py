@@ -0,0 +1,77 @@
+"""Lazy loading of package attributes."""
+
+import importlib
+import importlib.util
+import sys
+import types
+import typing
+
+__all__ = ["lazy_import"]
+
+
+def _public_names(module: types.ModuleType) -> typing.Sequence[str]:
+    """Get the names a star import of a module would bind."""
+    if hasattr(module, "__getattr__"):
+        return dir(module)  # lazy module
+
+    names: typing.Optional[typing.Sequence[str]] = getattr(module, "__all__", None)
+    if names is None:
+        names = [name for name in vars(module) if not name.startswith("_")]
+
+    return names
+
+
+def _exports(module: types.ModuleType, name: str) -> bool:
+    """Check whether a star import of a module would bind a name without loading lazy modules."""
+    if hasattr(module, "__getattr__"):
+        return hasattr(module, name)
+
+    return name in _public_names(module)
+
+
+def lazy_import(
+    package: str,
+    *,
+    submodules: typing.Collection[str] = (),
+    exports: typing.Sequence[str] = (),
+) -> tuple[typing.Callable[[str], typing.Any], typing.Callable[[], list[str]]]:
+    """Create module-level `__getattr__` and `__dir__` functions as per PEP 562.
+
+    Submodules are imported the first time they are accessed as an attribute.
+    Exports replace `from .module import *`, their names are searched in order and
+    only the modules preceding the one which defines the name are imported.
+    """
+
+    def load(name: str) -> typing.Any:
+        return importlib.import_module(f"{package}.{name}")
+
+    def __getattr__(name: str) -> typing.Any:
+        namespace = vars(sys.modules[package])
+
+        if name == "__all__":
+            namespace[name] = __dir__()
+            return namespace[name]
+
+        # `from package import module` looks up the attribute before importing the module
+        if name in submodules or name in exports or importlib.util.find_spec(f"{package}.{name}"):
+            namespace[name] = load(name)
+            return namespace[name]
+
+        if not name.startswith("_"):
+            for export in exports:
+                module = load(export)
+                if _exports(module, name):
+                    namespace[name] = getattr(module, name)
+                    return namespace[name]
+
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    def __dir__() -> list[str]:
+        names = {name for name in vars(sys.modules[package]) if not name.startswith("_")}
+        names.update(submodules, exports)
+        for export in exports:
+            names.update(_public_names(load(export)))
+
+        return sorted(names)
+
+    return __getattr__, __dir__
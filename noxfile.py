@@ -15,6 +15,9 @@ GENERAL_TARGETS = ["./noxfile.py", "./genshin", "./tests"]
 PYRIGHT_ENV = {"PYRIGHT_PYTHON_FORCE_VERSION": "latest"}
 UV_RUN_GROUP = ("uv", "run", "--isolated", "--no-dev", "--group")
 UV_RUN_NO_ISOLATE = ("uv", "run", "--no-dev", "--group")
+# cumulative microseconds `import genshin` may take and modules it must not import eagerly
+IMPORT_TIME_BUDGET = 150_000
+IMPORT_TIME_FORBIDDEN = ("aiohttp", "pydantic", "genshin.models")
 
 LOGGER = logging.getLogger("nox")
 
@@ -87,6 +90,35 @@ def test(session: nox.Session) -> None:
     )
 
 
+@nox.session(name="import-time")
+def import_time(session: nox.Session) -> None:
+    """Benchmark how long importing this project takes and fail if it exceeds the import budget."""
+    output = session.run(
+        "uv", "run", "--isolated", "--no-dev", "python", "-X", "importtime", "-c", f"import {PACKAGE}", silent=True
+    )
+
+    times: dict[str, int] = {}
+    for line in str(output).splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, module = line.split("|")
+            times[module.strip()] = int(cumulative)
+
+    for module, cumulative in sorted(times.items(), key=lambda item: item[1], reverse=True)[:15]:
+        session.log("%8.1fms %s", cumulative / 1000, module)
+
+    errors: list[str] = []
+    total = times.get(PACKAGE, 0)
+    if total > IMPORT_TIME_BUDGET:
+        errors.append(f"importing {PACKAGE} took {total / 1000:.1f}ms, over {IMPORT_TIME_BUDGET / 1000:.1f}ms")
+
+    for module in times:
+        if any(module == name or module.startswith(name + ".") for name in IMPORT_TIME_FORBIDDEN):
+            errors.append(f"{module} is imported eagerly")
+
+    if errors:
+        session.error("Import budget exceeded: " + "; ".join(errors))
+
+
 @nox.session(name="type-check")
 def type_check(session: nox.Session) -> None:
     """Statically analyse and veirfy this project using pyright and mypy."""
@@ -0,0 +1,167 @@
+import asyncio
+import typing
+
+import pytest
+
+import genshin
+
+
+class CountingCookieManager(genshin.CookieManager):
+    calls: int = 0
+
+    async def request(self, url: typing.Any, *, method: str = "GET", **kwargs: typing.Any) -> typing.Any:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"url": str(url), "method": method}
+
+
+async def test_request_coalescing():
+    client = genshin.Client()
+    client.cookie_manager = manager = CountingCookieManager({"ltuid": "1", "ltoken": "abc"})
+
+    key = genshin.client.cache.cache_key("test", value=1)
+    await asyncio.gather(*(client.request("https://example.com", cache=key) for _ in range(5)))
+    assert manager.calls == 1
+
+    await asyncio.gather(*(client.request("https://example.com", params={"a": 1}) for _ in range(5)))
+    assert manager.calls == 2
+
+    # POST requests may have side effects
+    await asyncio.gather(*(client.request("https://example.com", data={"a": 1}) for _ in range(5)))
+    assert manager.calls == 7
+
+    assert client.single_flight.coalesced == 8
+    assert client.single_flight.in_flight == 0
+
+
+async def test_request_coalescing_kwargs():
+    client = genshin.Client()
+    client.cookie_manager = manager = CountingCookieManager({"ltuid": "1", "ltoken": "abc"})
+
+    # requests with different aiohttp options must not share a response
+    await asyncio.gather(
+        client.request("https://example.com", timeout=1),
+        client.request("https://example.com", timeout=1),
+        client.request("https://example.com", timeout=2),
+    )
+    assert manager.calls == 2
+    assert client.single_flight.coalesced == 1
+
+
+async def test_request_coalescing_across_cookies():
+    transport = genshin.Transport()
+    managers = [CountingCookieManager({"ltuid": str(i), "ltoken": "abc"}) for i in range(1, 3)]
+
+    clients: list[genshin.Client] = []
+    for manager in managers:
+        client = genshin.Client(cache=genshin.Cache())
+        client.cookie_manager = manager
+        manager.transport = transport
+        clients.append(client)
+
+    private_key = genshin.client.cache.cache_key("private", uid=1)
+    static_key = genshin.client.cache.cache_key("static", lang="en-us")
+
+    await asyncio.gather(*(client.request("https://example.com", cache=private_key) for client in clients))
+    assert [manager.calls for manager in managers] == [1, 1]
+
+    await asyncio.gather(*(client.request("https://example.com", static_cache=static_key) for client in clients))
+    assert sum(manager.calls for manager in managers) == 3
+
+
+async def test_stale_while_revalidate():
+    client = genshin.Client(cache=genshin.Cache(ttl=-1))
+    client.cookie_manager = manager = CountingCookieManager()
+    client.cache_policy = genshin.CachePolicy(stale_ttl=60)
+
+    key = genshin.client.cache.cache_key("test", value=1)
+    await client.request("https://example.com", cache=key)
+    assert manager.calls == 1
+
+    # expired but within the grace window
+    assert await client.request("https://example.com", cache=key) == {"url": "https://example.com", "method": "GET"}
+    assert manager.calls == 1
+
+    await asyncio.sleep(0.05)
+    assert manager.calls == 2
+
+
+async def test_negative_caching():
+    class PrivateCookieManager(CountingCookieManager):
+        async def request(self, url: typing.Any, *, method: str = "GET", **kwargs: typing.Any) -> typing.Any:
+            self.calls += 1
+            raise genshin.DataNotPublic({"retcode": 10102, "message": "Data is not public"})
+
+    client = genshin.Client(cache=genshin.Cache())
+    client.cookie_manager = manager = PrivateCookieManager()
+    client.cache_policy = genshin.CachePolicy(negative_ttl=60, ttl_overrides={"test": 10})
+
+    key = genshin.client.cache.cache_key("test", value=1)
+    for _ in range(3):
+        with pytest.raises(genshin.DataNotPublic):
+            await client.request("https://example.com", cache=key)
+
+    assert manager.calls == 1
+
+
+async def test_model_cache():
+    client = genshin.Client(cache=genshin.Cache())
+    client.cookie_manager = manager = CountingCookieManager({"ltuid": "1", "ltoken": "abc"})
+
+    key = genshin.client.cache.cache_key("test", value=1)
+    parsed: list[typing.Any] = []
+
+    def parse(data: typing.Any) -> typing.Any:
+        parsed.append(data)
+        return object()
+
+    async def fetch() -> typing.Any:
+        return await client.request("https://example.com", cache=key)
+
+    first = await client._request_model(key, parse, fetch)
+    assert await client._request_model(key, parse, fetch) is not first
+    assert len(parsed) == 2
+
+    client.cache_models = True
+    model = await client._request_model(key, parse, fetch)
+    assert await client._request_model(key, parse, fetch) is model
+    assert len(parsed) == 3
+    assert manager.calls == 1
+
+
+class JsonCache(genshin.Cache):
+    async def set(self, key: typing.Any, value: typing.Any) -> None:
+        assert isinstance(value, str)
+        await super().set(key, value)
+
+    async def get_model(self, key: typing.Any, *, static: bool = False) -> typing.Any:
+        return await genshin.BaseCache.get_model(self, key, static=static)
+
+    async def set_model(self, key: typing.Any, model: typing.Any, *, static: bool = False) -> None:
+        await genshin.BaseCache.set_model(self, key, model, static=static)
+
+
+async def test_serialized_model_cache():
+    cache = JsonCache()
+    model = genshin.models.PartialGenshinUserStats.model_construct(info=None)
+
+    await cache.set_model("key", model)
+    assert await cache.get_model("key") == model
+
+    wish = genshin.models.Wish(
+        uid=710785423,
+        id=1,
+        name="Qiqi",
+        rank_type="5",
+        tz_offset=8,
+        time="2023-01-01 12:00:00",
+        item_type="Character",
+        banner_type=400,
+    )
+    await cache.set_model("wishes", [wish])
+    assert await cache.get_model("wishes") == [wish]
+
+    # only classes of the genshin package are revived
+    await cache.set("key", '{"$model": "os:system", "fields": {}, "set": []}')
+    with pytest.raises(ValueError, match="outside of genshin"):
+        await cache.get_model("key")
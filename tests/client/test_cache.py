@@ -0,0 +1,292 @@
+import asyncio
+import time
+import typing
+
+import pytest
+
+import genshin
+from genshin.client.cache import batched_get
+
+
+async def test_cache_lru():
+    cache = genshin.Cache(maxsize=2)
+
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    assert await cache.get("a") == 1
+
+    await cache.set("c", 3)
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+    assert await cache.get("c") == 3
+
+    assert cache.stats.evictions == 1
+    assert cache.stats.hits == 3
+    assert cache.stats.misses == 1
+
+
+async def test_cache_expiration():
+    cache = genshin.Cache(ttl=-1, static_ttl=60)
+
+    await cache.set("a", 1)
+    await cache.set_static("b", 2)
+    assert await cache.get("a") is None
+    assert await cache.get_static("b") == 2
+
+    assert len(cache) == 1
+    assert cache.stats.expirations == 1
+
+
+async def test_cache_overwrite_keeps_latest_expiration(monkeypatch):
+    cache = genshin.Cache(ttl=10)
+    now = time.time()
+
+    monkeypatch.setattr(time, "time", lambda: now)
+    await cache.set("a", 1)
+    monkeypatch.setattr(time, "time", lambda: now + 5)
+    await cache.set("a", 2)
+
+    monkeypatch.setattr(time, "time", lambda: now + 12)
+    assert await cache.get("a") == 2
+    assert cache.stats.expirations == 0
+
+
+async def test_sqlite_cache(tmp_path):
+    pytest.importorskip("aiosqlite")
+
+    db_name = str(tmp_path / "cache.db")
+
+    async with genshin.SQLiteCache(db_name=db_name, batch_size=2, flush_interval=60) as cache:
+        await cache.set("a", {"value": 1})
+        # served from the write-behind queue
+        assert await cache.get("a") == {"value": 1}
+
+        await cache.set_static("b", [2])
+        assert not cache._pending
+        assert await cache.get("b") == [2]
+
+        await cache.set("c", 3)
+
+    async with genshin.SQLiteCache(db_name=db_name) as cache:
+        assert await cache.get("a") == {"value": 1}
+        assert await cache.get("c") == 3
+        assert await cache.get("d") is None
+
+
+async def test_sqlite_cache_client_close(tmp_path):
+    aiosqlite = pytest.importorskip("aiosqlite")
+
+    db_name = str(tmp_path / "cache.db")
+
+    # the client shutdown flushes the write-behind queue
+    async with genshin.Client(cache=genshin.SQLiteCache(db_name=db_name, flush_interval=60)) as client:
+        await client.cache.set("a", 1)
+
+    async with genshin.SQLiteCache(db_name=db_name) as cache:
+        assert await cache.get("a") == 1
+
+    # connections passed in keep their journal mode
+    async with aiosqlite.connect(str(tmp_path / "other.db")) as conn:
+        async with genshin.SQLiteCache(conn) as cache:
+            await cache.set("a", 1)
+
+        async with conn.execute("PRAGMA journal_mode") as cursor:
+            assert await cursor.fetchone() == ("delete",)
+
+
+async def test_cache_many():
+    cache = genshin.Cache()
+
+    await cache.set_many({"a": 1, "b": 2})
+    await cache.set_many({"c": 3}, static=True)
+    assert await cache.get_many(["a", "b", "c", "d"]) == [1, 2, 3, None]
+
+
+async def test_batched_get():
+    class CountingCache(genshin.Cache):
+        batch_gets = True
+        batches: list[typing.Sequence[typing.Any]] = []
+
+        async def get_many(self, keys: typing.Sequence[typing.Any]) -> typing.Sequence[typing.Any]:
+            self.batches.append(keys)
+            return await super().get_many(keys)
+
+    cache = CountingCache()
+    await cache.set_many({"a": 1, "b": 2})
+
+    values = await asyncio.gather(*(batched_get(cache, key) for key in ("a", "b", "a", "c")))
+    assert values == [1, 2, 1, None]
+    assert cache.batches == [["a", "b", "c"]]
+
+
+@pytest.mark.parametrize("encoding", ["json", "orjson", "msgpack"])
+@pytest.mark.parametrize("compression", [None, "zlib", "zstd"])
+def test_redis_serialization(encoding: str, compression: typing.Optional[str]):
+    if encoding != "json":
+        pytest.importorskip(encoding)
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+
+    cache = genshin.RedisCache(None, encoding=encoding, compression=compression)  # type: ignore
+    value = {"list": [1, 2, 3], "name": "Lumine", "nested": {"x": None}}
+
+    serialized = cache.serialize_value(value)
+    if isinstance(serialized, str):
+        serialized = serialized.encode()
+
+    assert cache.deserialize_value(serialized) == value
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, typing.Any] = {}
+        self.expirations: dict[str, typing.Optional[int]] = {}
+        self.published: list[list[tuple[str, str]]] = []
+
+    async def get(self, key: str) -> typing.Any:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: typing.Any, ex: typing.Optional[int] = None) -> None:
+        self.data[key] = value
+        self.expirations[key] = ex
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    def pubsub(self) -> "FakePubSub":
+        return FakePubSub()
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self.redis = redis
+        self.messages: list[tuple[str, str]] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc_info: typing.Any) -> None:
+        pass
+
+    def set(self, key: str, value: typing.Any, ex: typing.Optional[int] = None) -> None:
+        self.redis.data[key] = value
+        self.redis.expirations[key] = ex
+
+    def publish(self, channel: str, message: str) -> None:
+        self.messages.append((channel, message))
+
+    async def execute(self) -> None:
+        if self.messages:
+            self.redis.published.append(self.messages)
+
+
+class FakePubSub:
+    async def subscribe(self, channel: str) -> None:
+        raise ConnectionError("connection lost")
+
+    async def unsubscribe(self, channel: str) -> None:
+        pass
+
+
+async def test_redis_cache_ttl():
+    redis = FakeRedis()
+    cache = genshin.RedisCache(redis)  # type: ignore
+
+    await cache.set("a", 1)
+    await cache.set_with_ttl("b", 2, 2.5)
+    await cache.set_with_ttl("c", 3, 0.1)
+
+    assert redis.expirations == {"a": cache.ttl, "b": 3, "c": 1}
+    assert await cache.get("b") == 2
+
+
+async def test_tiered_cache():
+    l2 = genshin.Cache()
+    cache = genshin.TieredCache(l2, l1=genshin.Cache(maxsize=2))
+
+    await l2.set("a", 1)
+    assert await cache.get("a") == 1
+    assert cache.l1.stats.misses == 1
+
+    # served from memory even if the shared cache changed
+    await l2.set("a", 2)
+    assert await cache.get("a") == 1
+
+    cache.invalidate("a")
+    assert await cache.get("a") == 2
+
+    await cache.set("b", 3)
+    assert await l2.get("b") == 3
+    assert await cache.get_many(["a", "b", "c"]) == [2, 3, None]
+
+
+async def test_tiered_cache_versions():
+    l2 = genshin.Cache()
+    first, second = genshin.TieredCache(l2), genshin.TieredCache(l2, version_check_interval=0)
+
+    await first.set("a", 1)
+    assert await second.get("a") == 1
+
+    # writes through another tiered cache bump the version of the key
+    await first.set("a", 2)
+    assert await second.get("a") == 2
+    await first.set_many({"a": 3, "b": 4})
+    assert await second.get_many(["a", "b"]) == [3, 4]
+
+
+class CountingCache(genshin.Cache):
+    lookups: int = 0
+
+    async def get_many(self, keys: typing.Sequence[typing.Any]) -> typing.Sequence[typing.Optional[typing.Any]]:
+        self.lookups += 1
+        return await super().get_many(keys)
+
+
+async def test_tiered_cache_version_interval():
+    l2 = CountingCache()
+    cache = genshin.TieredCache(l2, version_check_interval=5)
+
+    await cache.set_static("a", 1)
+    for _ in range(10):
+        assert await cache.get_static("a") == 1
+
+    # memory hits within the interval never reach the shared cache
+    assert l2.lookups == 0
+
+    # once the interval passed every hit checks the version
+    cache.version_check_interval = 0
+    assert await cache.get_static("a") == 1
+    assert await cache.get_static("a") == 1
+    assert l2.lookups == 2
+
+
+async def test_tiered_cache_static_many():
+    l2 = genshin.Cache()
+    cache = genshin.TieredCache(l2, l1_ttl=1, l1_static_ttl=100)
+
+    await l2.set_static("a", 1)
+    assert await cache.get_many(["a"], static=True) == [1]
+    assert cache.l1.cache["a"][0] > time.time() + 50
+
+
+async def test_tiered_cache_redis():
+    redis = FakeRedis()
+    cache = genshin.TieredCache(genshin.RedisCache(redis))  # type: ignore
+
+    await cache.set_many({"a": 1, "b": 2})
+    assert [[message for _, message in messages] for messages in redis.published] == [
+        [f"{cache._worker_id}:a", f"{cache._worker_id}:b"]
+    ]
+
+    # a dead listener is restarted and the possibly outdated values are dropped
+    await cache.start()
+    listener = cache._listener
+    assert listener is not None
+    await asyncio.sleep(0)
+    assert listener.done()
+
+    await cache.start()
+    assert cache._listener is not listener
+    assert not cache.l1.cache
+
+    await cache.close()
@@ -0,0 +1,141 @@
+import typing
+
+import pytest
+
+import genshin
+from genshin.models.genshin import gacha as models
+
+pytest.importorskip("aiosqlite")
+
+
+def create_wish(id: int, banner_type: int = 301, uid: int = 710785423) -> models.Wish:
+    return models.Wish(
+        uid=uid,
+        id=id,
+        name="Qiqi",
+        rank_type="5",
+        tz_offset=0,
+        time=f"2023-01-01 12:00:{id % 60:02}",
+        item_type="Character",
+        banner_type=banner_type,
+    )
+
+
+def create_warp(id: int, uid: int = 800000000) -> models.Warp:
+    return models.Warp(
+        uid=uid,
+        id=id,
+        name="Bailu",
+        rank_type="5",
+        tz_offset=0,
+        time=f"2023-01-01 12:00:{id % 60:02}",
+        item_type="Character",
+        item_id=1211,
+        banner_type=11,
+        gacha_id=2001,
+    )
+
+
+def create_signal(id: int, uid: int = 1000000000) -> models.SignalSearch:
+    return models.SignalSearch(
+        uid=uid,
+        id=id,
+        name="Grace",
+        rank_type="4",
+        tz_offset=0,
+        time=f"2023-01-01 12:00:{id % 60:02}",
+        item_type="Agents",
+        item_id=1181,
+        banner_type=2,
+    )
+
+
+# required record fields of the UIGF v4 schema, hk4e item ids are left out on purpose
+UIGF_REQUIRED = {
+    "hk4e": ("uigf_gacha_type", "gacha_type", "time", "id"),
+    "hkrpg": ("gacha_id", "gacha_type", "item_id", "time", "id"),
+    "nap": ("gacha_type", "item_id", "time", "id"),
+}
+
+
+def validate_uigf(data: typing.Mapping[str, typing.Any]) -> None:
+    assert data["info"]["version"] == "v4.0"
+    for game, fields in UIGF_REQUIRED.items():
+        for account in data.get(game, []):
+            assert account["uid"] and isinstance(account["timezone"], int)
+            for record in account["list"]:
+                assert all(isinstance(value, str) and value for value in record.values()), record
+                assert all(field in record for field in fields), record
+
+
+class HistoryClient:
+    def __init__(self, wishes: typing.Sequence[models.Wish]) -> None:
+        self.wishes = wishes
+        self.since: typing.Any = None
+
+    def wish_history(self, banner_type: typing.Any = None, **kwargs: typing.Any) -> genshin.paginators.Paginator:
+        self.since = kwargs["since"]
+        wishes = [wish for wish in self.wishes if wish.id > self.since.get(wish.banner_type, 0)]
+        return genshin.paginators.base.BasicPaginator(wishes)
+
+
+async def test_history_store():
+    async with genshin.GachaHistoryStore(db_name=":memory:") as store:
+        assert await store.add([create_wish(1), create_wish(2), create_wish(3, 200)]) == 3
+        assert await store.add([create_wish(2), create_wish(4)]) == 1
+
+        assert [wish.id for wish in await store.get(models.Wish, 710785423)] == [4, 3, 2, 1]
+        assert [wish.id for wish in await store.get(models.Wish, 710785423, 200)] == [3]
+        assert await store.get_latest_ids(models.Wish, 710785423) == {301: 4, 200: 3}
+
+        wish = (await store.get(models.Wish, 710785423, limit=1))[0]
+        assert wish == create_wish(4)
+
+
+async def test_history_store_sync():
+    client = HistoryClient([create_wish(i) for i in range(5, 0, -1)])
+
+    async with genshin.GachaHistoryStore(db_name=":memory:") as store:
+        await store.add([create_wish(1), create_wish(2)])
+
+        wishes = await store.sync(client, models.Wish, 710785423)  # pyright: ignore[reportArgumentType]
+        assert client.since == {301: 2}
+        assert [wish.id for wish in wishes] == [5, 4, 3, 2, 1]
+
+
+async def test_history_store_formats():
+    wishes = [create_wish(1), create_wish(2, 200), create_wish(3, 302), create_wish(4, 400)]
+
+    async with genshin.GachaHistoryStore(db_name=":memory:") as store:
+        await store.add(wishes)
+        uigf = await store.export_uigf()
+        columns = await store.export_columns(models.Wish, 710785423)
+
+    validate_uigf(uigf)
+    records = uigf["hk4e"][0]["list"]
+    assert [record["id"] for record in records] == ["1", "2", "3", "4"]
+    assert (records[3]["gacha_type"], records[3]["uigf_gacha_type"]) == ("400", "301")
+
+    async with genshin.GachaHistoryStore(db_name=":memory:") as store:
+        assert await store.import_uigf(uigf) == 4
+        assert list(await store.get(models.Wish, 710785423)) == wishes[::-1]
+
+    async with genshin.GachaHistoryStore(db_name=":memory:") as store:
+        assert await store.import_columns(columns) == 4
+        assert list(await store.get(models.Wish, 710785423)) == wishes[::-1]
+
+
+async def test_history_store_uigf_games():
+    async with genshin.GachaHistoryStore(db_name=":memory:") as store:
+        await store.add([create_wish(1), create_warp(2), create_signal(3)])
+        uigf = await store.export_uigf()
+
+    validate_uigf(uigf)
+    assert "item_id" not in uigf["hk4e"][0]["list"][0]
+    assert uigf["hkrpg"][0]["list"][0]["item_id"] == "1211"
+    assert uigf["nap"][0]["list"][0]["item_id"] == "1181"
+
+    async with genshin.GachaHistoryStore(db_name=":memory:") as store:
+        assert await store.import_uigf(uigf) == 3
+        assert list(await store.get(models.Warp, 800000000)) == [create_warp(2)]
+        assert list(await store.get(models.SignalSearch, 1000000000)) == [create_signal(3)]
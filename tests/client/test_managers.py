@@ -0,0 +1,160 @@
+import asyncio
+import datetime
+import time
+import typing
+
+import pytest
+
+import genshin
+
+
+async def test_pooled_session():
+    manager = genshin.CookieManager()
+
+    session = manager.get_session()
+    assert manager.get_session() is session
+
+    await manager.close()
+    assert session.closed
+    assert manager.get_session() is not session
+
+    await manager.close()
+
+
+async def test_pooled_session_kept_on_set_cookies():
+    client = genshin.Client()
+    session = client.cookie_manager.get_session()
+
+    client.set_cookies(ltuid=1, ltoken="abc")
+    assert client.cookie_manager.get_session() is session
+
+    await client.close()
+    assert session.closed
+
+
+async def test_shared_transport():
+    transport = genshin.Transport(max_concurrency=8, max_concurrency_per_host=2)
+    clients = [genshin.Client({"ltuid": str(i), "ltoken": "abc"}, transport=transport) for i in range(1, 4)]
+
+    sessions = {client.cookie_manager.get_session() for client in clients}
+    assert len(sessions) == 1
+
+    # shared transports are owned by the caller
+    await clients[0].close()
+    assert not transport.closed
+
+    await transport.close()
+    assert transport.closed
+
+
+class LimitedCookieManager(genshin.RotatingCookieManager):
+    exhausted: set[str] = {"1"}
+
+    async def _request(self, method: str, str_or_url: typing.Any, cookies: typing.Any, **kwargs: typing.Any) -> str:
+        if cookies["ltuid"] in self.exhausted:
+            raise genshin.errors.TooManyRequests
+
+        return cookies["ltuid"]
+
+
+async def test_rotating_quota():
+    quota = genshin.MemoryQuotaStore(max_uses=2)
+    manager = LimitedCookieManager([{"ltuid": str(i), "ltoken": "abc"} for i in range(1, 4)], quota=quota)
+
+    assert [await manager.request("https://example.com") for _ in range(4)] == ["2", "2", "3", "3"]
+    assert await quota.get_uses(["1", "2", "3"]) == {"1": 1, "2": 2, "3": 2}
+
+    with pytest.raises(genshin.errors.TooManyRequests):
+        await manager.request("https://example.com")
+
+
+class SlowQuotaStore(genshin.MemoryQuotaStore):
+    async def acquire(self, account_id: str) -> typing.Any:
+        await asyncio.sleep(0.01)
+        return await super().acquire(account_id)
+
+
+async def test_rotating_quota_concurrency():
+    quota = SlowQuotaStore(max_uses=10)
+    manager = LimitedCookieManager([{"ltuid": str(i), "ltoken": "abc"} for i in range(2, 4)], quota=quota)
+
+    # cookies must stay schedulable while their quota is checked by a slow store
+    results = await asyncio.gather(*(manager.request("https://example.com") for _ in range(10)))
+    assert set(results) <= {"2", "3"}
+    assert sum((await quota.get_uses(["2", "3"])).values()) == 10
+
+
+async def test_quota_daily_reset(monkeypatch: pytest.MonkeyPatch):
+    quota = genshin.MemoryQuotaStore(max_uses=1)
+
+    assert (await quota.acquire("1")).acquired
+    assert not (await quota.acquire("1")).acquired
+
+    monkeypatch.setattr(quota, "today", lambda: datetime.date(2100, 1, 1))
+    assert (await quota.acquire("1")).acquired
+
+
+def test_cookie_scheduler():
+    scheduler = genshin.client.manager.scheduler.CookieScheduler(["1", "2", "3"])
+
+    assert scheduler.pop() == "1"
+    scheduler.update("1", 5)
+    assert scheduler.pop() == "1"
+    scheduler.update("1", 6, time.time() + 60)
+
+    assert scheduler.pop() == "2"
+    scheduler.remove("3")
+    assert scheduler.pop() is None
+
+    scheduler.release("2")
+    assert scheduler.pop() == "2"
+
+
+class InvalidCookieManager(genshin.RotatingCookieManager):
+    invalid: set[str] = {"1"}
+
+    async def _request(self, method: str, str_or_url: typing.Any, cookies: typing.Any, **kwargs: typing.Any) -> str:
+        if cookies["ltuid"] in self.invalid:
+            raise genshin.errors.InvalidCookies
+
+        return cookies["ltuid"]
+
+
+async def test_cookie_revalidation():
+    manager = InvalidCookieManager([{"ltuid": str(i), "ltoken": "abc"} for i in range(1, 3)])
+    manager._cookies.revalidate_interval = 0
+
+    with pytest.warns(UserWarning, match="Setting aside invalid cookie"):
+        assert await manager.request("https://example.com") == "2"
+    assert len(manager.cookies) == 1
+
+    manager.invalid = set()
+    await asyncio.sleep(0.01)
+    assert len(manager.cookies) == 2
+
+    await manager.close()
+
+
+def test_stale_session_closed():
+    transport = genshin.Transport()
+
+    async def get_stale_session() -> typing.Any:
+        session = transport.get_session()
+        return session, session.connector
+
+    async def replace_session() -> None:
+        session = transport.get_session()
+        assert session is not stale
+        await transport.close()
+
+    # each loop is closed before the next one runs, like separate asyncio.run calls
+    loop = asyncio.new_event_loop()
+    stale, connector = loop.run_until_complete(get_stale_session())
+    loop.close()
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(replace_session())
+    loop.close()
+
+    assert stale.closed
+    assert connector.closed
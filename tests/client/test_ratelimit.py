@@ -0,0 +1,48 @@
+import asyncio
+import time
+
+import pytest
+
+import genshin
+from genshin.client import ratelimit
+
+
+def test_endpoint_families():
+    limiter = ratelimit.RateLimiter()
+
+    assert limiter.get_family("https://sg-public-api.hoyolab.com/event/game_record/genshin/api/index") == "record"
+    assert limiter.get_family("https://public-operation-hk4e-sg.hoyoverse.com/gacha_info/api/getGachaLog") == "gacha"
+    assert limiter.get_family("https://sg-hk4e-api.hoyolab.com/event/sol/sign") == "reward"
+    assert limiter.get_family("https://bbs-api-os.hoyolab.com/community/user/wapi/getUserFullInfo") == "hoyolab"
+
+
+async def test_token_bucket_spacing():
+    bucket = ratelimit.TokenBucket(rate=100, burst=1)
+
+    start = time.monotonic()
+    await asyncio.gather(*(bucket.acquire() for _ in range(5)))
+    assert time.monotonic() - start >= 0.035
+    assert bucket.waiting == 0
+
+
+def test_adaptive_rate():
+    limiter = ratelimit.RateLimiter()
+    url = "https://sg-public-api.hoyolab.com/event/game_record/genshin/api/index"
+
+    # a burst of ratelimits only slows down once
+    for _ in range(3):
+        limiter.record(url, genshin.errors.VisitsTooFrequently())
+    assert limiter.rates == {"record": 5}
+
+    for _ in range(10):
+        limiter.record(url)
+    assert limiter.rates["record"] == pytest.approx(6)
+
+    limiter.record(url, genshin.errors.DataNotPublic())
+    assert limiter.rates["record"] == pytest.approx(6)
+    assert limiter.queue_depths == {"record": 0}
+
+
+def test_transport_rate_limiter():
+    assert isinstance(genshin.Transport().rate_limiter, ratelimit.RateLimiter)
+    assert genshin.Transport(rate_limiter=None).rate_limiter is None
@@ -0,0 +1,33 @@
+import pytest
+
+from genshin.models.genshin import character, constants
+
+
+@pytest.fixture(autouse=True)
+def character_names(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(character, "_load_character_names", lambda lang: None)
+    monkeypatch.setattr(constants, "CHARACTER_NAMES", {})
+    monkeypatch.setattr(constants, "_INDEXES", {})
+
+    constants.set_character("en-us", constants.DBChar(10000002, "Ayaka", "Kamisato Ayaka", "Cryo", 5))
+    constants.set_character("en-us", constants.DBChar(10000003, "Qin", "Jean", "Anemo", 5))
+
+
+def test_get_db_char():
+    icon = "https://upload-os-bbs.mihoyo.com/game_record/genshin/character_side_icon/UI_AvatarIcon_Side_Qin.png"
+
+    assert character._get_db_char(10000002, lang="en-us").name == "Kamisato Ayaka"
+    assert character._get_db_char(icon=icon, lang="en-us").id == 10000003
+    assert character._get_db_char(name="Jean", lang="en-us").icon_name == "Qin"
+
+
+def test_character_index_updates():
+    assert constants.get_character_index("en-us") is constants.get_character_index("en-us")
+
+    constants.set_character("en-us", constants.DBChar(10000003, "Qin", "Gunnhildr", "Anemo", 5))
+    assert character._get_db_char(name="Gunnhildr", lang="en-us").id == 10000003
+    assert character._get_db_char(name="Jean", lang="en-us").guessed
+
+    # direct modifications are picked up as well
+    constants.CHARACTER_NAMES["en-us"][10000006] = constants.DBChar(10000006, "Lisa", "Lisa", "Electro", 4)
+    assert not character._get_db_char(name="Lisa", lang="en-us").guessed
@@ -0,0 +1,21 @@
+from genshin.models.genshin import gacha, transaction
+
+
+def test_wish_from_page():
+    row = {"uid": "1", "name": "Amber", "rank_type": "4", "item_type": "Character", "time": "2024-01-01 10:00:00"}
+    rows = [{**row, "id": str(i)} for i in range(3)]
+
+    wishes = gacha.Wish.from_page(rows, 301, -13)
+    assert wishes == [gacha.Wish(**row, banner_type=301, tz_offset=-13) for row in rows]
+    assert wishes[0].banner_type is gacha.GenshinBannerType.CHARACTER
+    assert wishes[0].time.tzinfo is wishes[-1].time.tzinfo
+
+
+def test_transaction_from_page():
+    row = {"id": "1", "datetime": "2024-01-01 10:00:00", "add_num": "-1", "reason": "Upgrade"}
+
+    (currency,) = transaction.BaseTransaction.from_page([row], transaction.TransactionKind.PRIMOGEM)
+    assert type(currency) is transaction.Transaction
+
+    (item,) = transaction.BaseTransaction.from_page([{**row, "name": "Sword", "quality": "4"}], "weapon")
+    assert type(item) is transaction.ItemTransaction and item.rarity == 4
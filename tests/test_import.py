@@ -0,0 +1,43 @@
+import subprocess
+import sys
+import typing
+
+import genshin
+
+
+def run(statement: str, *options: str) -> subprocess.CompletedProcess[str]:
+    # a fresh interpreter is needed to observe imports, only statements of this module are executed
+    process = subprocess.run([sys.executable, *options, "-c", statement], capture_output=True, text=True)  # noqa: S603
+    assert process.returncode == 0, process.stderr
+    return process
+
+
+def import_times(statement: str) -> typing.Mapping[str, int]:
+    """Get the cumulative import time of every imported module in microseconds."""
+    times: dict[str, int] = {}
+    for line in run(statement, "-X", "importtime").stderr.splitlines()[1:]:
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+
+    return times
+
+
+def imported_modules(statement: str) -> typing.Set[str]:
+    return set(run(statement + "; import sys; print(*sys.modules)").stdout.split())
+
+
+def test_import_is_lazy():
+    times = import_times("import genshin")
+
+    assert not {"aiohttp", "pydantic", "genshin.client", "genshin.models"} & times.keys()
+
+
+def test_lazy_attributes():
+    modules = imported_modules("import genshin; genshin.SQLiteCache; genshin.models.Wish")
+
+    assert {"genshin.client.cache", "genshin.models.genshin"} <= modules
+    assert not {"genshin.client.clients", "genshin.models.zzz"} & modules
+
+    assert genshin.Client is genshin.client.Client
+    assert genshin.models.Wish is genshin.models.genshin.Wish
+    assert "update_characters_any" in dir(genshin.utility)
@@ -1,5 +1,10 @@
+import asyncio
+import functools
+import io
+import pathlib
 import typing
 
+import pydantic
 import pytest
 
 from genshin import paginators
@@ -63,6 +68,135 @@ async def test_buffered_paginator():
     assert paginator.exhausted
 
 
+class PageCountingPaginator(paginators.BufferedPaginator[int]):
+    __slots__ = ("pages",)
+
+    def __init__(self, *, limit: typing.Optional[int] = None, prefetch: int = 0) -> None:
+        super().__init__(limit=limit, prefetch=prefetch)
+        self.pages = 0
+
+    async def next_page(self) -> typing.Sequence[int]:
+        self.pages += 1
+        start = (self.pages - 1) * 5
+        return list(range(start, min(start + 5, 23)))
+
+
+async def test_buffered_paginator_prefetch():
+    paginator = PageCountingPaginator(prefetch=2)
+    assert await paginator.flatten() == list(range(23))
+
+    paginator = PageCountingPaginator(limit=12, prefetch=3)
+    assert await paginator.flatten() == list(range(12))
+    assert paginator.pages == 3
+
+
+async def test_buffered_paginator_prefetch_early_exit():
+    paginator = PageCountingPaginator(prefetch=2)
+    assert await paginator.next() == 0
+
+    await asyncio.sleep(0.01)
+    assert paginator.pages == 3
+
+    await paginator.aclose()
+    assert paginator.exhausted
+
+
+async def test_paged_paginator_concurrency():
+    requested: list[int] = []
+
+    async def getter(page: int) -> typing.Sequence[int]:
+        requested.append(page)
+        await asyncio.sleep(0.01 / page)  # later pages finish first
+        return list(range((page - 1) * 5, page * 5 if page < 7 else 32))
+
+    paginator = paginators.PagedPaginator(getter, page_size=5, concurrency=3)
+    assert await paginator.flatten() == list(range(32))
+    assert requested == list(range(1, 10))
+
+    requested.clear()
+    paginator = paginators.PagedPaginator(getter, limit=12, page_size=5, concurrency=4)
+    assert await paginator.flatten() == list(range(12))
+    assert requested == [1, 2, 3]
+
+
+class Item(typing.NamedTuple):
+    id: int
+
+
+async def test_cursor_paginator_stop_id():
+    requested: list[int] = []
+
+    async def getter(end_id: int) -> typing.Sequence[Item]:
+        requested.append(end_id)
+        start = end_id - 1 if end_id else 100
+        return [Item(i) for i in range(start, max(start - 5, 0), -1)]
+
+    paginator = paginators.CursorPaginator(getter, page_size=5, stop_id=88)  # pyright: ignore[reportArgumentType]
+    assert [item.id for item in await paginator.flatten()] == list(range(100, 88, -1))
+    assert requested == [0, 96, 91]
+
+
+async def test_cursor_paginator_resume():
+    fail = True
+
+    async def getter(end_id: int) -> typing.Sequence[Item]:
+        if end_id == 86 and fail:
+            raise RuntimeError("authkey timed out")
+
+        start = end_id - 1 if end_id else 100
+        return [Item(i) for i in range(start, max(start - 5, 80), -1)]
+
+    paginator = paginators.CursorPaginator(getter, page_size=5)  # pyright: ignore[reportArgumentType]
+    items = [(await paginator.next()).id for _ in range(12)]
+    assert items == list(range(100, 88, -1))
+
+    with pytest.raises(RuntimeError):
+        await paginator.flatten()
+
+    state = paginator.state()
+    assert state == {"exhausted": False, "counter": 15, "cursor": 91, "skip": 5}
+
+    fail = False
+    paginator = paginators.CursorPaginator(getter, page_size=5).resume(state)  # pyright: ignore[reportArgumentType]
+    assert [item.id for item in await paginator.flatten()] == list(range(85, 80, -1))
+
+
+async def test_paged_paginator_resume():
+    async def getter(page: int) -> typing.Sequence[int]:
+        return list(range((page - 1) * 5, min(page * 5, 23)))
+
+    paginator = paginators.PagedPaginator(getter, page_size=5, concurrency=2, prefetch=1)
+    assert [await paginator.next() for _ in range(7)] == list(range(7))
+
+    state = paginator.state()
+    assert state == {"exhausted": False, "counter": 7, "cursor": 2, "skip": 2}
+
+    paginator = paginators.PagedPaginator(getter, limit=10, page_size=5).resume(state)
+    assert await paginator.flatten() == list(range(7, 10))
+    assert paginator.state()["exhausted"]
+
+
+async def test_merged_paginator_resume():
+    async def getter(end_id: int, *, step: int) -> typing.Sequence[Item]:
+        start = end_id - step if end_id else 30 - step
+        return [Item(i) for i in range(start, max(start - 3 * step, 0), -step)]
+
+    def create_paginator() -> paginators.MergedPaginator[Item]:
+        iterators = [
+            paginators.CursorPaginator(functools.partial(getter, step=2), page_size=3),  # pyright: ignore
+            paginators.CursorPaginator(functools.partial(getter, step=3), page_size=3),  # pyright: ignore
+        ]
+        return paginators.MergedPaginator(iterators, key=lambda item: -item.id)
+
+    expected = [item.id for item in await create_paginator().flatten()]
+
+    paginator = create_paginator()
+    assert [(await paginator.next()).id for _ in range(5)] == expected[:5]
+
+    paginator = create_paginator().resume(paginator.state())
+    assert [item.id async for item in paginator] == expected[5:]
+
+
 async def test_merged_paginator():
     # from heapq.merge doc
     sequences = [[1, 3, 5, 7], [0, 2, 4, 8], [5, 10, 15, 20], [], [25]]
@@ -79,3 +213,45 @@ async def test_merged_paginator_with_key():
 
     paginator = paginators.MergedPaginator(iterators, key=len, limit=5)
     assert await paginator.flatten(lazy=True) == ["dog", "cat", "fish", "horse", "kangaroo"]
+
+
+async def test_merged_paginator_streams_with_limit():
+    children = [PageCountingPaginator() for _ in range(3)]
+
+    paginator = paginators.MergedPaginator(children, limit=6, concurrency=2)
+    assert await paginator.flatten() == [0, 0, 0, 1, 1, 1]
+    assert [child.pages for child in children] == [1, 1, 1]
+
+
+async def test_paginator_export(tmp_path: pathlib.Path):
+    class Model(pydantic.BaseModel):
+        id: int
+        tags: list[str]
+
+    items = [Model(id=1, tags=["a"]), Model(id=2, tags=[])]
+
+    stream = io.StringIO()
+    assert await paginators.base.BasicPaginator(items).export(stream) == 2
+    assert stream.getvalue() == '{"id":1,"tags":["a"]}\n{"id":2,"tags":[]}\n'
+
+    path = tmp_path / "items.csv"
+    assert await paginators.base.BasicPaginator(items).export(path, format="csv") == 2
+    assert path.read_text().splitlines() == ["id,tags", '1,"[""a""]"', "2,[]"]
+
+
+async def test_paginator_export_csv_columns():
+    class Base(pydantic.BaseModel):
+        id: int
+
+    class Item(Base):
+        name: str
+
+    items = [Base(id=1), Item(id=2, name="a")]
+
+    # fields missing from the header are never dropped silently
+    with pytest.raises(ValueError, match="fields not in fieldnames"):
+        await paginators.base.BasicPaginator(items).export(io.StringIO(), format="csv")
+
+    stream = io.StringIO()
+    assert await paginators.base.BasicPaginator(items).export(stream, format="csv", fieldnames=["id", "name"]) == 2
+    assert stream.getvalue().splitlines() == ["id,name", "1,", "2,a"]
@@ -0,0 +1,183 @@
+import asyncio
+import gc
+import os
+import pathlib
+import random
+
+import pytest
+
+import genshin
+from genshin.models.genshin import constants as model_constants
+from genshin.utility import extdb, gacha
+
+
+def create_columns() -> gacha.GachaColumns:
+    # uid 1: 5* loses the 50/50 on pull 3, guaranteed 5* on pull 5 of the second character banner, 2 pulls since
+    # uid 2: 5* wins the 50/50 on pull 2
+    rows = [
+        (1, 1, 4, 301, True),
+        (1, 2, 3, 301, True),
+        (1, 3, 5, 301, False),
+        (1, 4, 3, 400, True),
+        (1, 5, 5, 400, True),
+        (1, 6, 3, 301, True),
+        (1, 7, 4, 301, True),
+        (1, 8, 5, 200, False),
+        (2, 9, 3, 301, True),
+        (2, 10, 5, 301, True),
+    ]
+    uids, ids, rarities, banner_types, featured = zip(*rows)
+    return gacha.GachaColumns(genshin.Game.GENSHIN, uids, ids, rarities, banner_types, featured)
+
+
+def create_random_columns(size: int) -> gacha.GachaColumns:
+    rng = random.Random(0)
+    return gacha.GachaColumns(
+        game=genshin.Game.STARRAIL,
+        uids=[rng.randrange(20) for _ in range(size)],
+        ids=rng.sample(range(10 * size), size),
+        rarities=rng.choices([3, 4, 5], weights=[90, 8, 2], k=size),
+        banner_types=rng.choices([1, 11, 12, 21], k=size),
+        featured=[rng.random() < 0.5 for _ in range(size)],
+    )
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_analyze_gacha(use_numpy: bool):
+    if use_numpy:
+        pytest.importorskip("numpy")
+
+    standard, first, second = gacha.analyze_gacha(create_columns(), use_numpy=use_numpy)
+
+    assert (first.uid, first.banner_type) == (1, 301)
+    assert (first.pulls, first.top_rarity, first.pity, first.average_pity) == (7, 2, 2, 2.5)
+    assert (first.won_50_50, first.lost_50_50, first.remaining) == (0, 1, 88)
+
+    assert (standard.banner_type, standard.top_rarity, standard.won_50_50, standard.lost_50_50) == (200, 1, 0, 0)
+    assert (second.uid, second.won_50_50, second.win_rate) == (2, 1, 1)
+
+
+def test_analyze_gacha_numpy():
+    pytest.importorskip("numpy")
+
+    columns = create_random_columns(5000)
+    assert gacha.analyze_gacha(columns, use_numpy=True) == gacha.analyze_gacha(columns, use_numpy=False)
+
+
+def test_luck_percentiles():
+    stats = gacha.analyze_gacha(create_columns(), use_numpy=False)
+    assert gacha.get_luck_percentiles(stats) == {(1, 200): 50, (1, 301): 25, (2, 301): 75}
+
+
+@pytest.fixture(name="character_cache")
+def character_cache_fixture(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    monkeypatch.setattr(extdb, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(extdb, "_cache_versions", {})
+    monkeypatch.setattr(model_constants, "CHARACTER_NAMES", {})
+    return tmp_path
+
+
+async def test_character_cache(character_cache: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    extdb.update_character_name("en-us", 10000002, "Ayaka", "Kamisato Ayaka", "Cryo", 5)
+    extdb.update_character_name("ja-jp", 10000002, "Ayaka", "神里綾華", "Cryo", 5)
+    extdb._save_cache(["en-us", "ja-jp"], "5.0")
+    assert sorted(path.name for path in character_cache.iterdir()) == ["en-us.json", "ja-jp.json"]
+
+    monkeypatch.setattr(extdb, "_cache_versions", {})
+    monkeypatch.setattr(model_constants, "CHARACTER_NAMES", {})
+
+    extdb._load_cache("en-us")
+    ayaka = model_constants.DBChar(10000002, "Ayaka", "Kamisato Ayaka", "Cryo", 5)
+    assert model_constants.CHARACTER_NAMES == {"en-us": {10000002: ayaka}}
+
+    async def fetch_ambr_version() -> str:
+        return "5.0"
+
+    async def update(langs: object) -> None:
+        raise AssertionError("cache should be up to date")
+
+    monkeypatch.setattr(extdb, "_fetch_ambr_version", fetch_ambr_version)
+    monkeypatch.setattr(extdb, "update_characters_ambr", update)
+    monkeypatch.setattr(extdb, "update_characters_enka", update)
+
+    os.utime(character_cache / "en-us.json", (0, 0))
+    await extdb.update_characters_any("en-us", lenient=True)
+    assert not extdb._is_cache_stale("en-us")
+
+
+async def test_character_database(character_cache: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    updates: list[str] = []
+
+    async def update_characters_any(lang: str, *, lenient: bool) -> None:
+        updates.append(lang)
+        await asyncio.sleep(0.01)
+        extdb.update_character_name(lang, 10000002, "Ayaka", "Kamisato Ayaka", "Cryo", 5)
+
+    monkeypatch.setattr(extdb, "update_characters_any", update_characters_any)
+    database = extdb.CharacterDatabase()
+
+    futures = [database.warm_up("en-us") for _ in range(5)]
+    await asyncio.gather(*(future for future in futures if future is not None))
+
+    assert updates == ["en-us"]
+    assert database.is_ready("en-us") and not database.is_ready("ja-jp")
+    assert database.warm_up("en-us") is None
+
+
+async def test_character_database_failure(character_cache: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    updates: list[str] = []
+
+    async def update_characters_any(lang: str, *, lenient: bool) -> None:
+        updates.append(lang)
+        raise RuntimeError("offline")
+
+    monkeypatch.setattr(extdb, "update_characters_any", update_characters_any)
+    database = extdb.CharacterDatabase()
+
+    contexts: list[dict[str, object]] = []
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(lambda loop, context: contexts.append(context))
+
+    # the caller failed before awaiting the warm-up
+    future = database.warm_up("en-us")
+    assert future is not None
+    await asyncio.wait([future])
+    del future
+    gc.collect()
+
+    assert contexts == []
+    assert database.warm_up("en-us") is not None
+    await asyncio.sleep(0.01)
+    assert updates == ["en-us", "en-us"]
+
+    loop.set_exception_handler(None)
+
+
+async def test_single_flight_cancellation():
+    single_flight = genshin.utility.SingleFlight()
+    started = 0
+
+    async def call() -> int:
+        nonlocal started
+        started += 1
+        await asyncio.sleep(0.05)
+        return started
+
+    leader = asyncio.create_task(single_flight.run("key", call))
+    follower = asyncio.create_task(single_flight.run("key", call))
+    await asyncio.sleep(0)
+
+    # a cancelled caller must not cancel the shared call
+    leader.cancel()
+    assert await follower == 1
+    assert leader.cancelled()
+
+    # the call is cancelled once nobody waits for it
+    tasks = [asyncio.create_task(single_flight.run("key", call)) for _ in range(2)]
+    await asyncio.sleep(0)
+    for task in tasks:
+        task.cancel()
+
+    await asyncio.gather(*tasks, return_exceptions=True)
+    assert single_flight.in_flight == 0
+    assert await single_flight.run("key", call) == 3